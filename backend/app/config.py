@@ -6,5 +6,46 @@ load_dotenv()
 class Settings:
     ONTOLOGY_FILE = os.getenv("ONTOLOGY_FILE", "cv_ontology.ttl")
     CV_NAMESPACE = os.getenv("CV_NAMESPACE", "http://www.semanticweb.org/ontologies/cv#")
+    # Store rdflib : "intstore" (termes encodés en entiers), "memory" (store par défaut)
+    # ou "sqlite" (fichier local persistant, pour les graphes plus gros que la RAM)
+    GRAPH_STORE = os.getenv("GRAPH_STORE", "intstore")
+    SQLITE_FILE = os.getenv("SQLITE_FILE", "cv_ontology.sqlite")
+    SQLITE_CACHE_MB = int(os.getenv("SQLITE_CACHE_MB", "64"))
+    SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+    # Snapshot binaire écrit à côté du fichier Turtle (démarrage rapide)
+    SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+    # Graphe en lecture seule partagé entre workers uvicorn via un fichier mappé (intstore uniquement)
+    SHARED_SNAPSHOT = os.getenv("SHARED_SNAPSHOT", "false").lower() == "true"
+    # Surveillance du fichier d'ontologie (rechargement à chaud), intervalle en secondes ; 0 = désactivée
+    ONTOLOGY_WATCH_SECONDS = float(os.getenv("ONTOLOGY_WATCH_SECONDS", "0"))
+    # Jeton exigé (en-tête X-Admin-Token) par les routes /api/admin ; vide = pas de contrôle
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+    # Journal des modifications (append-only) rejoué au démarrage, compacté dans le fichier Turtle
+    CHANGELOG_ENABLED = os.getenv("CHANGELOG_ENABLED", "true").lower() == "true"
+    CHANGELOG_FSYNC_MS = int(os.getenv("CHANGELOG_FSYNC_MS", "10"))
+    CHANGELOG_COMPACT_MB = int(os.getenv("CHANGELOG_COMPACT_MB", "64"))
+    # Cache des résultats (invalidé à chaque changement de version du graphe) ; 0 = désactivé
+    RESULT_CACHE_MB = int(os.getenv("RESULT_CACHE_MB", "64"))
+    RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "300"))
+    # Budget du JSON pré-encodé par candidat (réponses de liste) ; 0 = désactivé
+    FRAGMENT_CACHE_MB = int(os.getenv("FRAGMENT_CACHE_MB", "256"))
+    # Durée (s) pendant laquelle navigateurs et proxys peuvent resservir une réponse sans revalidation
+    HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "30"))
+    # Requêtes SPARQL utilisateur plus lentes que ce seuil (ms) : journal des requêtes lentes
+    SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", "500"))
+    # Fichier du journal des requêtes lentes (JSON, une ligne par requête) ; vide = sortie standard
+    SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "")
+    # Taille des lots hydratés lors du streaming NDJSON
+    STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+    # Taille des lots de candidats hydratés (index) lors de l'import en masse
+    BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "5000"))
+    # Taille des lots de triplets insérés par addN lors de l'import en masse
+    BULK_BATCH_TRIPLES = int(os.getenv("BULK_BATCH_TRIPLES", "100000"))
+    # Voies d'exécution du travail sur le graphe (threads + file d'attente bornée)
+    HEAVY_WORKERS = int(os.getenv("HEAVY_WORKERS", "4"))
+    HEAVY_QUEUE_LIMIT = int(os.getenv("HEAVY_QUEUE_LIMIT", "32"))
+    LIGHT_WORKERS = int(os.getenv("LIGHT_WORKERS", "4"))
+    LIGHT_QUEUE_LIMIT = int(os.getenv("LIGHT_QUEUE_LIMIT", "64"))
+    RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", "2"))
 
 settings = Settings()
\ No newline at end of file
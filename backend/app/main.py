@@ -1,6 +1,7 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import candidates
+from app.services import metrics
 
 app = FastAPI(
     title="CV Recruitment Platform API",
@@ -15,8 +16,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Latence, statuts et requêtes en cours par route (exposés sur /metrics)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Inclure les routes
 app.include_router(candidates.router, prefix="/api", tags=["candidates"])
 
@@ -28,6 +33,11 @@ def read_root():
         "technology": "RDFLib + OWL"
     }
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Métriques au format texte Prometheus"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import Dict, List, Optional
 
 class Skill(BaseModel):
     name: str
@@ -29,7 +29,55 @@ class Candidate(BaseModel):
 
 class SearchFilters(BaseModel):
     skills: Optional[List[str]] = []
+    anySkills: Optional[List[str]] = []
+    excludeSkills: Optional[List[str]] = []
     minExperience: Optional[int] = 0
     minDegreeLevel: Optional[str] = None
     profile: Optional[str] = None
-    searchTerm: Optional[str] = ""
\ No newline at end of file
+    searchTerm: Optional[str] = ""
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+class Facets(BaseModel):
+    total: int
+    skills: List[FacetValue]
+    profiles: List[FacetValue]
+    degreeLevels: List[FacetValue]
+    experience: List[FacetValue]
+
+class FacetedCandidates(BaseModel):
+    candidates: List[Candidate]
+    facets: Facets
+
+class WeightedSkill(BaseModel):
+    name: str
+    weight: float = Field(1.0, gt=0)
+
+class JobOffer(BaseModel):
+    requiredSkills: List[WeightedSkill] = []
+    optionalSkills: List[WeightedSkill] = []
+    targetExperience: Optional[int] = 0
+    minDegreeLevel: Optional[str] = None
+    profile: Optional[str] = None
+    topK: int = Field(10, ge=1, le=1000)
+
+class MatchResult(BaseModel):
+    candidate: Candidate
+    score: float
+    breakdown: Dict[str, float]
+
+class MatchResponse(BaseModel):
+    total: int
+    results: List[MatchResult]
+
+class SimilarResult(BaseModel):
+    candidate: Candidate
+    similarity: float
+    sharedSkills: List[str]
+
+class SimilarResponse(BaseModel):
+    candidateId: str
+    total: int
+    results: List[SimilarResult]
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Union
 from pydantic import BaseModel
-from app.models.schemas import Candidate, SearchFilters
+from app.config import settings
+from app.models.schemas import Candidate, FacetedCandidates, JobOffer, MatchResponse, SearchFilters, SimilarResponse
 from app.services.rdf_service import rdf_service
+from app.services.candidate_index import decode_cursor
+from app.services.executor import PoolSaturatedError, WorkerLane, heavy_lane, light_lane
+from app.services.result_cache import normalize_sparql
+from app.services.serialization import JSONBytesResponse
+from app.services.suggest import MAX_SUGGESTIONS
+import hmac
 
 router = APIRouter()
 
@@ -10,55 +18,279 @@ router = APIRouter()
 class SPARQLQuery(BaseModel):
     query: str
 
+def _saturated(e: PoolSaturatedError) -> HTTPException:
+    """503 + Retry-After quand la voie d'exécution est saturée"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+async def _run(lane: WorkerLane, fn, *args):
+    """Exécute `fn` hors de la boucle d'événements ; 503 + Retry-After si la voie est saturée"""
+    try:
+        return await lane.run(fn, *args)
+    except PoolSaturatedError as e:
+        raise _saturated(e)
+
+def _cache_headers(etag: str) -> dict:
+    """En-têtes de mise en cache HTTP (navigateurs, reverse proxy)"""
+    return {"ETag": etag, "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}"}
+
+def _fresh_cache_headers(etag: str, current: str) -> dict:
+    """
+    En-têtes de cache d'une réponse calculée après la lecture de `etag` :
+    si l'état a changé pendant le calcul (`current` différent), le contenu
+    peut relever de l'un ou l'autre état, il n'est alors ni étiqueté ni mis en cache
+    """
+    if current != etag:
+        return {"Cache-Control": "no-store"}
+    return _cache_headers(etag)
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Réponse 304 si le client possède déjà cette version (If-None-Match), sinon None"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    if "*" in tags or etag in tags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+    return None
+
+class _LaneStreamingResponse(StreamingResponse):
+    """Flux d'une voie d'exécution : la place est rendue même si le client part avant le premier élément"""
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.body_iterator.close()
+
+def _stream_ndjson(filters: Optional[dict], cursor: Optional[str]) -> StreamingResponse:
+    """
+    Réponse NDJSON : une ligne JSON par candidat, émise au fil de
+    l'hydratation (lots produits dans la voie "heavy", qui reste occupée
+    jusqu'à la fin du flux)
+    """
+    try:
+        body = heavy_lane.stream(rdf_service.iter_candidates_ndjson(filters, cursor))
+    except PoolSaturatedError as e:
+        raise _saturated(e)
+    return _LaneStreamingResponse(body, media_type="application/x-ndjson")
+
+async def _candidates_response(filters: Optional[dict], cursor: Optional[str],
+                               limit: Optional[int], format: str, facets: bool = False) -> Response:
+    """
+    Page JSON (curseur suivant dans l'en-tête X-Next-Cursor) ou flux NDJSON,
+    assemblés à partir du JSON pré-encodé des candidats : le schéma OpenAPI
+    reste celui de `response_model`, sans validation ni ré-encodage par élément
+    """
+    if format == "ndjson":
+        if facets:
+            raise ValueError("Facettes non disponibles au format NDJSON")
+        if cursor:
+            decode_cursor(cursor)  # curseur invalide -> 400 avant le début du flux
+        return _stream_ndjson(filters, cursor)
+    body, next_cursor = await _run(heavy_lane, rdf_service.get_candidates_page_json, filters, cursor, limit, facets)
+    response = JSONBytesResponse(body)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
 @router.get("/candidates", response_model=List[Candidate])
-async def get_all_candidates():
+async def get_all_candidates(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
     """
     Récupère tous les candidats de l'ontologie
+    
+    Pagination (optionnelle) :
+    - limit: Nombre maximum de candidats par page
+    - cursor: Curseur renvoyé dans l'en-tête X-Next-Cursor de la page précédente
+    - format: "ndjson" pour un flux (une ligne JSON par candidat)
     """
+    etag = rdf_service.etag()
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
     try:
-        candidates = rdf_service.get_all_candidates()
-        return candidates
+        if limit is None and cursor is None and format == "json":
+            result = JSONBytesResponse(await _run(heavy_lane, rdf_service.get_all_candidates_json))
+        else:
+            result = await _candidates_response(None, cursor, limit, format)
+        if format == "ndjson":
+            # Corps produit après l'envoi des en-têtes : aucun ETag vérifiable
+            result.headers["Cache-Control"] = "no-store"
+        else:
+            result.headers.update(_fresh_cache_headers(etag, rdf_service.etag()))
+        return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de la récupération des candidats: {str(e)}"
         )
 
-@router.post("/candidates/search", response_model=List[Candidate])
-async def search_candidates(filters: SearchFilters):
+@router.post("/candidates/search", response_model=Union[List[Candidate], FacetedCandidates])
+async def search_candidates(
+    filters: SearchFilters,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    facets: bool = False
+):
     """
     Recherche de candidats avec filtres multiples
     
     Filtres disponibles:
     - skills: Liste de compétences requises (le candidat doit les avoir TOUTES)
+    - anySkills: Le candidat doit avoir AU MOINS UNE de ces compétences
+    - excludeSkills: Le candidat ne doit avoir AUCUNE de ces compétences
     - minExperience: Années d'expérience minimales
     - minDegreeLevel: Niveau de diplôme minimum (Bac+2, Bac+3, Bac+5, Doctorat)
     - profile: Profil professionnel recherché
-    - searchTerm: Recherche dans le nom du candidat
+    - searchTerm: Recherche dans le nom du candidat (accents et casse ignorés,
+      fautes de frappe tolérées) ; résultats classés par pertinence
+    
+    Pagination (paramètres d'URL) : limit, cursor, format (voir /candidates)
+    
+    facets=true : réponse {"candidates": [...], "facets": {...}} avec, pour
+    tout le résultat (pas seulement la page), le total et le nombre de
+    candidats par compétence, profil, niveau de diplôme (degreeLevels) et
+    tranche d'expérience (experience : 0-2, 3-5, 6-10, 11+ ans)
     """
     try:
-        candidates = rdf_service.search_candidates(filters.dict())
-        return candidates
+        return await _candidates_response(filters.dict(), cursor, limit, format, facets)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de la recherche: {str(e)}"
         )
 
+# Formats acceptés par l'import en masse (Content-Type -> format)
+BULK_CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "text/turtle": "turtle",
+    "application/n-triples": "nt",
+}
+
+def _bulk_insert(body: bytes, format: str) -> dict:
+    """Import synchrone (exécuté dans la voie "heavy") : validation NDJSON puis insertion"""
+    if format != "ndjson":
+        return rdf_service.bulk_insert_rdf(body, format)
+    candidates = []
+    for line_number, line in enumerate(body.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            candidates.append(Candidate.model_validate_json(line).model_dump())
+        except ValueError as e:
+            raise ValueError(f"Ligne {line_number} invalide : {e}")
+    return rdf_service.bulk_insert(candidates)
+
+@router.post("/candidates/bulk")
+async def bulk_insert_candidates(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|turtle|nt)$")
+):
+    """
+    Import en masse de candidats
+    
+    Corps de la requête (format déduit du Content-Type, ou paramètre format):
+    - application/x-ndjson: Un candidat (schéma Candidate) par ligne
+    - text/turtle: Document Turtle
+    - application/n-triples: Document N-Triples
+    
+    Un candidat déjà présent (même id) est remplacé (NDJSON).
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    format = format or BULK_CONTENT_TYPES.get(content_type)
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Format non supporté: {content_type or 'inconnu'}"
+        )
+    try:
+        body = await request.body()
+        return await _run(heavy_lane, _bulk_insert, body, format)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de l'import: {str(e)}"
+        )
+
+@router.post("/match", response_model=MatchResponse)
+async def match_candidates(offer: JobOffer):
+    """
+    Classe les candidats selon leur adéquation à une offre d'emploi
+    
+    Critères de l'offre:
+    - requiredSkills / optionalSkills: Compétences pondérées ({name, weight})
+    - targetExperience: Années d'expérience visées (score plafonné à 1 au-delà)
+    - minDegreeLevel: Niveau de diplôme minimum (critère éliminatoire)
+    - profile: Profil professionnel recherché
+    - topK: Nombre de candidats retournés (10 par défaut)
+    
+    Retourne les topK meilleurs candidats avec leur score (0 à 1) et son détail
+    """
+    try:
+        return await _run(heavy_lane, rdf_service.match_candidates, offer.dict())
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors du classement: {str(e)}"
+        )
+
 @router.get("/candidates/{candidate_id}", response_model=Candidate)
-async def get_candidate(candidate_id: str):
+async def get_candidate(candidate_id: str, request: Request, response: Response):
     """
     Récupère un candidat spécifique par son ID
     
     Exemple: /api/candidates/Candidate1
     """
+    if not rdf_service.has_candidate(candidate_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Candidat {candidate_id} non trouvé"
+        )
+    etag = rdf_service.candidate_etag(candidate_id)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
     try:
-        candidate = rdf_service.get_candidate_by_id(candidate_id)
+        candidate = await _run(light_lane, rdf_service.get_candidate_by_id, candidate_id)
         if not candidate:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Candidat {candidate_id} non trouvé"
             )
+        response.headers.update(_fresh_cache_headers(etag, rdf_service.candidate_etag(candidate_id)))
         return candidate
     except HTTPException:
         raise
@@ -68,8 +300,50 @@ async def get_candidate(candidate_id: str):
             detail=f"Erreur: {str(e)}"
         )
 
+@router.get("/candidates/{candidate_id}/similar", response_model=SimilarResponse)
+async def get_similar_candidates(
+    candidate_id: str,
+    request: Request,
+    response: Response,
+    k: int = Query(10, ge=1, le=100)
+):
+    """
+    Candidats les plus proches d'un candidat (indice de Jaccard de leurs
+    compétences, profil et niveau de diplôme)
+    
+    Voisins approchés par MinHash / LSH, puis re-classés par l'indice exact
+    (similarity, de 0 à 1) ; total : nombre de voisins re-classés
+    
+    Exemple: /api/candidates/Candidate1/similar?k=5
+    """
+    if not rdf_service.has_candidate(candidate_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Candidat {candidate_id} non trouvé"
+        )
+    etag = rdf_service.etag()
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    try:
+        similar = await _run(light_lane, rdf_service.similar_candidates, candidate_id, k)
+        if similar is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Candidat {candidate_id} non trouvé"
+            )
+        response.headers.update(_fresh_cache_headers(etag, rdf_service.etag()))
+        return similar
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur: {str(e)}"
+        )
+
 @router.get("/skills")
-async def get_all_skills():
+async def get_all_skills(request: Request, response: Response):
     """
     Récupère toutes les compétences disponibles dans l'ontologie
     
@@ -77,14 +351,21 @@ async def get_all_skills():
     - name: Nom de la compétence
     - type: "technical" ou "soft"
     """
+    etag = rdf_service.etag()
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
     try:
-        skills = rdf_service.get_all_skills()
+        skills = await _run(light_lane, rdf_service.get_all_skills)
+        response.headers.update(_fresh_cache_headers(etag, rdf_service.etag()))
         return {
             "total": len(skills),
             "technical": [s for s in skills if s['type'] == 'technical'],
             "soft": [s for s in skills if s['type'] == 'soft'],
             "all": skills
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -92,70 +373,183 @@ async def get_all_skills():
         )
 
 @router.get("/profiles")
-async def get_all_profiles():
+async def get_all_profiles(request: Request, response: Response):
     """
     Récupère tous les profils professionnels disponibles
     """
+    etag = rdf_service.etag()
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
     try:
-        profiles = rdf_service.get_all_profiles()
+        profiles = await _run(light_lane, rdf_service.get_all_profiles)
+        response.headers.update(_fresh_cache_headers(etag, rdf_service.etag()))
         return {
             "total": len(profiles),
             "profiles": profiles
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur: {str(e)}"
         )
 
+async def _suggest(request: Request, response: Response, suggest, q: str, k: int):
+    """Suggestions d'autocomplétion (ETag et mise en cache comme /skills et /profiles)"""
+    etag = rdf_service.etag()
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    try:
+        suggestions = await _run(light_lane, suggest, q, k)
+        response.headers.update(_fresh_cache_headers(etag, rdf_service.etag()))
+        return {"query": q, "suggestions": suggestions}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur: {str(e)}"
+        )
+
+@router.get("/skills/suggest")
+async def suggest_skills(
+    request: Request,
+    response: Response,
+    q: str = "",
+    k: int = Query(10, ge=1, le=MAX_SUGGESTIONS)
+):
+    """
+    Autocomplétion des compétences : nom (ou libellé) dont un mot commence
+    par `q`, accents et casse ignorés. Au plus `k` suggestions (name, type,
+    count), classées par nombre de candidats
+    """
+    return await _suggest(request, response, rdf_service.suggest_skills, q, k)
+
+@router.get("/profiles/suggest")
+async def suggest_profiles(
+    request: Request,
+    response: Response,
+    q: str = "",
+    k: int = Query(10, ge=1, le=MAX_SUGGESTIONS)
+):
+    """
+    Autocomplétion des profils sur tous leurs libellés (fr, en, nom local).
+    Au plus `k` suggestions (name, count), classées par nombre de candidats
+    """
+    return await _suggest(request, response, rdf_service.suggest_profiles, q, k)
+
 @router.get("/stats")
-async def get_statistics():
+async def get_statistics(request: Request, response: Response):
     """
     Récupère des statistiques sur les candidats
     """
+    etag = rdf_service.etag()
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
     try:
-        candidates = rdf_service.get_all_candidates()
-        skills = rdf_service.get_all_skills()
-        profiles = rdf_service.get_all_profiles()
-        
-        # Calculer quelques statistiques
-        total_candidates = len(candidates)
-        avg_experience = sum(c['yearsOfExperience'] for c in candidates) / total_candidates if total_candidates > 0 else 0
-        
-        # Compter les candidats par profil
-        profile_distribution = {}
-        for c in candidates:
-            profile = c.get('profile', 'Non défini')
-            profile_distribution[profile] = profile_distribution.get(profile, 0) + 1
-        
-        # Compétences les plus demandées
-        skill_count = {}
-        for c in candidates:
-            for skill in c['skills']:
-                skill_name = skill['name']
-                skill_count[skill_name] = skill_count.get(skill_name, 0) + 1
-        
-        most_common_skills = sorted(skill_count.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        return {
-            "total_candidates": total_candidates,
-            "total_skills": len(skills),
-            "total_profiles": len(profiles),
-            "average_experience": round(avg_experience, 1),
-            "profile_distribution": profile_distribution,
-            "most_common_skills": [
-                {"skill": skill, "count": count} 
-                for skill, count in most_common_skills
-            ]
-        }
+        # Agrégats maintenus à chaque import : lecture en O(1)
+        stats = await _run(light_lane, rdf_service.get_statistics)
+        response.headers.update(_fresh_cache_headers(etag, rdf_service.etag()))
+        return stats
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur: {str(e)}"
         )
 
+@router.get("/cache/stats")
+async def get_cache_statistics():
+    """
+    Statistiques du cache des résultats (entrées, taille, hits / misses)
+    et du JSON pré-encodé des candidats ("fragments")
+    """
+    return {**rdf_service.result_cache.stats(), "fragments": rdf_service.fragments.stats()}
+
+# ============= ADMINISTRATION =============
+
+def _check_admin(request: Request):
+    """403 si ADMIN_TOKEN est défini et que l'en-tête X-Admin-Token ne correspond pas"""
+    if settings.ADMIN_TOKEN and not hmac.compare_digest(
+        request.headers.get("x-admin-token", ""), settings.ADMIN_TOKEN
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Jeton d'administration invalide")
+
+@router.post("/admin/reload", status_code=status.HTTP_202_ACCEPTED)
+async def reload_ontology(request: Request):
+    """
+    Recharge le fichier d'ontologie en arrière-plan : l'ancienne version
+    est servie jusqu'à l'échange. Suivi via GET /api/admin/reload
+    """
+    _check_admin(request)
+    if not rdf_service.start_reload():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Rechargement déjà en cours")
+    return {"status": "started", "generation": rdf_service.generation}
+
+@router.get("/admin/reload")
+async def get_reload_status(request: Request):
+    """État du dernier rechargement (running, done, failed) et génération servie"""
+    _check_admin(request)
+    return rdf_service.reload_status
+
 # ============= NOUVELLES ROUTES SPARQL =============
 
+def _run_sparql(query: str) -> dict:
+    """Exécution synchrone d'une requête SPARQL utilisateur et mise en forme JSON"""
+    # Exécuter la requête
+    results = rdf_service.user_query(query)
+    
+    # Convertir les résultats en format JSON
+    if not results:
+        return {
+            "success": True,
+            "results": [],
+            "count": 0,
+            "message": "Requête exécutée avec succès - Aucun résultat"
+        }
+    
+    # Extraire les noms de colonnes et formater les résultats
+    formatted_results = []
+    columns = []
+    
+    if results and len(results) > 0:
+        # Obtenir les variables (colonnes)
+        first_row = results[0]
+        if hasattr(first_row, 'labels'):
+            columns = [str(var) for var in first_row.labels]
+        elif hasattr(first_row, '__iter__') and not isinstance(first_row, str):
+            # Essayer de détecter les variables
+            columns = [f"var{i}" for i in range(len(first_row))]
+        
+        # Formater chaque ligne
+        for row in results:
+            if hasattr(row, 'asdict'):
+                # Si la ligne a une méthode asdict
+                formatted_results.append(row.asdict())
+            elif hasattr(row, '__iter__') and not isinstance(row, str):
+                # Si la ligne est itérable
+                row_data = {}
+                for i, value in enumerate(row):
+                    col_name = columns[i] if i < len(columns) else f"var{i}"
+                    row_data[col_name] = str(value) if value is not None else None
+                formatted_results.append(row_data)
+            else:
+                # Cas par défaut
+                formatted_results.append({"result": str(row)})
+    
+    return {
+        "success": True,
+        "results": formatted_results,
+        "columns": columns if columns else list(formatted_results[0].keys()) if formatted_results else [],
+        "count": len(formatted_results),
+        "message": f"{len(formatted_results)} résultat(s) trouvé(s)"
+    }
+
 @router.post("/sparql/execute")
 async def execute_sparql(sparql_query: SPARQLQuery):
     """
@@ -165,55 +559,11 @@ async def execute_sparql(sparql_query: SPARQLQuery):
     depuis l'interface web
     """
     try:
-        # Exécuter la requête
-        results = list(rdf_service.graph.query(sparql_query.query))
-        
-        # Convertir les résultats en format JSON
-        if not results:
-            return {
-                "success": True,
-                "results": [],
-                "count": 0,
-                "message": "Requête exécutée avec succès - Aucun résultat"
-            }
-        
-        # Extraire les noms de colonnes et formater les résultats
-        formatted_results = []
-        columns = []
-        
-        if results and len(results) > 0:
-            # Obtenir les variables (colonnes)
-            first_row = results[0]
-            if hasattr(first_row, 'labels'):
-                columns = [str(var) for var in first_row.labels]
-            elif hasattr(first_row, '__iter__') and not isinstance(first_row, str):
-                # Essayer de détecter les variables
-                columns = [f"var{i}" for i in range(len(first_row))]
-            
-            # Formater chaque ligne
-            for row in results:
-                if hasattr(row, 'asdict'):
-                    # Si la ligne a une méthode asdict
-                    formatted_results.append(row.asdict())
-                elif hasattr(row, '__iter__') and not isinstance(row, str):
-                    # Si la ligne est itérable
-                    row_data = {}
-                    for i, value in enumerate(row):
-                        col_name = columns[i] if i < len(columns) else f"var{i}"
-                        row_data[col_name] = str(value) if value is not None else None
-                    formatted_results.append(row_data)
-                else:
-                    # Cas par défaut
-                    formatted_results.append({"result": str(row)})
-        
-        return {
-            "success": True,
-            "results": formatted_results,
-            "columns": columns if columns else list(formatted_results[0].keys()) if formatted_results else [],
-            "count": len(formatted_results),
-            "message": f"{len(formatted_results)} résultat(s) trouvé(s)"
-        }
-            
+        query = sparql_query.query
+        return await _run(heavy_lane, rdf_service.cached_result, "sparql", lambda: _run_sparql(query),
+                          normalize_sparql(query))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
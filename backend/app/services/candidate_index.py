@@ -0,0 +1,500 @@
+import base64
+import binascii
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.name_search import inner_trigrams, name_score, normalize_name, required_trigrams, short_keys, trigrams
+
+# Ordinal des niveaux de diplôme (utilisé pour le filtre minDegreeLevel)
+DEGREE_SCORES = {"Bac+2": 2, "Bac+3": 3, "Bac+5": 5, "Doctorat": 8}
+
+
+def degree_score(level: Optional[str]) -> int:
+    """Ordinal d'un niveau de diplôme (0 si inconnu ou absent)"""
+    return DEGREE_SCORES.get(level or '', 0)
+
+
+def iter_slots(bitmap: int, limit: Optional[int] = None) -> List[int]:
+    """Positions des bits à 1 d'un bitmap, par ordre croissant (au plus `limit`)"""
+    bits = bin(bitmap)[:1:-1]  # bit de poids faible en premier
+    slots = []
+    pos = bits.find('1')
+    while pos != -1 and (limit is None or len(slots) < limit):
+        slots.append(pos)
+        pos = bits.find('1', pos + 1)
+    return slots
+
+
+def bitmap_from_slots(slots: Iterable[int]) -> int:
+    """Construit un bitmap à partir d'une liste de positions"""
+    slots = list(slots)
+    if not slots:
+        return 0
+    buffer = bytearray((max(slots) >> 3) + 1)
+    for slot in slots:
+        buffer[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+# Tranches d'expérience des facettes : (libellé, min, max inclus ou None)
+EXPERIENCE_BUCKETS = (("0-2", 0, 2), ("3-5", 3, 5), ("6-10", 6, 10), ("11+", 11, None))
+
+
+# Compaction (reconstruction dans l'ordre de référence) dès que la queue
+# d'ajouts dépasse max(COMPACT_MIN, 1/8 des candidats triés)
+COMPACT_MIN = 1024
+
+
+def projection(candidate: Dict) -> Dict:
+    """Champs d'un candidat utilisés par les index (projection compacte)"""
+    degree = candidate.get('degree')
+    return {
+        'id': candidate['id'],
+        'name': candidate['name'],
+        'yearsOfExperience': candidate['yearsOfExperience'],
+        'profile': candidate.get('profile'),
+        'degree': {'level': degree['level']} if degree else None,
+        'skills': [{'name': s['name'], 'type': s['type']} for s in candidate['skills']],
+    }
+
+
+def sort_key(candidate: Dict) -> Tuple[int, str]:
+    """Clé de l'ordre de référence (expérience décroissante, puis id)"""
+    return -candidate['yearsOfExperience'], candidate['id']
+
+
+def encode_cursor(years: int, candidate_id: str, score: Optional[int] = None) -> str:
+    """
+    Curseur opaque : position (années, id) du dernier candidat renvoyé,
+    précédée de son score pour une recherche par nom (classement par pertinence)
+    """
+    raw = f"{years}|{candidate_id}" if score is None else f"~{score}|{years}|{candidate_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str, Optional[int]]:
+    """(années, id, score ou None) d'un curseur"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        score = None
+        if raw.startswith('~'):
+            score, raw = raw[1:].split('|', 1)
+            score = int(score)
+        years, candidate_id = raw.split('|', 1)
+        return int(years), candidate_id, score
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Curseur invalide : {cursor}")
+
+
+def _contains(postings: array, slot: int) -> bool:
+    i = bisect_left(postings, slot)
+    return i < len(postings) and postings[i] == slot
+
+
+class CandidateIndex:
+    """
+    Projection matérialisée des candidats, construite une fois au chargement.
+
+    Les candidats sont numérotés de façon dense (slot) dans l'ordre de
+    référence ORDER BY DESC(?experience), ?id ; chaque index inversé associe
+    une clé à un bitmap (entier Python) de slots :
+    - compétence -> bitmap
+    - profil -> bitmap
+    - ordinal du niveau de diplôme -> bitmap
+    - années d'expérience (valeurs triées, bisect pour minExperience) -> bitmap
+
+    Une recherche se résout par opérations bit à bit (AND / OR / NOT) ;
+    seuls les candidats retenus sont ensuite hydratés par le service RDF.
+
+    Recherche par nom (searchTerm) : noms normalisés (sans accents,
+    casefold, voir name_search) et listes de slots triées par trigramme.
+    Seuls les candidats des listes des trigrammes de la recherche sont
+    examinés (intersection pour la sous-chaîne, comptage des trigrammes
+    communs pour les fautes de frappe) ; les résultats sont classés par score.
+    Une recherche de 1 ou 2 caractères lit les listes des seuls trigrammes
+    qui la contiennent (`grams_by_short`).
+
+    Mise à jour incrémentale (`add_many` / `remove_many`) : les nouveaux
+    candidats prennent des slots en queue (ordre d'arrivée) gardés triés
+    à part dans `tail` ; les slots supprimés sont effacés des bitmaps.
+    Quand la queue grossit, le service reconstruit l'index (`compacted`).
+    """
+
+    def __init__(self, candidates: Iterable[Dict]):
+        # Ordre de référence : ORDER BY DESC(?experience), ?id
+        ordered = [projection(c) for c in sorted(candidates, key=sort_key)]
+
+        self.ids: List[str] = [c['id'] for c in ordered]
+        self.keys: List[Tuple[int, str]] = [sort_key(c) for c in ordered]
+        self.slots: Dict[str, int] = {cid: slot for slot, cid in enumerate(self.ids)}
+        self.names: List[str] = [c['name'] for c in ordered]
+        self.search_names: List[str] = []
+        self.by_trigram: Dict[str, array] = {}
+        # Sous-chaîne de 1 ou 2 caractères -> trigrammes indexés qui la contiennent
+        self.grams_by_short: Dict[str, Set[str]] = {}
+        self.records: List[Optional[Dict]] = ordered
+        self.all: int = (1 << len(self.ids)) - 1
+        # Slots [0, sorted_count) dans l'ordre de référence ; au-delà, la queue
+        self.sorted_count = len(self.ids)
+        self.tail: List[Tuple[Tuple[int, str], int]] = []
+
+        # Listes de slots d'abord, converties en bitmaps une seule fois
+        skill_slots: Dict[str, List[int]] = {}
+        profile_slots: Dict[Optional[str], List[int]] = {}
+        degree_slots: Dict[int, List[int]] = {}
+        years_slots: Dict[int, List[int]] = {}
+
+        for slot, candidate in enumerate(ordered):
+            for skill in candidate['skills']:
+                skill_slots.setdefault(skill['name'], []).append(slot)
+            profile_slots.setdefault(candidate.get('profile'), []).append(slot)
+            score = degree_score((candidate.get('degree') or {}).get('level'))
+            degree_slots.setdefault(score, []).append(slot)
+            years_slots.setdefault(candidate['yearsOfExperience'], []).append(slot)
+
+        self.by_skill: Dict[str, int] = {k: bitmap_from_slots(v) for k, v in skill_slots.items()}
+        self.by_profile: Dict[Optional[str], int] = {k: bitmap_from_slots(v) for k, v in profile_slots.items()}
+        self.by_degree: Dict[int, int] = {k: bitmap_from_slots(v) for k, v in degree_slots.items()}
+        self.by_years: Dict[int, int] = {k: bitmap_from_slots(v) for k, v in years_slots.items()}
+
+        # Valeurs distinctes d'années d'expérience, triées
+        self.years: List[int] = sorted(self.by_years)
+
+        self._index_names(self.names)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _index_names(self, names: List[str]):
+        """Ajoute les noms des slots suivants aux listes de trigrammes (slots croissants)"""
+        normalized: Dict[str, Tuple[str, Set[str]]] = {}
+        for name in names:
+            slot = len(self.search_names)
+            entry = normalized.get(name)
+            if entry is None:
+                search_name = normalize_name(name)
+                entry = normalized[name] = (search_name, trigrams(search_name))
+            self.search_names.append(entry[0])
+            for gram in entry[1]:
+                postings = self.by_trigram.get(gram)
+                if postings is None:
+                    postings = self.by_trigram[gram] = array('I')
+                    for key in short_keys(gram):
+                        self.grams_by_short.setdefault(key, set()).add(gram)
+                postings.append(slot)
+
+    # ----- mises à jour incrémentales -----
+
+    @staticmethod
+    def _record_keys(record: Dict):
+        """Clés des index inversés d'un candidat : (index, clé)"""
+        for skill in record['skills']:
+            yield 'by_skill', skill['name']
+        yield 'by_profile', record.get('profile')
+        yield 'by_degree', degree_score((record.get('degree') or {}).get('level'))
+        yield 'by_years', record['yearsOfExperience']
+
+    def add_many(self, candidates: Iterable[Dict]):
+        """Ajoute (ou remplace) des candidats ; un seul OR par bitmap touché"""
+        candidates = [projection(c) for c in candidates]
+        self.remove_many([c['id'] for c in candidates if c['id'] in self.slots])
+
+        added: Dict[Tuple[str, object], List[int]] = {}
+        new_slots = []
+        for record in candidates:
+            slot = len(self.ids)
+            key = sort_key(record)
+            self.ids.append(record['id'])
+            self.keys.append(key)
+            self.names.append(record['name'])
+            self.records.append(record)
+            self.slots[record['id']] = slot
+            insort(self.tail, (key, slot))
+            new_slots.append(slot)
+            for index_key in self._record_keys(record):
+                added.setdefault(index_key, []).append(slot)
+
+        for (name, key), slots in added.items():
+            index = getattr(self, name)
+            if name == 'by_years' and key not in index:
+                insort(self.years, key)
+            index[key] = index.get(key, 0) | bitmap_from_slots(slots)
+        self.all |= bitmap_from_slots(new_slots)
+        self._index_names([record['name'] for record in candidates])
+
+    def remove_many(self, candidate_ids: Iterable[str]):
+        """Retire des candidats des index (leurs slots deviennent vides)"""
+        removed: Dict[Tuple[str, object], List[int]] = {}
+        gone = []
+        for candidate_id in candidate_ids:
+            slot = self.slots.pop(candidate_id, None)
+            if slot is None:
+                continue
+            record, self.records[slot] = self.records[slot], None
+            gone.append(slot)
+            if slot >= self.sorted_count:
+                self.tail.remove((self.keys[slot], slot))
+            for index_key in self._record_keys(record):
+                removed.setdefault(index_key, []).append(slot)
+            for gram in trigrams(self.search_names[slot]):
+                postings = self.by_trigram[gram]
+                del postings[bisect_left(postings, slot)]
+                if not postings:
+                    del self.by_trigram[gram]
+                    for key in short_keys(gram):
+                        grams = self.grams_by_short[key]
+                        grams.discard(gram)
+                        if not grams:
+                            del self.grams_by_short[key]
+
+        for (name, key), slots in removed.items():
+            index = getattr(self, name)
+            bitmap = index.get(key, 0) & ~bitmap_from_slots(slots)
+            if bitmap:
+                index[key] = bitmap
+            else:
+                index.pop(key, None)
+                if name == 'by_years':
+                    self.years.remove(key)
+        self.all &= ~bitmap_from_slots(gone)
+
+    def needs_compaction(self) -> bool:
+        # Slots vides + candidats en queue
+        pending = len(self.ids) - len(self.slots) + len(self.tail)
+        return pending > max(COMPACT_MIN, self.sorted_count // 8)
+
+    def compacted(self) -> 'CandidateIndex':
+        """Nouvel index dense, tous les slots dans l'ordre de référence"""
+        return CandidateIndex(r for r in self.records if r is not None)
+
+    def skills_all(self, skills: List[str]) -> int:
+        """Candidats ayant TOUTES les compétences (AND, du plus sélectif au moins sélectif)"""
+        bitmaps = sorted((self.by_skill.get(s, 0) for s in skills), key=int.bit_count)
+        result = self.all
+        for bitmap in bitmaps:
+            result &= bitmap
+            if not result:
+                break
+        return result
+
+    def skills_any(self, skills: List[str]) -> int:
+        """Candidats ayant AU MOINS UNE des compétences (OR)"""
+        result = 0
+        for skill in skills:
+            result |= self.by_skill.get(skill, 0)
+        return result
+
+    def skills_none(self, skills: List[str]) -> int:
+        """Candidats n'ayant AUCUNE des compétences (NOT)"""
+        return self.all & ~self.skills_any(skills)
+
+    def min_degree(self, level: Optional[str]) -> int:
+        min_score = degree_score(level)
+        result = 0
+        for score, bitmap in self.by_degree.items():
+            if score >= min_score:
+                result |= bitmap
+        return result
+
+    def min_experience(self, years: int) -> int:
+        result = 0
+        for value in self.years[bisect_left(self.years, years):]:
+            result |= self.by_years[value]
+        return result
+
+    def name_matches(self, term: str) -> Dict[int, int]:
+        """
+        Slots dont le nom correspond à la recherche, avec leur score
+        (name_search.name_score) : noms contenant la recherche (accents et
+        casse ignorés) et noms proches (name_search.required_trigrams)
+        """
+        query = normalize_name(term)
+        if not query:
+            return {}
+        query_grams = trigrams(query)
+        postings = self.by_trigram
+
+        inner = inner_trigrams(query)
+        if inner:
+            # Sous-chaîne : intersection des listes, de la plus courte à la plus longue
+            lists = sorted((postings.get(g, array('I')) for g in inner), key=len)
+            candidates = {slot for slot in lists[0] if all(_contains(p, slot) for p in lists[1:])}
+        else:
+            # 1 ou 2 caractères : contenus dans au moins un trigramme du nom
+            candidates = set()
+            for gram in self.grams_by_short.get(query, ()):
+                candidates.update(postings[gram])
+
+        required = required_trigrams(query, query_grams)
+        if required is not None:
+            # Fautes de frappe : trigrammes en commun comptés sur les listes
+            counts = Counter()
+            for gram in query_grams:
+                counts.update(postings.get(gram, ()))
+            candidates.update(slot for slot, count in counts.items() if count >= required)
+
+        matches = {}
+        scored: Dict[str, int] = {}  # homonymes : un seul calcul
+        for slot in candidates:
+            name = self.search_names[slot]
+            score = scored.get(name)
+            if score is None:
+                score = scored[name] = name_score(query, query_grams, name, trigrams(name), required)
+            if score:
+                matches[slot] = score
+        return matches
+
+    def match(self, filters: Dict, scores: Optional[Dict[int, int]] = None) -> int:
+        """
+        Bitmap des candidats correspondant aux filtres ; avec une recherche
+        par nom, les scores des candidats retenus sont ajoutés à `scores`
+        """
+        bitmaps = []
+
+        # Compétences : le candidat doit les avoir TOUTES
+        if filters.get('skills'):
+            bitmaps.append(self.skills_all(filters['skills']))
+        if filters.get('anySkills'):
+            bitmaps.append(self.skills_any(filters['anySkills']))
+        if filters.get('excludeSkills'):
+            bitmaps.append(self.skills_none(filters['excludeSkills']))
+
+        if filters.get('profile'):
+            bitmaps.append(self.by_profile.get(filters['profile'], 0))
+
+        if degree_score(filters.get('minDegreeLevel')) > 0:
+            bitmaps.append(self.min_degree(filters['minDegreeLevel']))
+
+        if (filters.get('minExperience') or 0) > 0:
+            bitmaps.append(self.min_experience(filters['minExperience']))
+
+        result = self.all
+        for bitmap in sorted(bitmaps, key=int.bit_count):
+            result &= bitmap
+            if not result:
+                return 0
+
+        term = filters.get('searchTerm')
+        if term and normalize_name(term):
+            matches = self.name_matches(term)
+            result &= bitmap_from_slots(matches)
+            if scores is not None:
+                scores.update((slot, matches[slot]) for slot in iter_slots(result))
+
+        return result
+
+    def facet_counts(self, bitmap: int) -> Dict:
+        """
+        Facettes d'un résultat : nombre de candidats retenus par compétence,
+        profil, niveau de diplôme et tranche d'expérience, chacun calculé
+        par une intersection de bitmaps (AND + bit_count), sans hydratation.
+        Les candidats sans profil ou sans diplôme ne forment pas de valeur.
+        """
+        def counts(index: Dict, label=lambda key: key) -> List[Dict]:
+            values = []
+            for key, slots in index.items():
+                value = label(key)
+                if value is None:
+                    continue
+                count = (slots & bitmap).bit_count()
+                if count:
+                    values.append({"value": value, "count": count})
+            values.sort(key=lambda v: (-v["count"], str(v["value"])))
+            return values
+
+        levels = {score: level for level, score in DEGREE_SCORES.items()}
+        experience = []
+        for name, low, high in EXPERIENCE_BUCKETS:
+            years = self.years[bisect_left(self.years, low):
+                               len(self.years) if high is None else bisect_right(self.years, high)]
+            count = sum((self.by_years[value] & bitmap).bit_count() for value in years)
+            experience.append({"value": name, "count": count})
+
+        return {
+            "total": bitmap.bit_count(),
+            "skills": counts(self.by_skill),
+            "profiles": counts(self.by_profile),
+            "degreeLevels": counts(self.by_degree, levels.get),
+            "experience": experience,
+        }
+
+    def search(self, filters: Dict) -> List[str]:
+        """Retourne les ids correspondant aux filtres, dans l'ordre de référence"""
+        return self.page(filters)[0]
+
+    def page(self, filters: Optional[Dict] = None, cursor: Optional[str] = None,
+             limit: Optional[int] = None, facets: Optional[Dict] = None) -> Tuple[List[str], Optional[str]]:
+        """
+        Pagination par curseur (keyset) sur l'ordre de référence, ou sur
+        (score décroissant, ordre de référence) avec une recherche par nom.
+        Retourne les ids de la page et le curseur de la page suivante (ou None) ;
+        avec `facets`, y ajoute les facettes de tout le résultat (même bitmap).
+        """
+        filters = filters or {}
+        if filters.get('searchTerm') and normalize_name(filters['searchTerm']):
+            return self._ranked_page(filters, cursor, limit, facets)
+
+        bitmap = self.match(filters)
+        if facets is not None:
+            facets.update(self.facet_counts(bitmap))
+        start, tail_start = 0, 0
+        if cursor:
+            years, candidate_id, score = decode_cursor(cursor)
+            if score is not None:
+                raise ValueError(f"Curseur invalide : {cursor}")
+            start = bisect_right(self.keys, (-years, candidate_id), 0, self.sorted_count)
+            tail_start = bisect_right(self.tail, ((-years, candidate_id), len(self.ids)))
+
+        base = bitmap & ((1 << self.sorted_count) - 1)
+        slots = iter_slots(base >> start << start, limit + 1 if limit else None)
+        if self.tail:
+            # Queue d'ajouts : déjà triée à part, fusionnée par clé
+            offset = self.sorted_count
+            hits = set(iter_slots(bitmap >> offset))
+            tail_slots = []
+            for _key, slot in self.tail[tail_start:]:
+                if slot - offset in hits:
+                    tail_slots.append(slot)
+                    if limit and len(tail_slots) > limit:
+                        break
+            if tail_slots:
+                slots = list(heapq.merge(slots, tail_slots, key=self.keys.__getitem__))
+                if limit:
+                    slots = slots[:limit + 1]
+        next_cursor = None
+        if limit and len(slots) > limit:
+            slots = slots[:limit]
+            last = slots[-1]
+            next_cursor = encode_cursor(-self.keys[last][0], self.ids[last])
+
+        return [self.ids[slot] for slot in slots], next_cursor
+
+    def _ranked_page(self, filters: Dict, cursor: Optional[str], limit: Optional[int],
+                     facets: Optional[Dict] = None) -> Tuple[List[str], Optional[str]]:
+        """Page d'une recherche par nom : clé (-score, -années, id)"""
+        scores: Dict[int, int] = {}
+        bitmap = self.match(filters, scores)
+        if facets is not None:
+            facets.update(self.facet_counts(bitmap))
+        ranked = ((-score, *self.keys[slot], slot) for slot, score in scores.items())
+        if cursor:
+            years, candidate_id, score = decode_cursor(cursor)
+            if score is None:
+                raise ValueError(f"Curseur invalide : {cursor}")
+            after = (-score, -years, candidate_id)
+            ranked = (entry for entry in ranked if entry[:3] > after)
+        if limit:
+            entries = heapq.nsmallest(limit + 1, ranked)
+        else:
+            entries = sorted(ranked)
+
+        next_cursor = None
+        if limit and len(entries) > limit:
+            entries = entries[:limit]
+            neg_score, neg_years, candidate_id, _slot = entries[-1]
+            next_cursor = encode_cursor(-neg_years, candidate_id, -neg_score)
+
+        return [self.ids[entry[3]] for entry in entries], next_cursor
@@ -0,0 +1,286 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.term import Node
+
+try:
+    import fcntl
+except ImportError:  # pas de verrou inter-processus : un seul worker écrivain
+    fcntl = None
+
+Triple = Tuple[Node, Node, Node]
+
+# Journal des modifications : une ligne par triplet, "+" (ajout) ou "-"
+# (suppression) suivi du triplet en N-Triples. Le rejeu dans l'ordre est
+# idempotent : pour chaque triplet, seule la dernière opération compte.
+HEADER = b"# cv-changelog v1\n"
+
+# Lignes parsées d'un coup lors du rejeu
+REPLAY_BATCH = 100_000
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+
+def change_log_path_for(source_path: str) -> str:
+    return source_path + ".log"
+
+
+def nt_term(term: Node) -> str:
+    """Terme au format N-Triples (échappement des littéraux)"""
+    if isinstance(term, URIRef):
+        return f"<{term}>"
+    if isinstance(term, BNode):
+        return f"_:{term}"
+    if isinstance(term, Literal):
+        value = f'"{str(term).translate(_ESCAPES)}"'
+        if term.language:
+            return f"{value}@{term.language}"
+        if term.datatype:
+            return f"{value}^^<{term.datatype}>"
+        return value
+    raise ValueError(f"Terme non supporté dans le journal : {term!r}")
+
+
+def fsync_dir(path: str):
+    """Rend durable un rename dans le dossier de `path`"""
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ChangeLog:
+    """
+    Journal append-only des triplets ajoutés / supprimés.
+
+    Les écritures sont groupées : `append` écrit dans le tampon du fichier,
+    un thread de fond fait un fsync au plus toutes les `fsync_interval`
+    secondes pour tout ce qui a été écrit entre-temps, et `wait_durable`
+    attend le fsync couvrant une écriture donnée.
+
+    Plusieurs workers peuvent partager le journal : chaque écriture, la
+    réécriture de compaction (`discard_until`) et la coupure d'une fin
+    tronquée se font sous un verrou exclusif (fcntl, fichier `.lock`). Une
+    écriture est complète (flush) avant de rendre le verrou, et un worker
+    dont le fichier a été remplacé par une compaction le rouvre.
+    Sans fcntl, un seul worker doit écrire.
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 0.02):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._cond = threading.Condition()
+        self._written = 0  # numéro de la dernière écriture
+        self._synced = 0   # numéro de la dernière écriture rendue durable
+        self._file = None
+        self._flusher: Optional[threading.Thread] = None
+        # Verrou inter-processus, réentrant dans le processus
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_file = None
+
+    @contextmanager
+    def locked(self):
+        """Section exclusive entre processus (écritures, compaction du journal)"""
+        with self._lock:
+            if fcntl is not None and self._lock_depth == 0:
+                if self._lock_file is None:
+                    self._lock_file = open(self.path + ".lock", 'w')
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if fcntl is not None and self._lock_depth == 0:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    # ----- rejeu -----
+
+    def replay(self, graph: Graph, limit: Optional[int] = None) -> int:
+        """
+        Rejoue le journal sur le graphe (jusqu'à l'octet `limit` si donné) ;
+        une fin de fichier tronquée (écriture interrompue) est ignorée puis
+        coupée. Retourne le nombre d'opérations rejouées.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        count, valid = 0, 0
+        op, run = None, []
+
+        def flush():
+            if not run:
+                return
+            parsed = Graph()
+            parsed.parse(data="".join(run), format="nt")
+            if op == "+":
+                graph.addN((s, p, o, graph) for s, p, o in parsed)
+            else:
+                for triple in parsed:
+                    graph.remove(triple)
+            run.clear()
+
+        with open(self.path, 'rb') as f:
+            for raw in f:
+                if not raw.endswith(b"\n") or (limit is not None and valid + len(raw) > limit):
+                    break
+                valid += len(raw)
+                line = raw.decode()
+                if line.startswith('#') or not line.strip():
+                    continue
+                if line[0] != op or len(run) >= REPLAY_BATCH:
+                    flush()
+                    op = line[0]
+                run.append(line[2:])
+                count += 1
+            flush()
+
+        if limit is None and valid < os.path.getsize(self.path):
+            with self.locked():
+                self._truncate_partial(valid)
+        return count
+
+    def _truncate_partial(self, valid: int):
+        """
+        Coupe la fin du fichier après `valid` si c'est une ligne incomplète
+        (sous verrou : une fin sans retour à la ligne vient d'une écriture
+        interrompue, un autre worker peut avoir ajouté des lignes complètes)
+        """
+        with open(self.path, 'r+b') as f:
+            f.seek(valid)
+            rest = f.read()
+            if rest and b"\n" not in rest:
+                f.truncate(valid)
+
+    # ----- écriture -----
+
+    def open(self):
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, 'ab')
+        if new:
+            self._file.write(HEADER)
+            self._sync()
+            fsync_dir(self.path)
+        self._flusher = threading.Thread(target=self._flush_loop, name="changelog-fsync", daemon=True)
+        self._flusher.start()
+
+    def append(self, added: Iterable[Triple] = (), removed: Iterable[Triple] = ()) -> int:
+        """Écrit les suppressions puis les ajouts ; retourne le numéro de l'écriture"""
+        lines: List[str] = [f"- {nt_term(s)} {nt_term(p)} {nt_term(o)} .\n" for s, p, o in removed]
+        lines += [f"+ {nt_term(s)} {nt_term(p)} {nt_term(o)} .\n" for s, p, o in added]
+        data = "".join(lines).encode()
+        with self.locked(), self._cond:
+            self._reopen_if_replaced()
+            self._repair_tail()
+            self._file.write(data)
+            self._file.flush()
+            self._written += 1
+            self._cond.notify_all()
+            return self._written
+
+    def _reopen_if_replaced(self):
+        """Rouvre le journal s'il a été remplacé (compaction par un autre worker)"""
+        try:
+            replaced = os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            replaced = True
+        if replaced:
+            self._file.close()
+            self._file = open(self.path, 'ab')
+            if os.fstat(self._file.fileno()).st_size == 0:
+                self._file.write(HEADER)
+
+    def _repair_tail(self):
+        """Coupe une ligne incomplète laissée en fin de fichier par un worker interrompu"""
+        size = os.fstat(self._file.fileno()).st_size
+        if not size:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            # Début de la ligne incomplète : dernier retour à la ligne
+            position = size
+            while position > 0:
+                step = min(65536, position)
+                position -= step
+                f.seek(position)
+                newline = f.read(step).rfind(b"\n")
+                if newline >= 0:
+                    position += newline + 1
+                    break
+        self._file.truncate(position)
+
+    def wait_durable(self, seq: int):
+        with self._cond:
+            while self._synced < seq:
+                self._cond.wait()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                while self._synced == self._written:
+                    self._cond.wait()
+                target = self._written
+                self._file.flush()
+                fd = self._file.fileno()
+            try:
+                os.fsync(fd)
+            except OSError:
+                # Journal remplacé entre-temps (compaction) : déjà rendu durable
+                continue
+            with self._cond:
+                self._synced = max(self._synced, target)
+                self._cond.notify_all()
+            # Fenêtre de regroupement des écritures suivantes
+            time.sleep(self.fsync_interval)
+
+    def size(self) -> int:
+        with self._cond:
+            self._file.flush()
+            return os.path.getsize(self.path)
+
+    # ----- compaction -----
+
+    def checkpoint(self) -> int:
+        """Position (octets) couvrant toutes les écritures déjà faites"""
+        with self.locked(), self._cond:
+            self._reopen_if_replaced()
+            self._sync()
+            self._synced = self._written
+            self._cond.notify_all()
+            return os.path.getsize(self.path)
+
+    def discard_until(self, offset: int):
+        """
+        Remplace le journal par sa partie postérieure à `offset` (déjà
+        intégrée au fichier de base) : fichier temporaire puis rename, sous
+        verrou (aucune écriture d'un autre worker perdue).
+        """
+        with self.locked(), self._cond:
+            self._reopen_if_replaced()
+            self._sync()
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                tail = f.read()
+            tmp_path = f"{self.path}.tmp{os.getpid()}"
+            with open(tmp_path, 'wb') as f:
+                f.write(HEADER)
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            fsync_dir(self.path)
+            self._file = open(self.path, 'ab')
+            self._synced = self._written
+            self._cond.notify_all()
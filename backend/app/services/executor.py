@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Iterator
+
+from app.config import settings
+
+
+class PoolSaturatedError(Exception):
+    """Levée lorsque la file d'attente d'une voie d'exécution est pleine"""
+
+    def __init__(self, lane: str, retry_after: int):
+        super().__init__(f"Service saturé ({lane}), réessayez dans {retry_after}s")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class WorkerLane:
+    """
+    Voie d'exécution bornée pour le travail synchrone sur le graphe.
+
+    Au plus `workers` appels s'exécutent en parallèle et `queue_limit`
+    attendent ; au-delà, `run` lève PoolSaturatedError au lieu de mettre
+    la requête en file (la boucle d'événements n'est jamais bloquée).
+    Un flux (`stream`) occupe une place de la voie pendant toute sa durée.
+    """
+
+    def __init__(self, name: str, workers: int, queue_limit: int, retry_after: int):
+        self.name = name
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"rdf-{name}")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Appels en cours + en attente"""
+        return self._pending
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                raise PoolSaturatedError(self.name, self.retry_after)
+            self._pending += 1
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        self._acquire()
+        try:
+            future = self._pool.submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # Libération à la fin réelle du travail, même si le client abandonne
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stream(self, iterator: Iterator) -> "LaneStream":
+        """
+        Itère `iterator` (synchrone) dans la voie : la place est réservée dès
+        l'appel (PoolSaturatedError avant le début de la réponse) et rendue à
+        la fin du flux ou par `LaneStream.close` ; chaque élément est produit
+        par un thread de la voie
+        """
+        self._acquire()
+        return LaneStream(self, iterator)
+
+
+class LaneStream:
+    """
+    Flux itéré dans une voie, qui y occupe une place jusqu'à sa fin.
+
+    Un générateur jamais démarré n'exécute pas son `finally` : le
+    consommateur (la réponse HTTP) appelle `close` dans tous les cas,
+    la place n'étant rendue qu'une fois.
+    """
+
+    def __init__(self, lane: WorkerLane, iterator: Iterator):
+        self._lane = lane
+        self._iterator = iterator
+        self._released = False
+
+    def __aiter__(self) -> AsyncIterator:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator:
+        end = object()
+        try:
+            while not self._released:
+                item = await asyncio.wrap_future(self._lane._pool.submit(next, self._iterator, end))
+                if item is end:
+                    return
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        with self._lane._lock:
+            if self._released:
+                return
+            self._released = True
+            self._lane._pending -= 1
+
+
+# Voie "heavy" : listes, recherches, statistiques, SPARQL utilisateur
+heavy_lane = WorkerLane("heavy", settings.HEAVY_WORKERS, settings.HEAVY_QUEUE_LIMIT, settings.RETRY_AFTER_SECONDS)
+
+# Voie "light" : lectures courtes (compétences, profils, détail candidat)
+light_lane = WorkerLane("light", settings.LIGHT_WORKERS, settings.LIGHT_QUEUE_LIMIT, settings.RETRY_AFTER_SECONDS)
@@ -0,0 +1,171 @@
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from rdflib import Graph, RDF, RDFS
+from rdflib.store import Store
+from rdflib.term import Node
+
+from app.services.int_store import IntStore
+
+Triple = Tuple[Node, Node, Node]
+
+# Prédicats du schéma : un changement impose de recalculer toute la fermeture
+SCHEMA_PREDICATES = (RDFS.subClassOf, RDFS.subPropertyOf)
+
+
+def transitive_closure(graph: Graph, predicate: Node) -> Dict[Node, Set[Node]]:
+    """Pour chaque terme, tous ses ancêtres par `predicate` (lui-même exclu)"""
+    parents: Dict[Node, Set[Node]] = {}
+    for child, parent in graph.subject_objects(predicate):
+        if child != parent:
+            parents.setdefault(child, set()).add(parent)
+
+    closure: Dict[Node, Set[Node]] = {}
+    for start in parents:
+        ancestors: Set[Node] = set()
+        stack = list(parents[start])
+        while stack:
+            node = stack.pop()
+            if node in ancestors or node == start:
+                continue
+            ancestors.add(node)
+            stack.extend(parents.get(node, ()))
+        closure[start] = ancestors
+    return closure
+
+
+class UnionStore(Store):
+    """
+    Vue en lecture seule : triplets affirmés puis triplets inférés (les
+    deux ensembles sont disjoints, voir RDFSClosure). Les préfixes sont
+    ceux du store affirmé ; les écritures passent par le graphe affirmé.
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, asserted: Store, inferred: Store):
+        super().__init__()
+        self.asserted = asserted
+        self.inferred = inferred
+
+    def add(self, triple, context, quoted: bool = False):
+        raise TypeError("Vue d'inférence en lecture seule : écrire dans le graphe affirmé")
+
+    def addN(self, quads):
+        raise TypeError("Vue d'inférence en lecture seule : écrire dans le graphe affirmé")
+
+    def remove(self, triple_pattern, context=None):
+        raise TypeError("Vue d'inférence en lecture seule : écrire dans le graphe affirmé")
+
+    def triples(self, triple_pattern, context=None):
+        yield from self.asserted.triples(triple_pattern)
+        yield from self.inferred.triples(triple_pattern)
+
+    def __len__(self, context=None) -> int:
+        return len(self.asserted) + len(self.inferred)
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix: str, namespace: Node, override: bool = True):
+        self.asserted.bind(prefix, namespace, override=override)
+
+    def namespace(self, prefix: str) -> Optional[Node]:
+        return self.asserted.namespace(prefix)
+
+    def prefix(self, namespace: Node) -> Optional[str]:
+        return self.asserted.prefix(namespace)
+
+    def namespaces(self):
+        return self.asserted.namespaces()
+
+
+class RDFSClosure:
+    """
+    Fermeture RDFS matérialisée (chaînage avant) à côté du graphe affirmé :
+    - transitivité de rdfs:subClassOf et rdfs:subPropertyOf (rdfs11, rdfs5)
+    - héritage des types : x a C, C ⊑ D => x a D (rdfs9)
+    - héritage des propriétés : s p o, p ⊑ q => s q o (rdfs7)
+
+    Les triplets inférés (seulement ceux qui ne sont pas affirmés) sont
+    gardés dans un store séparé : ni le journal des modifications, ni la
+    compaction, ni les snapshots ne les voient. `view` réunit les deux
+    pour les requêtes SPARQL : `?s a :Skill` devient une recherche indexée,
+    sans chemin `rdfs:subClassOf*` évalué à chaque requête.
+
+    Les règles ne dépendent que des triplets d'un sujet et du schéma :
+    une écriture recalcule les triplets inférés des sujets touchés ; une
+    écriture touchant le schéma recalcule toute la fermeture.
+    """
+
+    def __init__(self, graph: Graph):
+        self.graph = graph
+        self.materialize()
+
+    def materialize(self):
+        """Recalcule toute la fermeture ; les lecteurs passent d'un bloc à la nouvelle vue"""
+        self.superclasses = transitive_closure(self.graph, RDFS.subClassOf)
+        self.superproperties = transitive_closure(self.graph, RDFS.subPropertyOf)
+        inferred = Graph(store=IntStore())
+        inferred.addN((s, p, o, inferred) for s, p, o in self._entailed_all())
+        self._publish(inferred)
+
+    def _publish(self, inferred: Graph):
+        self.inferred = inferred
+        self.view = Graph(store=UnionStore(self.graph.store, inferred.store))
+
+    def __len__(self) -> int:
+        return len(self.inferred)
+
+    def _entailed_all(self) -> Iterator[Triple]:
+        graph = self.graph
+        subjects: Set[Node] = set(self.superclasses) | set(self.superproperties)
+        for cls in self.superclasses:
+            subjects.update(graph.subjects(RDF.type, cls))
+        for prop in self.superproperties:
+            subjects.update(graph.subjects(prop, None))
+        for subject in subjects:
+            yield from self._entailed(subject)
+
+    def _entailed(self, subject: Node) -> Iterator[Triple]:
+        """Triplets inférés d'un sujet, hors triplets affirmés"""
+        graph = self.graph
+        inherited = [(subject, RDFS.subClassOf, ancestor) for ancestor in self.superclasses.get(subject, ())]
+        inherited += [(subject, RDFS.subPropertyOf, ancestor) for ancestor in self.superproperties.get(subject, ())]
+        for predicate, obj in graph.predicate_objects(subject):
+            ancestors = self.superproperties.get(predicate, ())
+            inherited += [(subject, ancestor, obj) for ancestor in ancestors]
+            if predicate == RDF.type or RDF.type in ancestors:
+                inherited += [(subject, RDF.type, ancestor) for ancestor in self.superclasses.get(obj, ())]
+        for triple in inherited:
+            if triple not in graph:
+                yield triple
+
+    def refresh(self, triples: Iterable[Triple]):
+        """
+        Met la fermeture à jour après l'ajout ou la suppression de
+        `triples` dans le graphe affirmé (appelé sous le verrou d'écriture).
+        Les lecteurs gardent l'ancienne vue jusqu'à la publication de la
+        nouvelle : copie du store inféré (permutations partagées, écritures
+        dans son delta), sujets touchés recalculés, puis échange de la vue.
+        """
+        subjects: Set[Node] = set()
+        for s, p, _o in triples:
+            if p in SCHEMA_PREDICATES:
+                self.materialize()
+                return
+            subjects.add(s)
+        if not subjects:
+            return
+        inferred = Graph(store=IntStore())
+        inferred.store.attach(*self.inferred.store.export())
+        for subject in subjects:
+            inferred.remove((subject, None, None))
+            inferred.addN((s, p, o, inferred) for s, p, o in self._entailed(subject))
+        self._publish(inferred)
+
+    def instances(self, cls: Node) -> Iterator[Node]:
+        """Instances de `cls`, sous-classes comprises (types affirmés et inférés)"""
+        return self.view.subjects(RDF.type, cls)
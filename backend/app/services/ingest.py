@@ -0,0 +1,155 @@
+import re
+import unicodedata
+from typing import Callable, Dict, List, Set, Tuple
+
+from rdflib import Graph, Literal, Namespace, OWL, RDF, RDFS, URIRef
+from rdflib.term import Node
+
+Triple = Tuple[Node, Node, Node]
+
+# Identifiant de candidat utilisable comme nom local d'URI
+CANDIDATE_ID = re.compile(r'^[A-Za-z][A-Za-z0-9_.-]*$')
+
+SKILL_CLASSES = {"technical": "TechnicalSkill", "soft": "SoftSkill"}
+
+# Classes et propriétés de l'ontologie utilisées par l'import
+TERMS = (
+    'Person', 'Degree', 'Experience',
+    'name', 'email', 'yearsOfExperience', 'hasSkill', 'hasProfile', 'hasDegree', 'hasExperience',
+    'skillName', 'degreeName', 'degreeLevel', 'yearObtained',
+    'jobTitle', 'company', 'duration', 'startYear', 'endYear',
+)
+
+
+def local_name(text: str) -> str:
+    """Nom local d'URI à partir d'un libellé : "Machine Learning" -> MachineLearning"""
+    ascii_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    words = re.findall(r'[A-Za-z0-9]+', ascii_text)
+    name = ''.join(w[0].upper() + w[1:] for w in words)
+    return name if name and name[0].isalpha() else f"N{name}"
+
+
+class TripleMapper:
+    """
+    Traduit des candidats (schéma `Candidate`) en triplets de l'ontologie :
+    :Person, :hasSkill, :hasDegree, :hasExperience, :hasProfile.
+
+    Les compétences et profils existants sont retrouvés par nom / libellé ;
+    les inconnus sont créés une seule fois (nouvel individu typé).
+
+    `record` donne la projection du candidat telle que le graphe la
+    relirait (type des compétences existantes, libellé retenu du profil),
+    ce qui évite de relire le graphe pour mettre à jour les index.
+    """
+
+    def __init__(self, graph: Graph, ns: Namespace, profile_label: Callable[[str, List], str]):
+        self.graph = graph
+        self.ns = ns
+        # URIs résolues une fois (Namespace.__getattr__ est coûteux)
+        self.p = {name: ns[name] for name in TERMS}
+        self.skills: Dict[str, URIRef] = {str(name): s for s, name in graph.subject_objects(ns.skillName)}
+        self.skill_types: Dict[URIRef, str] = {}
+        for skill_type, skill_class in SKILL_CLASSES.items():
+            for skill in graph.subjects(RDF.type, ns[skill_class]):
+                self.skill_types.setdefault(skill, skill_type)
+        self.profiles: Dict[str, URIRef] = {}
+        self.profile_labels: Dict[URIRef, str] = {}
+        for profile in graph.subjects(RDF.type, ns.Profile):
+            labels = list(graph.objects(profile, RDFS.label))
+            self.profiles[str(profile).split('#')[-1]] = profile
+            for label in labels:
+                self.profiles[str(label)] = profile
+            self.profile_labels[profile] = profile_label(str(profile), labels)
+        self._minted: Set[URIRef] = set()
+
+    def _new_node(self, label: str) -> URIRef:
+        """URI libre dans le namespace cv (suffixe numérique en cas de collision)"""
+        name = local_name(label)
+        node, n = self.ns[name], 2
+        while node in self._minted or (node, None, None) in self.graph:
+            node, n = self.ns[f"{name}{n}"], n + 1
+        self._minted.add(node)
+        return node
+
+    def _skill(self, skill: Dict, triples: List[Triple]) -> URIRef:
+        node = self.skills.get(skill['name'])
+        if node is None:
+            skill_class = SKILL_CLASSES.get(skill['type'])
+            if skill_class is None:
+                raise ValueError(f"Type de compétence inconnu : {skill['type']}")
+            node = self.skills[skill['name']] = self._new_node(skill['name'])
+            self.skill_types[node] = skill['type']
+            triples.append((node, RDF.type, self.ns[skill_class]))
+            triples.append((node, self.p['skillName'], Literal(skill['name'])))
+        return node
+
+    def _profile(self, label: str, triples: List[Triple]) -> URIRef:
+        node = self.profiles.get(label)
+        if node is None:
+            node = self.profiles[label] = self._new_node(label)
+            triples.append((node, RDF.type, OWL.NamedIndividual))
+            triples.append((node, RDF.type, self.ns.Profile))
+            triples.append((node, RDFS.label, Literal(label, lang='fr')))
+            self.profile_labels[node] = label
+        return node
+
+    def record(self, candidate: Dict) -> Dict:
+        """Projection du candidat pour les index (après `triples`)"""
+        profile = candidate.get('profile')
+        skills = []
+        for name in dict.fromkeys(skill['name'] for skill in candidate.get('skills') or []):
+            skill_type = self.skill_types.get(self.skills[name])
+            if skill_type:
+                skills.append({'name': name, 'type': skill_type})
+        degree = candidate.get('degree')
+        return {
+            'id': candidate['id'],
+            'name': candidate['name'],
+            'yearsOfExperience': candidate['yearsOfExperience'],
+            'profile': self.profile_labels[self.profiles[profile]] if profile else None,
+            'degree': {'level': degree['level']} if degree else None,
+            'skills': skills,
+        }
+
+    def triples(self, candidate: Dict) -> List[Triple]:
+        ns, p = self.ns, self.p
+        candidate_id = candidate['id']
+        if not CANDIDATE_ID.match(candidate_id):
+            raise ValueError(f"Identifiant de candidat invalide : {candidate_id}")
+
+        person = ns[candidate_id]
+        triples: List[Triple] = [
+            (person, RDF.type, p['Person']),
+            (person, p['name'], Literal(candidate['name'])),
+            (person, p['email'], Literal(candidate['email'])),
+            (person, p['yearsOfExperience'], Literal(candidate['yearsOfExperience'])),
+        ]
+        for skill in candidate.get('skills') or []:
+            triples.append((person, p['hasSkill'], self._skill(skill, triples)))
+        if candidate.get('profile'):
+            triples.append((person, p['hasProfile'], self._profile(candidate['profile'], triples)))
+
+        degree = candidate.get('degree')
+        if degree:
+            node = ns[f"{candidate_id}_Degree"]
+            triples += [
+                (person, p['hasDegree'], node),
+                (node, RDF.type, p['Degree']),
+                (node, p['degreeName'], Literal(degree['name'])),
+                (node, p['degreeLevel'], Literal(degree['level'])),
+            ]
+            if degree.get('year') is not None:
+                triples.append((node, p['yearObtained'], Literal(degree['year'])))
+
+        for n, experience in enumerate(candidate.get('experiences') or [], 1):
+            node = ns[f"{candidate_id}_Exp{n}"]
+            triples += [
+                (person, p['hasExperience'], node),
+                (node, RDF.type, p['Experience']),
+                (node, p['jobTitle'], Literal(experience['jobTitle'])),
+                (node, p['company'], Literal(experience['company'])),
+                (node, p['duration'], Literal(experience['duration'])),
+                (node, p['startYear'], Literal(experience['startYear'])),
+                (node, p['endYear'], Literal(experience['endYear'])),
+            ]
+        return triples
@@ -0,0 +1,337 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from rdflib.store import Store
+from rdflib.term import Node
+
+IdTriple = Tuple[int, int, int]
+
+# Permutations indexées : ordre des composantes (s=0, p=1, o=2)
+ORDERS = {"spo": (0, 1, 2), "pos": (1, 2, 0), "osp": (2, 0, 1)}
+
+# Fusion du delta dans les tableaux triés dès qu'il dépasse
+# max(MERGE_MIN, taille de la base) : coût amorti O(log n) par ajout
+MERGE_MIN = 1024
+
+
+def _empty_context() -> Iterator:
+    return iter(())
+
+
+class TermDictionary:
+    """Dictionnaire des termes : Node <-> id entier (ids denses à partir de 0)"""
+
+    def __init__(self, terms: Optional[List[Node]] = None):
+        self._terms: List[Node] = list(terms or [])
+        self._ids: Dict[Node, int] = {term: tid for tid, term in enumerate(self._terms)}
+        # Accès direct à la liste : matérialisation la plus rapide possible
+        self.term = self._terms.__getitem__
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def id_of(self, term: Node) -> Optional[int]:
+        return self._ids.get(term)
+
+    def intern(self, term: Node) -> int:
+        tid = self._ids.get(term)
+        if tid is None:
+            tid = self._ids[term] = len(self)
+            self._terms.append(term)
+        return tid
+
+
+class _State:
+    """
+    Permutations triées, nombre de triplets de base et delta d'écriture :
+    publiés ensemble par une seule affectation (fusion atomique pour les lecteurs)
+    """
+
+    __slots__ = ("index", "count", "added", "removed", "added_by")
+
+    def __init__(self, index: Dict[str, Tuple[Sequence[int], Sequence[int]]], count: int):
+        self.index = index
+        self.count = count
+        self.added: Set[IdTriple] = set()
+        self.removed: Set[IdTriple] = set()
+        # Delta des ajouts indexé par sujet, prédicat et objet
+        self.added_by: Tuple[Dict[int, Set[IdTriple]], ...] = ({}, {}, {})
+
+
+class IntStore(Store):
+    """
+    Store rdflib à dictionnaire de termes : chaque terme est interné en
+    un entier et les triplets sont gardés dans trois permutations triées
+    (SPO, POS, OSP) sous forme de tableaux compacts `array('q')`.
+
+    Chaque permutation est un couple de tableaux alignés : la clé (a, b)
+    compactée dans un int64 (a << 32 | b) et la composante c. Un motif se
+    résout par bisect (en C) sur ces tableaux ; les objets `Node` ne sont
+    matérialisés qu'en sortie de `triples`.
+
+    Les écritures vont dans un petit delta (ajouts / suppressions) indexé
+    par terme, fusionné dans les tableaux quand il devient trop gros. Une
+    lecture travaille sur l'état (`_State`) lu une fois à son début ; la
+    fusion construit un nouvel état complet puis le publie d'un bloc.
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration: Optional[str] = None, identifier: Optional[Node] = None):
+        super().__init__(configuration)
+        self.identifier = identifier
+        self._dict = TermDictionary()
+        self._state = _State({order: (array('q'), array('q')) for order in ORDERS}, 0)
+        self._namespace: Dict[str, Node] = {}
+        self._prefix: Dict[Node, str] = {}
+
+    # ----- dictionnaire des termes -----
+
+    def _intern(self, term: Node) -> int:
+        return self._dict.intern(term)
+
+    def term_id(self, term: Node) -> Optional[int]:
+        return self._dict.id_of(term)
+
+    def term(self, tid: int) -> Node:
+        return self._dict.term(tid)
+
+    # ----- permutations triées -----
+
+    @staticmethod
+    def _build(triples: Iterable[IdTriple], spo_sorted: bool = False) -> _State:
+        """Nouvel état (trois permutations, delta vide) à partir de triplets entiers"""
+        triples = triples if isinstance(triples, list) else list(triples)
+        index = {}
+        for order, (i, j, k) in ORDERS.items():
+            if order == "spo" and spo_sorted:
+                keys = triples
+            else:
+                keys = sorted((t[i], t[j], t[k]) for t in triples)
+            ab = array('q', [(a << 32) | b for a, b, _ in keys])
+            c = array('q', [c for _, _, c in keys])
+            index[order] = (ab, c)
+        return _State(index, len(triples))
+
+    @staticmethod
+    def _base_range(state: _State, order: str, a: int, b: Optional[int] = None,
+                    c: Optional[int] = None) -> Tuple[int, int]:
+        ab, cs = state.index[order]
+        if b is None:
+            return bisect_left(ab, a << 32), bisect_left(ab, (a + 1) << 32)
+        key = (a << 32) | b
+        lo, hi = bisect_left(ab, key), bisect_right(ab, key)
+        if c is not None:
+            lo = bisect_left(cs, c, lo, hi)
+            hi = lo + 1 if lo < hi and cs[lo] == c else lo
+        return lo, hi
+
+    @staticmethod
+    def _iter_base(state: _State, order: str, lo: int, hi: int) -> Iterator[IdTriple]:
+        """Triplets (s, p, o) entiers de la plage [lo, hi) d'une permutation"""
+        ab, cs = state.index[order]
+        mask = (1 << 32) - 1
+        removed = state.removed
+        for pos in range(lo, hi):
+            key = ab[pos]
+            a, b, c = key >> 32, key & mask, cs[pos]
+            if order == "spo":
+                triple = (a, b, c)
+            elif order == "pos":
+                triple = (c, a, b)
+            else:
+                triple = (b, c, a)
+            if not removed or triple not in removed:
+                yield triple
+
+    def _in_base(self, triple: IdTriple) -> bool:
+        lo, hi = self._base_range(self._state, "spo", *triple)
+        return lo < hi
+
+    def _match(self, s: Optional[int], p: Optional[int], o: Optional[int]) -> Iterator[IdTriple]:
+        """Triplets entiers correspondant au motif (None = variable)"""
+        state = self._state
+        if s is not None:
+            if p is not None:
+                base = self._base_range(state, "spo", s, p, o)
+                order = "spo"
+            elif o is not None:
+                base = self._base_range(state, "osp", o, s)
+                order = "osp"
+            else:
+                base = self._base_range(state, "spo", s)
+                order = "spo"
+        elif p is not None:
+            base = self._base_range(state, "pos", p, o)
+            order = "pos"
+        elif o is not None:
+            base = self._base_range(state, "osp", o)
+            order = "osp"
+        else:
+            base = (0, state.count)
+            order = "spo"
+        yield from self._iter_base(state, order, *base)
+
+        if not state.added:
+            return
+        if s is not None:
+            delta = state.added_by[0].get(s, ())
+        elif p is not None:
+            delta = state.added_by[1].get(p, ())
+        elif o is not None:
+            delta = state.added_by[2].get(o, ())
+        else:
+            delta = state.added
+        for triple in list(delta):
+            if (p is None or triple[1] == p) and (o is None or triple[2] == o):
+                yield triple
+
+    # ----- delta d'écriture -----
+
+    def _add_delta(self, triple: IdTriple):
+        state = self._state
+        state.added.add(triple)
+        for position, by in enumerate(state.added_by):
+            by.setdefault(triple[position], set()).add(triple)
+
+    def _drop_delta(self, triple: IdTriple):
+        state = self._state
+        state.added.discard(triple)
+        for position, by in enumerate(state.added_by):
+            bucket = by.get(triple[position])
+            if bucket is not None:
+                bucket.discard(triple)
+                if not bucket:
+                    del by[triple[position]]
+
+    def _maybe_merge(self):
+        state = self._state
+        if len(state.added) + len(state.removed) > max(MERGE_MIN, state.count):
+            self.merge()
+
+    def merge(self):
+        """Fusionne le delta dans de nouvelles permutations triées, publiées d'un bloc"""
+        state = self._state
+        if not state.added and not state.removed:
+            return
+        triples = list(self._iter_base(state, "spo", 0, state.count))
+        triples.extend(state.added)
+        triples.sort()
+        self._state = self._build(triples, spo_sorted=True)
+
+    def load(self, terms: List[Node], spo_triples: array):
+        """
+        Chargement en bloc (snapshot) : `terms[i]` est le terme d'id i et
+        `spo_triples` la suite plate (s, p, o) triée dans l'ordre SPO.
+        """
+        self._dict = TermDictionary(terms)
+        t = spo_triples
+        self._state = self._build([(t[n], t[n + 1], t[n + 2]) for n in range(0, len(t), 3)], spo_sorted=True)
+
+    def attach(self, term_dict: TermDictionary, index: Dict[str, Tuple[Sequence[int], Sequence[int]]],
+               count: int):
+        """
+        Branche des permutations déjà construites (ex. tableaux d'un fichier
+        mappé en mémoire, en lecture seule) : les écritures ultérieures vont
+        dans le delta puis dans des tableaux privés lors de la fusion.
+        """
+        self._dict = term_dict
+        self._state = _State(dict(index), count)
+
+    def export(self) -> Tuple[TermDictionary, Dict[str, Tuple[Sequence[int], Sequence[int]]], int]:
+        """Dictionnaire des termes et permutations, après fusion du delta"""
+        self.merge()
+        state = self._state
+        return self._dict, state.index, state.count
+
+    # ----- API Store -----
+
+    def add(self, triple, context, quoted: bool = False):
+        key = tuple(self._intern(term) for term in triple)
+        state = self._state
+        if key in state.removed:
+            state.removed.discard(key)
+        elif key not in state.added and not self._in_base(key):
+            self._add_delta(key)
+            self._maybe_merge()
+
+    def addN(self, quads):
+        state = self._state
+        for s, p, o, _c in quads:
+            key = (self._intern(s), self._intern(p), self._intern(o))
+            if key in state.removed:
+                state.removed.discard(key)
+            elif key not in state.added and not self._in_base(key):
+                self._add_delta(key)
+        self._maybe_merge()
+
+    def remove(self, triple_pattern, context=None):
+        pattern = self._encode_pattern(triple_pattern)
+        if pattern is None:
+            return
+        state = self._state
+        for triple in list(self._match(*pattern)):
+            if triple in state.added:
+                self._drop_delta(triple)
+            else:
+                state.removed.add(triple)
+        self._maybe_merge()
+
+    def _encode_pattern(self, triple_pattern) -> Optional[Tuple[Optional[int], ...]]:
+        """Motif en ids ; None si un terme lié est inconnu (aucun résultat)"""
+        encoded = []
+        for term in triple_pattern:
+            if term is None:
+                encoded.append(None)
+                continue
+            tid = self._dict.id_of(term)
+            if tid is None:
+                return None
+            encoded.append(tid)
+        return tuple(encoded)
+
+    def triples(self, triple_pattern, context=None):
+        pattern = self._encode_pattern(triple_pattern)
+        if pattern is None:
+            return
+        term = self._dict.term
+        for s, p, o in self._match(*pattern):
+            yield (term(s), term(p), term(o)), _empty_context()
+
+    def __len__(self, context=None) -> int:
+        state = self._state
+        return state.count - len(state.removed) + len(state.added)
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix: str, namespace: Node, override: bool = True):
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = self._prefix.get(namespace)
+        if bound_prefix is None and bound_namespace is not None:
+            bound_prefix = self._prefix.get(bound_namespace)
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            namespace = bound_namespace if bound_namespace is not None else namespace
+            prefix = bound_prefix if bound_prefix is not None else prefix
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+
+    def namespace(self, prefix: str) -> Optional[Node]:
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace: Node) -> Optional[str]:
+        return self._prefix.get(namespace)
+
+    def namespaces(self):
+        yield from self._namespace.items()
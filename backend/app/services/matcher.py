@@ -0,0 +1,175 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.candidate_index import degree_score, sort_key
+
+# Poids des composantes du score d'adéquation (somme = 1)
+REQUIRED_WEIGHT = 0.5
+OPTIONAL_WEIGHT = 0.2
+EXPERIENCE_WEIGHT = 0.2
+PROFILE_WEIGHT = 0.1
+
+
+def _grown(array: np.ndarray, size: int, axis: int = 0) -> np.ndarray:
+    """Tableau agrandi (capacité doublée) pour contenir `size` éléments sur `axis`"""
+    if array.shape[axis] >= size:
+        return array
+    shape = list(array.shape)
+    shape[axis] = max(size, 2 * shape[axis], 16)
+    grown = np.zeros(shape, dtype=array.dtype)
+    grown[tuple(slice(0, n) for n in array.shape)] = array
+    return grown
+
+
+class CandidateMatcher:
+    """
+    Classement vectorisé des candidats pour une offre d'emploi.
+
+    Construit une fois au chargement, dans l'ordre de référence des slots
+    du CandidateIndex :
+    - matrice compétence x candidat (uint8, une ligne contiguë par compétence)
+    - vecteurs années d'expérience, ordinal du diplôme et code du profil
+
+    Un classement ne fait que des opérations NumPy sur ces tableaux
+    (produit pondéré des lignes demandées, puis sélection partielle du top-k).
+
+    Les ajouts (`add_many`) remplissent des tableaux à capacité doublée ;
+    les candidats retirés sont seulement masqués (`alive`).
+    """
+
+    def __init__(self, candidates: Iterable[Dict]):
+        self.ids: List[str] = []
+        self.slot_of: Dict[str, int] = {}
+        self.skill_rows: Dict[str, int] = {}
+        self.profile_codes: Dict[Optional[str], int] = {}
+        self.size = 0
+        self.skills = np.zeros((0, 0), dtype=np.uint8)
+        self.years = np.zeros(0, dtype=np.float32)
+        self.degrees = np.zeros(0, dtype=np.int16)
+        self.profiles = np.zeros(0, dtype=np.int32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.add_many(sorted(candidates, key=sort_key))
+
+    def __len__(self) -> int:
+        return len(self.slot_of)
+
+    def add_many(self, candidates: Iterable[Dict]):
+        """Ajoute (ou remplace) des candidats en fin de tableaux"""
+        candidates = list(candidates)
+        self.remove_many([c['id'] for c in candidates if c['id'] in self.slot_of])
+        start, end = self.size, self.size + len(candidates)
+
+        pairs: List[Tuple[int, int]] = []
+        for slot, candidate in enumerate(candidates, start):
+            self.ids.append(candidate['id'])
+            self.slot_of[candidate['id']] = slot
+            for skill in candidate['skills']:
+                row = self.skill_rows.setdefault(skill['name'], len(self.skill_rows))
+                pairs.append((row, slot))
+
+        self.skills = _grown(_grown(self.skills, len(self.skill_rows), axis=0), end, axis=1)
+        if pairs:
+            rows, slots = np.array(pairs, dtype=np.int64).T
+            self.skills[rows, slots] = 1
+
+        self.years = _grown(self.years, end)
+        self.degrees = _grown(self.degrees, end)
+        self.profiles = _grown(self.profiles, end)
+        self.alive = _grown(self.alive, end)
+        self.years[start:end] = [c['yearsOfExperience'] for c in candidates]
+        self.degrees[start:end] = [degree_score((c.get('degree') or {}).get('level')) for c in candidates]
+        self.profiles[start:end] = [
+            self.profile_codes.setdefault(c.get('profile'), len(self.profile_codes)) for c in candidates
+        ]
+        self.alive[start:end] = True
+        self.size = end
+
+    def remove_many(self, candidate_ids: Iterable[str]):
+        slots = [self.slot_of.pop(cid) for cid in candidate_ids if cid in self.slot_of]
+        self.alive[slots] = False
+
+    def _coverage(self, weighted_skills: List[Dict]) -> Optional[np.ndarray]:
+        """Part pondérée des compétences possédées (None si aucune compétence demandée)"""
+        total = sum(s['weight'] for s in weighted_skills)
+        if not weighted_skills or total <= 0:
+            return None
+        known = [(self.skill_rows[s['name']], s['weight']) for s in weighted_skills if s['name'] in self.skill_rows]
+        if not known:
+            return np.zeros(self.size, dtype=np.float32)
+        rows, weights = zip(*known)
+        weights = np.asarray(weights, dtype=np.float32)
+        return (weights @ self.skills[list(rows), :self.size]) / np.float32(total)
+
+    def scores(self, offer: Dict) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Score de chaque candidat (-inf si éliminé) et détail par composante"""
+        n = self.size
+        parts: Dict[str, np.ndarray] = {}
+        score = np.zeros(n, dtype=np.float32)
+        weight = 0.0
+
+        required = self._coverage(offer.get('requiredSkills') or [])
+        if required is not None:
+            parts['requiredSkills'] = required
+            score += REQUIRED_WEIGHT * required
+            weight += REQUIRED_WEIGHT
+
+        optional = self._coverage(offer.get('optionalSkills') or [])
+        if optional is not None:
+            parts['optionalSkills'] = optional
+            score += OPTIONAL_WEIGHT * optional
+            weight += OPTIONAL_WEIGHT
+
+        target = offer.get('targetExperience') or 0
+        if target > 0:
+            experience = np.minimum(self.years[:n] / np.float32(target), 1)
+            parts['experience'] = experience
+            score += EXPERIENCE_WEIGHT * experience
+            weight += EXPERIENCE_WEIGHT
+
+        if offer.get('profile'):
+            code = self.profile_codes.get(offer['profile'], -1)
+            profile = (self.profiles[:n] == code).astype(np.float32)
+            parts['profile'] = profile
+            score += PROFILE_WEIGHT * profile
+            weight += PROFILE_WEIGHT
+
+        # Score ramené sur [0, 1] selon les composantes présentes dans l'offre
+        if weight > 0:
+            score /= np.float32(weight)
+
+        # Diplôme minimum : critère éliminatoire
+        min_degree = degree_score(offer.get('minDegreeLevel'))
+        if min_degree > 0:
+            score[self.degrees[:n] < min_degree] = -np.inf
+        score[~self.alive[:n]] = -np.inf
+
+        return score, parts
+
+    def top(self, offer: Dict, k: int) -> Tuple[List[Dict], int]:
+        """
+        Les k meilleurs candidats (id, score, détail), par score décroissant
+        puis ordre des slots, et le nombre de candidats éligibles.
+        """
+        score, parts = self.scores(offer)
+        eligible = np.flatnonzero(score > -np.inf)
+        total = len(eligible)
+        if not total:
+            return [], 0
+
+        # Sélection partielle O(n) du seuil du k-ième score, puis tri des
+        # seuls retenus (les ex aequo au seuil départagés par l'ordre des slots)
+        if k < total:
+            threshold = score[eligible][np.argpartition(-score[eligible], k - 1)[k - 1]]
+            eligible = eligible[score[eligible] >= threshold]
+        ranked = eligible[np.lexsort((eligible, -score[eligible]))][:k]
+
+        results = [
+            {
+                'id': self.ids[slot],
+                'score': round(float(score[slot]), 4),
+                'breakdown': {name: round(float(values[slot]), 4) for name, values in parts.items()},
+            }
+            for slot in ranked
+        ]
+        return results, total
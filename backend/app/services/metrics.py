@@ -0,0 +1,223 @@
+import hashlib
+import json
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+from starlette.routing import Match
+
+from app.config import settings
+
+# Bornes par défaut des histogrammes de durée (secondes), comme les clients Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (1, 10, 100, 1000, 10_000, 100_000, 1_000_000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base des métriques : une série par combinaison de valeurs des labels"""
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._series: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            series = list(self._series.items())
+        for key, value in sorted(series):
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key: Tuple, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Histogramme cumulatif : compteurs par borne supérieure, somme et nombre"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _render_series(self, key: Tuple, value) -> List[str]:
+        counts, total, count = value
+        lines, cumulative = [], 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+        labels = _format_labels(self.labels, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> str:
+    """Toutes les métriques au format texte Prometheus (exposition 0.0.4)"""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ----- métriques de l'application -----
+
+HTTP_REQUESTS = Counter("http_requests_total", "Requêtes HTTP traitées", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "Durée des requêtes HTTP", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requêtes HTTP en cours", ("method", "route"))
+
+SPARQL_PARSE = Histogram("sparql_parse_seconds", "Parsing et algébrisation des requêtes SPARQL", ("query",))
+SPARQL_EVAL = Histogram("sparql_eval_seconds", "Évaluation des requêtes SPARQL", ("query",))
+SPARQL_ROWS = Histogram("sparql_rows", "Lignes retournées par les requêtes SPARQL", ("query",), ROW_BUCKETS)
+SLOW_QUERIES = Counter("sparql_slow_queries_total", "Requêtes SPARQL utilisateur au-delà du seuil", ("query",))
+
+HYDRATE_SECONDS = Histogram("hydrate_seconds", "Construction des candidats depuis le graphe", ("scope",))
+HYDRATE_CANDIDATES = Counter("hydrate_candidates_total", "Candidats construits depuis le graphe", ("scope",))
+HYDRATE_PER_CANDIDATE = Histogram(
+    "hydrate_seconds_per_candidate", "Durée de construction rapportée à un candidat", ("scope",),
+    (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+)
+
+
+# ----- journal des requêtes lentes -----
+
+_slow_log_lock = threading.Lock()
+
+
+def query_hash(normalized_query: str) -> str:
+    """Empreinte courte d'une requête normalisée (regroupe les requêtes équivalentes)"""
+    return hashlib.sha1(normalized_query.encode()).hexdigest()[:16]
+
+
+def log_slow_query(normalized_query: str, parse_seconds: float, eval_seconds: float, rows: int):
+    """
+    Écrit une entrée JSON (une ligne) dans le journal des requêtes lentes :
+    fichier SLOW_QUERY_LOG, ou la sortie standard s'il n'est pas défini.
+    """
+    entry = json.dumps({
+        "event": "slow_query",
+        "time": round(time.time(), 3),
+        "hash": query_hash(normalized_query),
+        "parse_ms": round(parse_seconds * 1000, 2),
+        "eval_ms": round(eval_seconds * 1000, 2),
+        "rows": rows,
+        "query": normalized_query,
+    }, ensure_ascii=False)
+    with _slow_log_lock:
+        if settings.SLOW_QUERY_LOG:
+            with open(settings.SLOW_QUERY_LOG, 'a', encoding='utf-8') as f:
+                f.write(entry + "\n")
+        else:
+            print(entry, flush=True)
+
+
+# ----- middleware HTTP -----
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI : latence (jusqu'au dernier octet, flux compris),
+    statut et requêtes en cours, par méthode et gabarit de route
+    (/api/candidates/{candidate_id}, pas l'URL brute).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _route(scope) -> str:
+        """Gabarit de la route qui traitera la requête (même résolution que le routeur)"""
+        partial = None
+        for route in scope["app"].routes:
+            match, _child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route(scope)
+        status_code = 500
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc(method=method, route=route)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(method=method, route=route)
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status_code)
@@ -0,0 +1,98 @@
+import unicodedata
+from typing import Optional, Set
+
+# Fautes de frappe tolérées selon la longueur de la recherche : une à
+# partir de 5 caractères, deux à partir de 9
+TYPO_LENGTHS = (5, 9)
+
+# Scores entiers (comparaison et curseurs exacts) : 1.0 -> SCORE_SCALE
+SCORE_SCALE = 10_000
+
+# Lettres sans décomposition Unicode (NFKD ne retire pas leur "accent")
+_FOLD = {"ø": "o", "ł": "l", "đ": "d", "ħ": "h", "ı": "i", "æ": "ae", "œ": "oe"}
+
+# Apostrophes (O'Brien, transcriptions de l'arabe : ʿ, ʾ) : retirées, pas remplacées par une espace
+_APOSTROPHES = {"'", "’", "‘", "`", "´", "ʼ", "ʻ", "ʽ", "ʾ", "ʿ"}
+
+
+class _FoldTable(dict):
+    """Table de str.translate remplie à la demande : remplacement de chaque caractère"""
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        if unicodedata.combining(char) or char in _APOSTROPHES or unicodedata.category(char) in ('Lm', 'Sk'):
+            folded = ''
+        elif unicodedata.category(char)[0] in 'PZC':
+            folded = ' '
+        else:
+            folded = ''.join(_FOLD.get(c, c) for c in char.casefold())
+        self[code] = folded
+        return folded
+
+
+_TABLE = _FoldTable()
+
+
+def normalize_name(text: str) -> str:
+    """
+    Forme de recherche d'un nom : décomposition NFKD sans diacritiques,
+    casefold, apostrophes retirées, ponctuation (tirets...) remplacée par
+    une espace, espaces réduites ("Hélène Lefèvre-Benaïssa" -> "helene lefevre benaissa")
+    """
+    return ' '.join(unicodedata.normalize('NFKD', text).translate(_TABLE).split())
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Trigrammes du texte normalisé, bordé d'une espace (début et fin de mot marqués)"""
+    padded = f" {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def inner_trigrams(normalized: str) -> Set[str]:
+    """Trigrammes présents dans tout nom contenant le texte (sans bordure)"""
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+
+def short_keys(gram: str) -> Set[str]:
+    """Sous-chaînes de 1 et 2 caractères d'un trigramme, sans espace (recherches courtes)"""
+    keys = {gram[i:i + n] for n in (1, 2) for i in range(len(gram) - n + 1)}
+    return {key for key in keys if ' ' not in key}
+
+
+def required_trigrams(query: str, query_grams: Set[str]) -> Optional[int]:
+    """
+    Trigrammes communs exigés d'une correspondance approchée (None : pas
+    de tolérance). Chaque faute modifie au plus 3 trigrammes : avec k
+    fautes, un nom proche partage au moins |trigrammes| - 3k trigrammes.
+    """
+    typos = sum(1 for length in TYPO_LENGTHS if len(query) >= length)
+    if not typos:
+        return None
+    return max(len(query_grams) - 3 * typos, 1)
+
+
+def similarity(query_grams: Set[str], name_grams: Set[str]) -> float:
+    """
+    Similarité trigrammes : moyenne de la part des trigrammes de la
+    recherche retrouvés dans le nom et de l'indice de Jaccard (pénalise
+    les noms beaucoup plus longs que la recherche)
+    """
+    shared = len(query_grams & name_grams)
+    if not shared:
+        return 0.0
+    return (shared / len(query_grams) + shared / (len(query_grams) + len(name_grams) - shared)) / 2
+
+
+def name_score(query: str, query_grams: Set[str], name: str, name_grams: Set[str],
+               required: Optional[int] = None) -> int:
+    """
+    Score entier d'un nom pour une recherche (normalisées) ; 0 si le nom
+    ne correspond pas. Les noms contenant la recherche passent avant les
+    correspondances approchées (au moins `required` trigrammes communs).
+    """
+    score = similarity(query_grams, name_grams)
+    if query in name:
+        score += 1.0
+    elif required is None or len(query_grams & name_grams) < required:
+        return 0
+    return max(round(score * SCORE_SCALE), 1)
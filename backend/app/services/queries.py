@@ -0,0 +1,41 @@
+import time
+from typing import Dict
+from rdflib import Namespace, RDFS, XSD
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.sparql import Query
+
+from app.services.metrics import SPARQL_PARSE
+
+# Requêtes SPARQL du service, compilées une seule fois au démarrage.
+# Le préfixe ":" est lié au namespace CV via initNs (pas de f-string) ;
+# les valeurs propres à un appel passent par initBindings.
+QUERIES = {
+    "all_skills": """
+        SELECT DISTINCT ?skill ?skillName ?type
+        WHERE {
+            VALUES ?type { :TechnicalSkill :SoftSkill }
+            ?skill a ?type ;
+                   :skillName ?skillName .
+        }
+        ORDER BY ?skillName
+    """,
+    "all_profiles": """
+        SELECT DISTINCT ?profile ?label
+        WHERE {
+            ?person a :Person ;
+                    :hasProfile ?profile .
+            OPTIONAL { ?profile rdfs:label ?label . }
+        }
+    """,
+}
+
+
+def prepare_queries(cv_ns: Namespace) -> Dict[str, Query]:
+    """Parse et algébrise chaque requête du registre avec le namespace lié"""
+    init_ns = {"": cv_ns, "rdfs": RDFS, "xsd": XSD}
+    prepared = {}
+    for name, text in QUERIES.items():
+        started = time.perf_counter()
+        prepared[name] = prepareQuery(text, initNs=init_ns)
+        SPARQL_PARSE.observe(time.perf_counter() - started, query=name)
+    return prepared
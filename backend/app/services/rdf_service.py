@@ -1,150 +1,776 @@
-from rdflib import Graph, Namespace, RDF, RDFS, Literal
-from typing import List, Dict, Optional
+from rdflib import Graph, Namespace, RDF, RDFS, Literal, URIRef
+from rdflib.plugins.sparql import prepareQuery
+from typing import Iterator, List, Dict, Optional, Tuple
 from app.config import settings
+from app.services.change_log import ChangeLog, change_log_path_for, fsync_dir
+from app.services.candidate_index import CandidateIndex, projection, sort_key
+from app.services.inference import SCHEMA_PREDICATES, RDFSClosure
+from app.services.ingest import TripleMapper
+from app.services.int_store import IntStore
+from app.services.matcher import CandidateMatcher
+from app.services.metrics import (
+    HYDRATE_CANDIDATES, HYDRATE_PER_CANDIDATE, HYDRATE_SECONDS,
+    SLOW_QUERIES, SPARQL_EVAL, SPARQL_PARSE, SPARQL_ROWS, log_slow_query,
+)
+from app.services.queries import prepare_queries
+from app.services.result_cache import ResultCache, cached, normalize_sparql
+from app.services.serialization import FragmentCache, dumps, join_array
+from app.services.similarity import SimilarityIndex
+from app.services.shared_snapshot import load_or_build, shared_path_for
+from app.services.snapshot import file_sha256, read_snapshot, snapshot_is_fresh, snapshot_path_for, write_snapshot
+from app.services.sqlite_store import SQLiteStore
+from app.services.statistics import StatisticsAggregator
+from app.services.suggest import PrefixIndex
+import hashlib
 import os
+import subprocess
+import sys
+import threading
+import time
+
+def _data_path(filename: str) -> str:
+    """Chemin d'un fichier de données, relatif au dossier backend/"""
+    return os.path.join(os.path.dirname(__file__), '..', '..', filename)
+
+# Tentatives d'un rechargement quand le fichier change pendant son chargement
+RELOAD_ATTEMPTS = 3
+
+# Début de l'import du module (pour le temps de démarrage rapporté au log)
+_IMPORT_STARTED = time.perf_counter()
+
+class _CompactionAborted(Exception):
+    """Compaction du journal abandonnée sans erreur (fichier de base modifié)"""
 
 class RDFService:
     def __init__(self):
-        self.graph = Graph()
+        self.graph = self._create_graph()
         self.cv_ns = Namespace(settings.CV_NAMESPACE)
+        # Section d'écriture : une seule écriture (import, mise à jour des index) à la fois
+        self._write_lock = threading.Lock()
+        # Version du graphe, incrémentée à chaque écriture (clé du cache des résultats, ETags)
+        self.version = 0
+        # Version à laquelle chaque candidat a changé pour la dernière fois (0 = chargement)
+        self.candidate_versions: Dict[str, int] = {}
+        # Version minimale de tous les candidats (écritures pouvant toucher n'importe lequel)
+        self._candidates_floor = 0
+        # Version de l'état chargé (démarrage ou rechargement) : tant qu'aucune
+        # écriture locale ne l'a dépassée, le contenu ne dépend que des fichiers
+        self._loaded_version = 0
+        # Identifiant propre à ce processus (ETags d'un état modifié localement)
+        self._process_tag = f"{os.getpid():x}{os.urandom(3).hex()}"
+        self.result_cache = ResultCache(settings.RESULT_CACHE_MB * 1024 * 1024, settings.RESULT_CACHE_TTL)
+        # JSON pré-encodé par candidat (réponses de liste assemblées sans ré-encodage)
+        self.fragments = FragmentCache(settings.FRAGMENT_CACHE_MB * 1024 * 1024)
+        # Projection des candidats lue dans le fichier partagé (SHARED_SNAPSHOT)
+        self._shared_projections: Optional[List[Dict]] = None
         
-        # Charger l'ontologie
-        ontology_path = os.path.join(os.path.dirname(__file__), '..', '..', settings.ONTOLOGY_FILE)
+        # Charger l'ontologie (snapshot binaire si à jour, sinon Turtle),
+        # puis rejouer le journal des modifications par-dessus
+        ontology_path = self.ontology_path = _data_path(settings.ONTOLOGY_FILE)
+        self._compacting = False
+        # Taille du journal à atteindre avant de retenter une compaction échouée ou annulée
+        self._compact_retry_size = 0
+        # Rechargement à chaud : génération servie, fichier chargé, état du dernier rechargement
+        self._reload_lock = threading.Lock()
+        self.generation = 1
+        self._ontology_signature = self._file_signature(ontology_path)
+        self._failed_signature = None
+        self.reload_status: Dict = {"state": "idle", "generation": self.generation}
+        # Autocomplétion : (version du graphe, (index des compétences, index des profils)), construit à la demande
+        self._suggest = None
+        self._suggest_lock = threading.Lock()
         try:
-            self.graph.parse(ontology_path, format='turtle')
-            print(f"✅ Ontologie chargée avec succès : {len(self.graph)} triplets")
+            load_started = time.perf_counter()
+            source, self._shared_projections = self._load_graph(self.graph, ontology_path)
+            self.change_log = self._open_change_log(ontology_path)
+            load_seconds = time.perf_counter() - load_started
         except Exception as e:
             print(f"❌ Erreur de chargement de l'ontologie : {e}")
             raise
         
+        # Époque des ETags : identique pour tous les workers démarrés sur les mêmes fichiers
+        self.epoch = self._data_epoch(ontology_path)
+        
         # Définir les namespaces
         self.graph.bind("cv", self.cv_ns)
-    
-    def get_all_candidates(self) -> List[Dict]:
-        """Récupère tous les candidats avec leurs informations complètes"""
-        query = f"""
-        PREFIX : <{settings.CV_NAMESPACE}>
-        PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
         
-        SELECT ?person ?name ?email ?experience
-        WHERE {{
-            ?person a :Person ;
-                    :name ?name ;
-                    :email ?email ;
-                    :yearsOfExperience ?experience .
-        }}
-        ORDER BY DESC(?experience)
+        # Fermeture RDFS matérialisée (graphe inféré séparé) ; les requêtes lisent `closure.view`
+        self.closure = RDFSClosure(self.graph)
+        
+        # Requêtes SPARQL préparées une seule fois
+        self.queries = prepare_queries(self.cv_ns)
+        
+        # Projection matérialisée des candidats (index inversés)
+        projections = self._shared_projections
+        if projections is None:
+            projections = self._hydrate()
+        self.index = CandidateIndex(projections)
+        # Matrice compétences x candidats pour le classement des offres
+        self.matcher = CandidateMatcher(projections)
+        # Signatures MinHash et seaux LSH (candidats similaires)
+        self.similarity = SimilarityIndex(projections)
+        # Statistiques maintenues par deltas (/api/stats)
+        self.statistics = StatisticsAggregator(projections)
+        self._refresh_vocabulary()
+        
+        startup_seconds = time.perf_counter() - _IMPORT_STARTED
+        print(f"✅ Ontologie chargée avec succès : {len(self.graph)} triplets "
+              f"(chargement {source} : {load_seconds:.2f}s, import total : {startup_seconds:.2f}s)")
+        
+        if settings.ONTOLOGY_WATCH_SECONDS > 0 and not isinstance(self.graph.store, SQLiteStore):
+            threading.Thread(target=self._watch_ontology, args=(settings.ONTOLOGY_WATCH_SECONDS,),
+                             name="ontology-watch", daemon=True).start()
+    
+    @staticmethod
+    def _create_graph() -> Graph:
+        """Graphe rdflib sur le store configuré (settings.GRAPH_STORE)"""
+        if settings.GRAPH_STORE == "intstore":
+            return Graph(store=IntStore())
+        if settings.GRAPH_STORE == "memory":
+            return Graph()
+        if settings.GRAPH_STORE == "sqlite":
+            return Graph(store=SQLiteStore(
+                _data_path(settings.SQLITE_FILE),
+                cache_mb=settings.SQLITE_CACHE_MB,
+                mmap_mb=settings.SQLITE_MMAP_MB,
+            ))
+        raise ValueError(f"GRAPH_STORE inconnu : {settings.GRAPH_STORE}")
+    
+    def _load_graph(self, graph: Graph, ontology_path: str) -> Tuple[str, Optional[List[Dict]]]:
+        """
+        Charge `graph` depuis le snapshot s'il est à jour, sinon parse le
+        Turtle et écrit le snapshot. Retourne la source utilisée et, en mode
+        partagé, la projection des candidats lue dans le fichier mappé.
         """
+        if isinstance(graph.store, SQLiteStore):
+            return self._open_sqlite(graph, ontology_path), None
+        if settings.SHARED_SNAPSHOT:
+            if isinstance(graph.store, IntStore):
+                return self._attach_shared(graph, ontology_path)
+            print(f"⚠️ SHARED_SNAPSHOT ignoré : nécessite GRAPH_STORE=intstore (actuel : {settings.GRAPH_STORE})")
+        return self._load_private(graph, ontology_path), None
+    
+    def _load_private(self, graph: Graph, ontology_path: str) -> str:
+        """Chargement propre au processus : snapshot binaire ou Turtle"""
+        snapshot_path = snapshot_path_for(ontology_path)
+        if settings.SNAPSHOT_ENABLED:
+            snapshot = read_snapshot(ontology_path, snapshot_path)
+            if snapshot is not None:
+                snapshot.load_into(graph)
+                return "snapshot"
         
-        results = self.graph.query(query)
-        candidates = []
+        graph.parse(ontology_path, format='turtle')
+        if settings.SNAPSHOT_ENABLED:
+            try:
+                write_snapshot(graph, ontology_path, snapshot_path)
+            except OSError as e:
+                print(f"⚠️ Snapshot non écrit ({snapshot_path}) : {e}")
+        return "turtle"
+    
+    def _attach_shared(self, graph: Graph, ontology_path: str) -> Tuple[str, List[Dict]]:
+        """
+        Graphe en lecture seule partagé entre workers : le premier worker
+        construit le fichier (sous verrou), tous le mappent en mémoire.
+        """
+        def build():
+            self._load_private(graph, ontology_path)
+            graph.bind("cv", self.cv_ns)
+            projections = [projection(c) for c in self._hydrate(closure=RDFSClosure(graph))]
+            namespaces = [[prefix, str(ns)] for prefix, ns in graph.namespaces()]
+            return graph.store, projections, namespaces
         
-        for row in results:
-            candidate_uri = str(row.person)
-            candidate = {
-                'id': candidate_uri.split('#')[-1],
-                'name': str(row.name),
-                'email': str(row.email),
-                'yearsOfExperience': int(row.experience),
-                'profile': self._get_profile(candidate_uri),
-                'skills': self._get_skills(candidate_uri),
-                'degree': self._get_degree(candidate_uri),
-                'experiences': self._get_experiences(candidate_uri)
-            }
-            candidates.append(candidate)
+        shared = load_or_build(ontology_path, shared_path_for(ontology_path), build)
+        shared.attach(graph.store)
+        for prefix, namespace in shared.header["namespaces"]:
+            graph.bind(prefix, namespace, override=False)
+        return "mmap partagé", shared.projections()
+    
+    def _open_change_log(self, ontology_path: str) -> Optional[ChangeLog]:
+        """Rejoue le journal sur le graphe chargé (inutile avec SQLite, déjà persistant)"""
+        if not settings.CHANGELOG_ENABLED or isinstance(self.graph.store, SQLiteStore):
+            return None
+        change_log = ChangeLog(change_log_path_for(ontology_path), settings.CHANGELOG_FSYNC_MS / 1000)
+        replayed = change_log.replay(self.graph)
+        if replayed:
+            # La projection partagée ne reflète que le fichier de base
+            self._shared_projections = None
+            print(f"📜 Journal des modifications rejoué : {replayed} opérations")
+        change_log.open()
+        return change_log
+    
+    def _open_sqlite(self, graph: Graph, ontology_path: str) -> str:
+        """
+        Base SQLite persistante : import du Turtle si elle est vide, ou si elle
+        a été construite depuis une autre version du fichier (empreinte
+        source_sha256) ; les écritures faites via l'API sur l'ancienne base sont
+        alors perdues, le fichier Turtle faisant foi
+        """
+        store = graph.store
+        source_sha256 = file_sha256(ontology_path)
+        if len(store) > 0:
+            if store.get_meta("source_sha256") == source_sha256:
+                return "sqlite"
+            print(f"⚠️ Base SQLite périmée ({os.path.basename(ontology_path)} modifié depuis son import) : reconstruction")
+            store.clear()
         
+        # Parse dans un graphe mémoire puis insertion en une seule transaction
+        parsed = Graph()
+        parsed.parse(ontology_path, format='turtle')
+        graph.addN((s, p, o, graph) for s, p, o in parsed)
+        for prefix, namespace in parsed.namespaces():
+            graph.bind(prefix, namespace, override=False)
+        store.set_meta("source_sha256", source_sha256)
+        return "turtle -> sqlite"
+    
+    @cached("all_candidates")
+    def get_all_candidates(self) -> List[Dict]:
+        """Récupère tous les candidats avec leurs informations complètes"""
+        candidates = self._hydrate()
+        # Ordre de référence : ORDER BY DESC(?experience), ?id
+        candidates.sort(key=sort_key)
         return candidates
     
     def search_candidates(self, filters: Dict) -> List[Dict]:
-        """Recherche de candidats avec filtres"""
-        all_candidates = self.get_all_candidates()
-        filtered = []
+        """Recherche de candidats avec filtres (résolue sur l'index matérialisé)"""
+        candidate_ids = self.index.search(filters)
+        return self.get_candidates_by_ids(candidate_ids)
+    
+    def get_candidates_page(self, filters: Optional[Dict] = None, cursor: Optional[str] = None,
+                            limit: Optional[int] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Une page de candidats (filtrés ou non) et le curseur de la page suivante"""
+        candidate_ids, next_cursor = self.index.page(filters, cursor, limit)
+        return self.get_candidates_by_ids(candidate_ids), next_cursor
+    
+    def get_all_candidates_json(self) -> bytes:
+        """Tous les candidats (ordre de référence), tableau JSON déjà encodé"""
+        return self.cached_result(
+            "all_candidates_json",
+            lambda: join_array(self.get_candidates_json(self.index.page(None, None)[0]))
+        )
+    
+    def get_candidates_page_json(self, filters: Optional[Dict] = None, cursor: Optional[str] = None,
+                                 limit: Optional[int] = None, facets: bool = False) -> Tuple[bytes, Optional[str]]:
+        """
+        Une page de candidats en tableau JSON encodé et le curseur de la page
+        suivante ; avec `facets`, objet {"candidates": [...], "facets": {...}}
+        (facettes calculées sur le bitmap du filtrage, CandidateIndex.facet_counts)
+        """
+        counts = {} if facets else None
+        candidate_ids, next_cursor = self.index.page(filters, cursor, limit, counts)
+        body = join_array(self.get_candidates_json(candidate_ids))
+        if counts is not None:
+            body = b'{"candidates":' + body + b',"facets":' + dumps(counts) + b'}'
+        return body, next_cursor
+    
+    def iter_candidates_ndjson(self, filters: Optional[Dict] = None, cursor: Optional[str] = None) -> Iterator[bytes]:
+        """Flux NDJSON (une ligne par candidat), émis par lots de STREAM_BATCH_SIZE candidats"""
+        candidate_ids, _ = self.index.page(filters, cursor)
+        batch_size = settings.STREAM_BATCH_SIZE
+        for start in range(0, len(candidate_ids), batch_size):
+            fragments = self.get_candidates_json(candidate_ids[start:start + batch_size])
+            yield b"".join(fragment + b"\n" for fragment in fragments)
+    
+    def get_candidates_json(self, candidate_ids: List[str]) -> List[bytes]:
+        """
+        JSON encodé de chaque candidat (ordre des IDs conservé, inconnus
+        ignorés) : fragments en cache pour la version courante du candidat,
+        les autres hydratés en un lot puis encodés.
+        """
+        versions = [self.candidate_version(candidate_id) for candidate_id in candidate_ids]
+        fragments = self.fragments.get_many(candidate_ids, versions)
+        missing = [cid for cid, fragment in zip(candidate_ids, fragments) if fragment is None]
+        if not missing:
+            return fragments
         
-        for candidate in all_candidates:
-            # Filtre par nom
-            if filters.get('searchTerm'):
-                if filters['searchTerm'].lower() not in candidate['name'].lower():
-                    continue
-            
-            # Filtre par compétences (doit avoir TOUTES les compétences demandées)
-            if filters.get('skills'):
-                candidate_skills = [s['name'] for s in candidate['skills']]
-                if not all(skill in candidate_skills for skill in filters['skills']):
-                    continue
-            
-            # Filtre par expérience minimale
-            if filters.get('minExperience', 0) > 0:
-                if candidate['yearsOfExperience'] < filters['minExperience']:
-                    continue
-            
-            # Filtre par niveau de diplôme
-            if filters.get('minDegreeLevel'):
-                degree_scores = {"Bac+2": 2, "Bac+3": 3, "Bac+5": 5, "Doctorat": 8}
-                min_score = degree_scores.get(filters['minDegreeLevel'], 0)
-                candidate_score = degree_scores.get(candidate.get('degree', {}).get('level', ''), 0)
-                if candidate_score < min_score:
-                    continue
-            
-            # Filtre par profil
-            if filters.get('profile'):
-                if candidate.get('profile') != filters['profile']:
-                    continue
+        version_of = dict(zip(candidate_ids, versions))
+        encoded = {c['id']: (version_of[c['id']], dumps(c)) for c in self.get_candidates_by_ids(missing)}
+        self.fragments.put_many(encoded)
+        return [
+            fragment if fragment is not None else encoded[cid][1]
+            for cid, fragment in zip(candidate_ids, fragments)
+            if fragment is not None or cid in encoded
+        ]
+    
+    def match_candidates(self, offer: Dict) -> Dict:
+        """Classe les candidats pour une offre d'emploi : top-k hydratés avec leur score"""
+        ranked, total = self.matcher.top(offer, offer.get('topK') or 10)
+        candidates = self._candidates_by_id([r['id'] for r in ranked])
+        return {
+            "total": total,
+            "results": [
+                {"candidate": candidates[r['id']], "score": r['score'], "breakdown": r['breakdown']}
+                for r in ranked if r['id'] in candidates
+            ],
+        }
+    
+    def _candidates_by_id(self, candidate_ids: List[str]) -> Dict[str, Dict]:
+        """Candidats hydratés indexés par id (un id supprimé entre-temps est absent)"""
+        return {c['id']: c for c in self.get_candidates_by_ids(candidate_ids)}
+    
+    def similar_candidates(self, candidate_id: str, k: int) -> Optional[Dict]:
+        """
+        Les k candidats les plus proches (Jaccard des compétences, profil et
+        diplôme ; SimilarityIndex), hydratés ; None si le candidat est inconnu
+        """
+        found = self.similarity.similar(candidate_id, k)
+        if found is None:
+            return None
+        ranked, total = found
+        candidates = self._candidates_by_id([r['id'] for r in ranked])
+        return {
+            "candidateId": candidate_id,
+            "total": total,
+            "results": [
+                {"candidate": candidates[r['id']], "similarity": r['similarity'], "sharedSkills": r['sharedSkills']}
+                for r in ranked if r['id'] in candidates
+            ],
+        }
+    
+    def bulk_insert(self, candidates: List[Dict]) -> Dict:
+        """
+        Import en masse de candidats (schéma Candidate) : triplets insérés
+        par lots (addN), index mis à jour de façon incrémentale.
+        Un candidat déjà présent (même id) est remplacé.
+        """
+        started = time.perf_counter()
+        ns = self.cv_ns
+        # Dernière occurrence de chaque id
+        candidates = list({c['id']: c for c in candidates}.values())
+        with self._write_lock:
+            mapper = TripleMapper(self.graph, ns, self._profile_label)
+            triples = [mapper.triples(c) for c in candidates]  # validation avant toute écriture
+            records = [mapper.record(c) for c in candidates]
+            persons = [ns[c['id']] for c in candidates]
+            existing = [p for p in persons if (p, RDF.type, ns.Person) in self.graph]
+            removed = self._person_triples(existing)
+            added = [t for batch in triples for t in batch]
+            touched = {s for s, _p, _o in removed + added}
+            skill_rows = self._skill_rows(touched)
+            seq = self._log_changes(added, removed)
             
-            filtered.append(candidate)
+            for triple in removed:
+                self.graph.remove(triple)
+            batch_size = settings.BULK_BATCH_TRIPLES
+            for start in range(0, len(added), batch_size):
+                self.graph.addN((s, p, o, self.graph) for s, p, o in added[start:start + batch_size])
+            self.closure.refresh(removed + added)
+            self._update_indexes(records)
+            self._bump_version([c['id'] for c in candidates])
+            self.statistics.add_skill_vocabulary(self._skill_rows(touched) - skill_rows)
+        self._wait_durable(seq)
         
-        return filtered
+        return {
+            "inserted": len(persons) - len(existing),
+            "updated": len(existing),
+            "triples": len(added),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
     
-    def get_candidate_by_id(self, candidate_id: str) -> Optional[Dict]:
-        """Récupère un candidat spécifique par son ID"""
-        candidate_uri = f"{settings.CV_NAMESPACE}{candidate_id}"
+    def bulk_insert_rdf(self, data: bytes, format: str) -> Dict:
+        """Import en masse d'un document Turtle / N-Triples (ajout des triplets au graphe)"""
+        started = time.perf_counter()
+        parsed = Graph()
+        try:
+            parsed.parse(data=data, format=format)
+        except Exception as e:
+            raise ValueError(f"Document RDF invalide : {e}")
         
-        query = f"""
-        PREFIX : <{settings.CV_NAMESPACE}>
+        ns = self.cv_ns
+        with self._write_lock:
+            created = {p for p in parsed.subjects(RDF.type, ns.Person) if (p, RDF.type, ns.Person) not in self.graph}
+            triples = list(parsed)
+            touched = {s for s, _p, _o in triples}
+            skill_rows = self._skill_rows(touched)
+            seq = self._log_changes(triples, [])
+            batch_size = settings.BULK_BATCH_TRIPLES
+            for start in range(0, len(triples), batch_size):
+                self.graph.addN((s, p, o, self.graph) for s, p, o in triples[start:start + batch_size])
+            self.closure.refresh(triples)
+            persons = self._affected_persons(triples)
+            self._update_indexes(self._hydrate_many(persons))
+            # Triplets arbitraires (compétences, profils...) : tous les candidats peuvent changer
+            self._bump_version(None)
+            if any(p in SCHEMA_PREDICATES for _s, p, _o in triples):
+                self._refresh_vocabulary()  # types des compétences potentiellement tous changés
+            else:
+                self.statistics.add_skill_vocabulary(self._skill_rows(touched) - skill_rows)
+        self._wait_durable(seq)
         
-        SELECT ?name ?email ?experience
-        WHERE {{
-            <{candidate_uri}> a :Person ;
-                             :name ?name ;
-                             :email ?email ;
-                             :yearsOfExperience ?experience .
-        }}
+        return {
+            "inserted": len(created),
+            "updated": len(persons) - len(created),
+            "triples": len(triples),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+    
+    def _affected_persons(self, triples: List[Tuple]) -> List[URIRef]:
         """
-        
-        results = list(self.graph.query(query))
-        if not results:
+        Candidats dont la projection dépend des triplets écrits : sujets
+        qui sont des :Person dans le graphe fusionné, et personnes liées
+        (compétence, diplôme, expérience, profil) à un sujet touché.
+        Une écriture du schéma (sous-classes) touche tous les candidats.
+        """
+        ns = self.cv_ns
+        graph = self.graph
+        if any(p in SCHEMA_PREDICATES for _s, p, _o in triples):
+            return list(graph.subjects(RDF.type, ns.Person))
+        subjects = set(s for s, _p, _o in triples)
+        persons = {s for s in subjects if (s, RDF.type, ns.Person) in graph}
+        for predicate in (ns.hasSkill, ns.hasDegree, ns.hasExperience, ns.hasProfile):
+            for subject in subjects - persons:
+                persons.update(
+                    p for p in graph.subjects(predicate, subject) if (p, RDF.type, ns.Person) in graph
+                )
+        return list(persons)
+    
+    def cached_result(self, name: str, compute, key=()):
+        """Résultat de `compute` mis en cache pour la version courante du graphe"""
+        return self.result_cache.get_or_compute((name, key), self.version, compute)
+    
+    def _bump_version(self, candidate_ids: Optional[List[str]]):
+        """
+        Nouvelle version du graphe (après une écriture) : le cache est invalidé.
+        `candidate_ids` : candidats modifiés (None = potentiellement tous).
+        """
+        self.version += 1
+        if candidate_ids is None:
+            self._candidates_floor = self.version
+        else:
+            for candidate_id in candidate_ids:
+                self.candidate_versions[candidate_id] = self.version
+        self.result_cache.invalidate(self.version)
+    
+    def _data_epoch(self, ontology_path: str) -> str:
+        """Empreinte courte des fichiers de données chargés au démarrage"""
+        parts = [settings.GRAPH_STORE]
+        paths = [ontology_path]
+        if self.change_log is not None:
+            paths.append(self.change_log.path)
+        if isinstance(self.graph.store, SQLiteStore):
+            paths.append(self.graph.store.path)
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+            except OSError:
+                parts.append("-")
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+    
+    def _state_tag(self, version: int) -> str:
+        """
+        Partie des ETags identifiant l'état servi : l'époque seule pour l'état
+        chargé (commun aux workers démarrés sur les mêmes fichiers, journal
+        compris) ; après une écriture locale, que les autres workers ne voient
+        pas, l'identifiant du processus et la version
+        """
+        if version <= self._loaded_version:
+            return self.epoch
+        return f"{self.epoch}-{self._process_tag}.{version}"
+    
+    def etag(self) -> str:
+        """ETag fort des réponses dérivées du graphe entier"""
+        return f'"{self._state_tag(self.version)}"'
+    
+    def candidate_version(self, candidate_id: str) -> int:
+        """Version à laquelle ce candidat a pu changer pour la dernière fois"""
+        return max(self._candidates_floor, self.candidate_versions.get(candidate_id, 0))
+    
+    def candidate_etag(self, candidate_id: str) -> str:
+        """ETag fort d'un candidat : ne change que si ce candidat est modifié"""
+        return f'"{self._state_tag(self.candidate_version(candidate_id))}-c"'
+    
+    def has_candidate(self, candidate_id: str) -> bool:
+        """Candidat présent dans l'index (sans hydratation)"""
+        return candidate_id in self.index.slots
+    
+    def _person_triples(self, persons: List[URIRef]) -> List[Tuple]:
+        """Triplets de personnes (et de leurs diplômes / expériences)"""
+        ns = self.cv_ns
+        triples = []
+        for person in persons:
+            for predicate in (ns.hasDegree, ns.hasExperience):
+                for node in self.graph.objects(person, predicate):
+                    triples.extend(self.graph.triples((node, None, None)))
+            triples.extend(self.graph.triples((person, None, None)))
+        return triples
+    
+    def _log_changes(self, added: List[Tuple], removed: List[Tuple]) -> Optional[int]:
+        """Écrit les modifications dans le journal (avant de les appliquer au graphe)"""
+        if self.change_log is None:
             return None
+        seq = self.change_log.append(added, removed)
+        size = self.change_log.size()
+        if not self._compacting and size > settings.CHANGELOG_COMPACT_MB * 1024 * 1024 and size > self._compact_retry_size:
+            self._compacting = True
+            threading.Thread(target=self._compact_change_log, name="changelog-compaction", daemon=True).start()
+        return seq
+    
+    def _wait_durable(self, seq: Optional[int]):
+        """Attend le fsync groupé couvrant l'écriture (hors section d'écriture)"""
+        if seq is not None:
+            self.change_log.wait_durable(seq)
+    
+    def _compact_change_log(self):
+        """
+        Intègre le journal dans un nouveau fichier Turtle de base, remplacé
+        atomiquement, puis ne garde que la fin du journal écrite entre-temps.
+        Un arrêt entre les deux étapes est sans risque : le rejeu est idempotent.
+
+        La nouvelle base est le fichier de base plus le journal rejoué jusqu'au
+        point de contrôle (pas le graphe en mémoire, qui ignore les écritures
+        des autres workers). Remplacement et réécriture du journal se font sous
+        son verrou inter-processus. Après un échec ou une annulation, la
+        compaction attend que le journal ait encore grossi du seuil.
+        """
+        path = self.ontology_path
+        offset = None
+        try:
+            started = time.perf_counter()
+            signature = self._ontology_signature
+            offset = self.change_log.checkpoint()
+            if self._file_signature(path) != signature:
+                raise _CompactionAborted(f"{os.path.basename(path)} modifié depuis son chargement")
+            
+            base = Graph(store=IntStore())
+            base.parse(path, format='turtle')
+            base.bind("cv", self.cv_ns)
+            ChangeLog(self.change_log.path).replay(base, limit=offset)
+            tmp_path = f"{path}.tmp{os.getpid()}"
+            base.serialize(destination=tmp_path, format='turtle')
+            with open(tmp_path, 'rb') as f:
+                os.fsync(f.fileno())
+            
+            with self.change_log.locked():
+                if self._file_signature(path) != signature:
+                    # Fichier édité hors de l'API ou compacté par un autre worker : ne pas l'écraser
+                    os.remove(tmp_path)
+                    raise _CompactionAborted(f"{os.path.basename(path)} modifié pendant la compaction")
+                os.replace(tmp_path, path)
+                fsync_dir(path)
+                self._ontology_signature = self._file_signature(path)
+                self.change_log.discard_until(offset)
+            if settings.SNAPSHOT_ENABLED:
+                try:
+                    write_snapshot(base, path, snapshot_path_for(path))
+                except OSError as e:
+                    print(f"⚠️ Snapshot non écrit après compaction : {e}")
+            self._compact_retry_size = 0
+            print(f"🗜️ Journal compacté dans {os.path.basename(path)} : {len(base)} triplets "
+                  f"({time.perf_counter() - started:.2f}s)")
+        except _CompactionAborted as e:
+            self._compaction_backoff(offset)
+            print(f"⚠️ Compaction annulée : {e}")
+        except Exception as e:
+            self._compaction_backoff(offset)
+            print(f"⚠️ Compaction du journal échouée : {e}")
+        finally:
+            self._compacting = False
+    
+    def _compaction_backoff(self, offset: Optional[int]):
+        """Prochaine tentative quand le journal aura encore grossi du seuil de compaction"""
+        if offset is None:
+            offset = self.change_log.size()
+        self._compact_retry_size = offset + settings.CHANGELOG_COMPACT_MB * 1024 * 1024
+    
+    # ----- rechargement à chaud -----
+    
+    @staticmethod
+    def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+        """(mtime, taille) du fichier, None s'il est absent"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def reload(self) -> Dict:
+        """Recharge l'ontologie depuis son fichier (bloquant) ; retourne l'état du rechargement"""
+        with self._reload_lock:
+            return self._reload()
+    
+    def start_reload(self) -> bool:
+        """Lance un rechargement en arrière-plan ; False si un rechargement est déjà en cours"""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
         
-        row = results[0]
-        return {
-            'id': candidate_id,
-            'name': str(row.name),
-            'email': str(row.email),
-            'yearsOfExperience': int(row.experience),
-            'profile': self._get_profile(candidate_uri),
-            'skills': self._get_skills(candidate_uri),
-            'degree': self._get_degree(candidate_uri),
-            'experiences': self._get_experiences(candidate_uri)
+        def run():
+            try:
+                self._reload()
+            finally:
+                self._reload_lock.release()
+        
+        threading.Thread(target=run, name="ontology-reload", daemon=True).start()
+        return True
+    
+    def _reload(self) -> Dict:
+        """
+        Construit une nouvelle génération (graphe, index, matcher,
+        statistiques) pendant que l'ancienne continue de servir, puis
+        l'échange d'un bloc sous le verrou d'écriture. Les requêtes en cours
+        terminent sur l'ancienne génération, libérée quand plus aucune ne la
+        référence.
+
+        Le parsing (la partie longue) se fait hors verrou ; sous le verrou,
+        le journal des modifications est rejoué sur le nouveau graphe (les
+        écritures faites via l'API, y compris pendant le chargement) avant
+        la construction des index : seuls les écrivains attendent.
+        """
+        path = self.ontology_path
+        started = time.perf_counter()
+        self.reload_status = {"state": "running", "generation": self.generation, "started_at": round(time.time(), 3)}
+        signature = None
+        try:
+            if isinstance(self.graph.store, SQLiteStore):
+                raise ValueError("Rechargement non supporté avec GRAPH_STORE=sqlite (base persistante)")
+            for _attempt in range(RELOAD_ATTEMPTS):
+                signature = self._file_signature(path)
+                self._prebuild_snapshot(path)
+                graph = self._create_graph()
+                source, projections = self._load_graph(graph, path)
+                with self._write_lock:
+                    if self._file_signature(path) != signature:
+                        continue  # fichier modifié entre-temps (édition, compaction) : on recommence
+                    replayed = 0
+                    if self.change_log is not None:
+                        self.change_log.checkpoint()
+                        replayed = ChangeLog(self.change_log.path).replay(graph)
+                        if replayed:
+                            projections = None
+                    graph.bind("cv", self.cv_ns)
+                    closure = RDFSClosure(graph)
+                    if projections is None:
+                        projections = self._hydrate(closure=closure)
+                    index = CandidateIndex(projections)
+                    matcher = CandidateMatcher(projections)
+                    similarity = SimilarityIndex(projections)
+                    statistics = StatisticsAggregator(projections)
+                    
+                    self.graph, self.closure = graph, closure
+                    self.index, self.matcher, self.similarity, self.statistics = index, matcher, similarity, statistics
+                    self._ontology_signature = signature
+                    self.epoch = self._data_epoch(path)
+                    self.generation += 1
+                    self._bump_version(None)
+                    self._loaded_version = self.version
+                    self._refresh_vocabulary()
+                break
+            else:
+                raise RuntimeError("Fichier modifié pendant chaque tentative de rechargement")
+        except Exception as e:
+            self._failed_signature = signature
+            self.reload_status = {**self.reload_status, "state": "failed", "error": str(e)}
+            print(f"❌ Rechargement de l'ontologie échoué : {e}")
+            return self.reload_status
+        
+        seconds = time.perf_counter() - started
+        self.reload_status = {
+            "state": "done",
+            "generation": self.generation,
+            "source": source,
+            "triples": len(graph),
+            "candidates": len(index),
+            "replayed": replayed,
+            "seconds": round(seconds, 3),
         }
+        print(f"🔄 Ontologie rechargée (génération {self.generation}) : {len(graph)} triplets "
+              f"({source}, {seconds:.2f}s)")
+        return self.reload_status
+    
+    def _prebuild_snapshot(self, path: str):
+        """
+        Construit le snapshot du fichier modifié dans un processus séparé :
+        le parsing Turtle ne dispute pas le GIL aux requêtes servies, le
+        chargement lit ensuite le snapshot. En cas d'échec, parsing sur place.
+        """
+        snapshot_path = snapshot_path_for(path)
+        if not settings.SNAPSHOT_ENABLED or snapshot_is_fresh(path, snapshot_path):
+            return
+        result = subprocess.run(
+            [sys.executable, "-m", "app.services.snapshot", path, snapshot_path],
+            cwd=_data_path(""), capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            error = (result.stderr.strip().splitlines() or ["?"])[-1]
+            print(f"⚠️ Snapshot non construit hors processus ({error}) : parsing sur place")
+    
+    def _watch_ontology(self, interval: float):
+        """
+        Surveille le fichier d'ontologie : rechargement quand sa signature
+        a changé et qu'elle est stable sur deux relevés (enregistrement
+        terminé). Une version dont le rechargement a échoué n'est pas retentée.
+        """
+        pending = None
+        while True:
+            time.sleep(interval)
+            current = self._file_signature(self.ontology_path)
+            if current is None or current in (self._ontology_signature, self._failed_signature):
+                pending = None
+                continue
+            if current != pending:
+                pending = current
+                continue
+            pending = None
+            self.start_reload()
+    
+    def _hydrate_many(self, persons: List[URIRef]) -> List[Dict]:
+        candidates = []
+        batch_size = settings.BULK_BATCH_SIZE
+        for start in range(0, len(persons), batch_size):
+            candidates.extend(self._hydrate(persons[start:start + batch_size]))
+        return candidates
+    
+    def _update_indexes(self, candidates: List[Dict]):
+        """Mise à jour incrémentale des index ; compaction quand la queue d'ajouts grossit"""
+        self.index.add_many(candidates)
+        self.matcher.add_many(candidates)
+        self.similarity.add_many(candidates)
+        self.statistics.add_many(candidates)
+        if self.index.needs_compaction():
+            index = self.index.compacted()
+            self.index, self.matcher = index, CandidateMatcher(index.records)
+            self.similarity = SimilarityIndex(index.records)
+    
+    def _refresh_vocabulary(self):
+        """
+        Recompte les compétences déclarées dans le graphe (taille du
+        vocabulaire, pas des candidats) : au chargement et au rechargement ;
+        une écriture n'applique que le delta de ses sujets (`_skill_rows`)
+        """
+        self.statistics.set_skill_vocabulary(len(self.get_all_skills()))
+    
+    def _skill_rows(self, subjects) -> int:
+        """Lignes de la requête all_skills (compétence, nom, type) portées par ces sujets"""
+        ns = self.cv_ns
+        view = self.closure.view
+        rows = 0
+        for subject in subjects:
+            types = sum(1 for cls in (ns.TechnicalSkill, ns.SoftSkill) if (subject, RDF.type, cls) in view)
+            if types:
+                rows += types * len(set(view.objects(subject, ns.skillName)))
+        return rows
+    
+    def get_statistics(self) -> Dict:
+        """Statistiques des candidats, lues dans l'agrégateur incrémental"""
+        return self.statistics.summary()
+    
+    def get_candidate_by_id(self, candidate_id: str) -> Optional[Dict]:
+        """Récupère un candidat spécifique par son ID"""
+        candidates = self.get_candidates_by_ids([candidate_id])
+        return candidates[0] if candidates else None
+    
+    def get_candidates_by_ids(self, candidate_ids: List[str]) -> List[Dict]:
+        """Récupère plusieurs candidats par leurs IDs (ordre des IDs conservé)"""
+        persons = [self.cv_ns[candidate_id] for candidate_id in candidate_ids]
+        return self._hydrate(persons)
     
+    @cached("all_skills")
     def get_all_skills(self) -> List[Dict]:
         """Récupère toutes les compétences disponibles"""
-        query = f"""
-        PREFIX : <{settings.CV_NAMESPACE}>
-        
-        SELECT DISTINCT ?skill ?skillName ?type
-        WHERE {{
-            ?skill a ?type ;
-                   :skillName ?skillName .
-            FILTER(?type = :TechnicalSkill || ?type = :SoftSkill)
-        }}
-        ORDER BY ?skillName
-        """
-        
-        results = self.graph.query(query)
+        results = self.query("all_skills")
         skills = []
         
         for row in results:
-            skill_type = "technical" if "TechnicalSkill" in str(row.type) else "soft"
+            skill_type = "technical" if row.type == self.cv_ns.TechnicalSkill else "soft"
             skills.append({
                 'id': str(row.skill).split('#')[-1],
                 'name': str(row.skillName),
@@ -153,21 +779,10 @@ class RDFService:
         
         return skills
     
+    @cached("all_profiles")
     def get_all_profiles(self) -> List[str]:
         """Récupère tous les profils disponibles (labels si dispo)"""
-        query = f"""
-        PREFIX : <{settings.CV_NAMESPACE}>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-        SELECT DISTINCT ?profile ?label
-        WHERE {{
-            ?person a :Person ;
-                    :hasProfile ?profile .
-            OPTIONAL {{ ?profile rdfs:label ?label . }}
-        }}
-        """
-
-        results = list(self.graph.query(query))
+        results = self.query("all_profiles")
 
         # group labels by profile URI
         by_profile = {}
@@ -175,134 +790,232 @@ class RDFService:
             p = str(row.profile)
             by_profile.setdefault(p, []).append(row.label if row.label else None)
 
-        profiles = []
-        for p, labels in by_profile.items():
-            labels = [l for l in labels if l]
-            chosen = None
-            for l in labels:
-                if getattr(l, "language", None) == "fr":
-                    chosen = str(l); break
-            if not chosen:
-                for l in labels:
-                    if getattr(l, "language", None) == "en":
-                        chosen = str(l); break
-            if not chosen:
-                chosen = p.split("#")[-1].split("/")[-1]
-            profiles.append(chosen)
+        profiles = [self._profile_label(p, labels) for p, labels in by_profile.items()]
 
         return sorted(set(profiles))
     
-    def _get_profile(self, person_uri: str) -> Optional[str]:
-        """Récupère le profil d'une personne (label si dispo, sinon nom local)"""
-        query = f"""
-        PREFIX : <{settings.CV_NAMESPACE}>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    def suggest_skills(self, query: str, k: int) -> List[Dict]:
+        """Compétences commençant par `query` (nom ou libellé), les plus fréquentes d'abord"""
+        return self._suggest_indexes()[0].suggest(query, k)
+    
+    def suggest_profiles(self, query: str, k: int) -> List[Dict]:
+        """Profils dont un libellé (toutes langues) commence par `query`, les plus fréquents d'abord"""
+        return self._suggest_indexes()[1].suggest(query, k)
+    
+    def _suggest_indexes(self) -> Tuple[PrefixIndex, PrefixIndex]:
+        """Index d'autocomplétion (compétences, profils) de la version courante du graphe"""
+        suggest = self._suggest
+        if suggest is not None and suggest[0] == self.version:
+            return suggest[1]
+        with self._suggest_lock:
+            version = self.version
+            if self._suggest is None or self._suggest[0] != version:
+                self._suggest = (version, self._build_suggest_indexes())
+            return self._suggest[1]
+    
+    def _build_suggest_indexes(self) -> Tuple[PrefixIndex, PrefixIndex]:
+        skill_counts, profile_counts = self.statistics.frequencies()
+        skills = PrefixIndex(
+            (
+                {"name": s['name'], "type": s['type'], "count": skill_counts.get(s['name'], 0)},
+                [str(label) for label in self.graph.objects(self.cv_ns[s['id']], RDFS.label)],
+            )
+            for s in self.get_all_skills()
+        )
+        labels_by_profile: Dict[str, List] = {}
+        for row in self.query("all_profiles"):
+            labels_by_profile.setdefault(str(row.profile), []).append(row.label if row.label else None)
+        profiles: Dict[str, set] = {}
+        for uri, labels in labels_by_profile.items():
+            names = profiles.setdefault(self._profile_label(uri, labels), set())
+            names.update(str(label) for label in labels if label)
+            names.add(uri.split("#")[-1].split("/")[-1])
+        return skills, PrefixIndex(
+            ({"name": name, "count": profile_counts.get(name, 0)}, labels)
+            for name, labels in profiles.items()
+        )
+    
+    def query(self, name: str, **bindings) -> List:
+        """Exécute une requête préparée du registre (valeurs via initBindings)"""
+        return self._evaluate(name, self.queries[name], bindings)
+    
+    def user_query(self, query: str) -> List:
+        """
+        Exécute une requête SPARQL utilisateur (texte) : parsing et
+        évaluation mesurés séparément ; au-delà de SLOW_QUERY_MS, la requête
+        normalisée est écrite dans le journal des requêtes lentes.
+        """
+        started = time.perf_counter()
+        prepared = prepareQuery(query, initNs=dict(self.graph.namespaces()))
+        parse_seconds = time.perf_counter() - started
+        SPARQL_PARSE.observe(parse_seconds, query="user")
+        
+        started = time.perf_counter()
+        rows = self._evaluate("user", prepared)
+        eval_seconds = time.perf_counter() - started
+        if (parse_seconds + eval_seconds) * 1000 >= settings.SLOW_QUERY_MS:
+            SLOW_QUERIES.inc(query="user")
+            log_slow_query(normalize_sparql(query), parse_seconds, eval_seconds, len(rows))
+        return rows
+    
+    def _evaluate(self, name: str, prepared, bindings: Optional[Dict] = None) -> List:
+        """Évalue une requête préparée jusqu'à la dernière ligne (durée et lignes par requête)"""
+        started = time.perf_counter()
+        rows = list(self.closure.view.query(prepared, initBindings=bindings))
+        SPARQL_EVAL.observe(time.perf_counter() - started, query=name)
+        SPARQL_ROWS.observe(len(rows), query=name)
+        return rows
+    
+    def _hydrate(self, persons: Optional[List[URIRef]] = None, closure: Optional[RDFSClosure] = None) -> List[Dict]:
+        """
+        Construit les dictionnaires `Candidate` en un nombre constant de
+        parcours du graphe (au lieu de 4 requêtes SPARQL par candidat).
 
-        SELECT ?profile ?label
-        WHERE {{
-            <{person_uri}> :hasProfile ?profile .
-            OPTIONAL {{ ?profile rdfs:label ?label . }}
-        }}
+        Sans argument, chaque propriété est lue en une seule passe sur le
+        prédicat ; avec une liste de personnes, seuls leurs sujets sont lus.
+        Graphe et fermeture lus une seule fois sur `self.closure` (ou
+        `closure`) : un rechargement concurrent ne mélange pas deux générations.
         """
+        ns = self.cv_ns
+        if closure is None:
+            closure = self.closure
+        graph = closure.graph
+        started = time.perf_counter()
+        scope = "all" if persons is None else "batch"
 
-        rows = list(self.graph.query(query))
-        if not rows:
-            return None
+        if persons is None:
+            persons = list(graph.subjects(RDF.type, ns.Person))
+            subjects = None
+        else:
+            persons = [p for p in persons if (p, RDF.type, ns.Person) in graph]
+            subjects = persons
+        if not persons:
+            return []
+
+        names = self._collect(graph, ns.name, subjects)
+        emails = self._collect(graph, ns.email, subjects)
+        years = self._collect(graph, ns.yearsOfExperience, subjects)
+        profiles = self._collect(graph, ns.hasProfile, subjects)
+        skills = self._collect(graph, ns.hasSkill, subjects)
+        degrees = self._collect(graph, ns.hasDegree, subjects)
+        experiences = self._collect(graph, ns.hasExperience, subjects)
+
+        def related(grouped):
+            # Noeuds liés à charger : tous (None) ou seulement ceux référencés
+            if subjects is None:
+                return None
+            return list(dict.fromkeys(o for objs in grouped.values() for o in objs))
+
+        # Profils : libellés multilingues
+        profile_labels = self._collect(graph, RDFS.label, related(profiles))
+
+        # Compétences : nom + type (technique / transversale, sous-classes comprises)
+        skill_nodes = related(skills)
+        skill_names = self._collect(graph, ns.skillName, skill_nodes)
+        skill_types = {}
+        for skill_class, skill_type in ((ns.TechnicalSkill, "technical"), (ns.SoftSkill, "soft")):
+            for skill in closure.instances(skill_class):
+                skill_types.setdefault(skill, []).append(skill_type)
+
+        # Diplômes
+        degree_nodes = related(degrees)
+        degree_names = self._collect(graph, ns.degreeName, degree_nodes)
+        degree_levels = self._collect(graph, ns.degreeLevel, degree_nodes)
+        degree_years = self._collect(graph, ns.yearObtained, degree_nodes)
+
+        # Expériences
+        exp_nodes = related(experiences)
+        exp_fields = {
+            field: self._collect(graph, ns[field], exp_nodes)
+            for field in ('jobTitle', 'company', 'duration', 'startYear', 'endYear')
+        }
+
+        candidates = []
+        for person in persons:
+            if person not in names or person not in emails or person not in years:
+                continue
+
+            profile = None
+            if person in profiles:
+                profile_uri = profiles[person][0]
+                profile = self._profile_label(str(profile_uri), profile_labels.get(profile_uri, []))
 
-        profile_uri = str(rows[0].profile)
+            candidate_skills = []
+            for skill in skills.get(person, []):
+                for skill_name in skill_names.get(skill, []):
+                    for skill_type in skill_types.get(skill, []):
+                        candidate_skills.append({'name': str(skill_name), 'type': skill_type})
 
-        # choisir label fr puis en si présent
-        labels = [row.label for row in rows if row.label]
+            degree = None
+            for node in degrees.get(person, []):
+                if node in degree_names and node in degree_levels:
+                    year = degree_years.get(node)
+                    degree = {
+                        'name': str(degree_names[node][0]),
+                        'level': str(degree_levels[node][0]),
+                        'year': int(year[0]) if year else None
+                    }
+                    break
+
+            candidate_experiences = []
+            for node in experiences.get(person, []):
+                if not all(node in values for values in exp_fields.values()):
+                    continue
+                candidate_experiences.append({
+                    'jobTitle': str(exp_fields['jobTitle'][node][0]),
+                    'company': str(exp_fields['company'][node][0]),
+                    'duration': int(exp_fields['duration'][node][0]),
+                    'startYear': int(exp_fields['startYear'][node][0]),
+                    'endYear': int(exp_fields['endYear'][node][0])
+                })
+
+            candidates.append({
+                'id': str(person).split('#')[-1],
+                'name': str(names[person][0]),
+                'email': str(emails[person][0]),
+                'yearsOfExperience': int(years[person][0]),
+                'profile': profile,
+                'skills': candidate_skills,
+                'degree': degree,
+                'experiences': candidate_experiences
+            })
+
+        elapsed = time.perf_counter() - started
+        HYDRATE_SECONDS.observe(elapsed, scope=scope)
+        HYDRATE_CANDIDATES.inc(len(candidates), scope=scope)
+        if candidates:
+            HYDRATE_PER_CANDIDATE.observe(elapsed / len(candidates), scope=scope)
+        return candidates
+
+    @staticmethod
+    def _collect(graph: Graph, predicate: URIRef, subjects: Optional[List[URIRef]] = None) -> Dict:
+        """
+        Regroupe les objets de `predicate` par sujet.
+        `subjects=None` : une seule passe sur tout le prédicat.
+        """
+        grouped = {}
+        if subjects is None:
+            for s, o in graph.subject_objects(predicate):
+                grouped.setdefault(s, []).append(o)
+        else:
+            for s in subjects:
+                objects = list(graph.objects(s, predicate))
+                if objects:
+                    grouped[s] = objects
+        return grouped
+
+    @staticmethod
+    def _profile_label(profile_uri: str, labels: List) -> str:
+        """Choisit le libellé d'un profil : fr, puis en, sinon le nom local"""
+        labels = [l for l in labels if l]
         for l in labels:
             if getattr(l, "language", None) == "fr":
                 return str(l)
         for l in labels:
             if getattr(l, "language", None) == "en":
                 return str(l)
-
         # fallback : DataScientist / CloudEngineer ...
         return profile_uri.split("#")[-1].split("/")[-1]
 
-    
-    def _get_skills(self, person_uri: str) -> List[Dict]:
-        """Récupère les compétences d'une personne"""
-        query = f"""
-        PREFIX : <{settings.CV_NAMESPACE}>
-        
-        SELECT ?skillName ?type
-        WHERE {{
-            <{person_uri}> :hasSkill ?skill .
-            ?skill :skillName ?skillName ;
-                   a ?type .
-            FILTER(?type = :TechnicalSkill || ?type = :SoftSkill)
-        }}
-        """
-        
-        results = self.graph.query(query)
-        skills = []
-        
-        for row in results:
-            skill_type = "technical" if "TechnicalSkill" in str(row.type) else "soft"
-            skills.append({
-                'name': str(row.skillName),
-                'type': skill_type
-            })
-        
-        return skills
-    
-    def _get_degree(self, person_uri: str) -> Optional[Dict]:
-        """Récupère le diplôme d'une personne"""
-        query = f"""
-        PREFIX : <{settings.CV_NAMESPACE}>
-        
-        SELECT ?degreeName ?degreeLevel ?yearObtained
-        WHERE {{
-            <{person_uri}> :hasDegree ?degree .
-            ?degree :degreeName ?degreeName ;
-                    :degreeLevel ?degreeLevel .
-            OPTIONAL {{ ?degree :yearObtained ?yearObtained }}
-        }}
-        """
-        
-        results = list(self.graph.query(query))
-        if results:
-            row = results[0]
-            return {
-                'name': str(row.degreeName),
-                'level': str(row.degreeLevel),
-                'year': int(row.yearObtained) if row.yearObtained else None
-            }
-        return None
-    
-    def _get_experiences(self, person_uri: str) -> List[Dict]:
-        """Récupère les expériences d'une personne"""
-        query = f"""
-        PREFIX : <{settings.CV_NAMESPACE}>
-        
-        SELECT ?jobTitle ?company ?duration ?startYear ?endYear
-        WHERE {{
-            <{person_uri}> :hasExperience ?exp .
-            ?exp :jobTitle ?jobTitle ;
-                 :company ?company ;
-                 :duration ?duration ;
-                 :startYear ?startYear ;
-                 :endYear ?endYear .
-        }}
-        """
-        
-        results = self.graph.query(query)
-        experiences = []
-        
-        for row in results:
-            experiences.append({
-                'jobTitle': str(row.jobTitle),
-                'company': str(row.company),
-                'duration': int(row.duration),
-                'startYear': int(row.startYear),
-                'endYear': int(row.endYear)
-            })
-        
-        return experiences
-
 # Instance globale
 rdf_service = RDFService()
\ No newline at end of file
@@ -0,0 +1,147 @@
+import functools
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# Jetons d'une requête SPARQL : chaînes, IRIs, commentaires, noms préfixés,
+# espaces, puis tout autre caractère isolé
+_SPARQL_TOKEN = re.compile(r'''
+      (?P<string>"""(?:[^"\\]|\\.|"(?!""))*"""|\'\'\'(?:[^'\\]|\\.|'(?!\'\'))*\'\'\'
+                 |"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+    | (?P<iri><[^<>"{}|^`\\\s]*>)
+    | (?P<comment>\#[^\n]*)
+    | (?P<pname>(?:[A-Za-z](?:[\w.-]*[\w-])?)?:(?:[\w-](?:[\w.-]*[\w-])?)?)
+    | (?P<space>\s+)
+    | (?P<word>[\w$?]+)
+    | (?P<other>.)
+''', re.VERBOSE | re.DOTALL)
+
+
+def normalize_sparql(query: str) -> str:
+    """
+    Forme normalisée d'une requête SPARQL (clé de cache) : commentaires et
+    espaces superflus retirés, déclarations PREFIX supprimées et noms
+    préfixés développés en IRIs complètes.
+    """
+    tokens = []
+    for match in _SPARQL_TOKEN.finditer(query):
+        kind = match.lastgroup
+        if kind not in ('space', 'comment'):
+            tokens.append((kind, match.group()))
+
+    prefixes: Dict[str, str] = {}
+    out = []
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        if (kind == 'word' and text.upper() == 'PREFIX' and i + 2 < len(tokens)
+                and tokens[i + 1][0] == 'pname' and tokens[i + 1][1].endswith(':')
+                and tokens[i + 2][0] == 'iri'):
+            prefixes[tokens[i + 1][1][:-1]] = tokens[i + 2][1][1:-1]
+            i += 3
+            continue
+        if kind == 'pname':
+            prefix, local = text.split(':', 1)
+            if prefix in prefixes:
+                text = f"<{prefixes[prefix]}{local}>"
+        out.append(text)
+        i += 1
+    return ' '.join(out)
+
+
+def _estimate_size(value: Any) -> int:
+    """Taille approximative d'un résultat (octets de sa sérialisation JSON)"""
+    if isinstance(value, bytes):
+        return len(value)
+    return len(json.dumps(value, default=str, ensure_ascii=False))
+
+
+class ResultCache:
+    """
+    Cache LRU borné en mémoire (budget en octets) avec expiration (TTL).
+
+    Les clés incluent la version du graphe : un changement de version
+    (`invalidate`) vide le cache, et un résultat calculé sur une version
+    antérieure n'y est jamais rangé.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, version: int, compute: Callable[[], Any]) -> Any:
+        full_key = (key, version)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._drop(full_key)
+            self.misses += 1
+
+        value = compute()
+        if self.max_bytes <= 0:
+            return value
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if version != self.version:
+                return value
+            if full_key in self._entries:
+                self._drop(full_key)
+            self._entries[full_key] = (value, size, now + self.ttl)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def _drop(self, full_key: Tuple):
+        _value, size, _expires = self._entries.pop(full_key)
+        self.bytes -= size
+
+    def invalidate(self, version: int):
+        """Nouvelle version du graphe : toutes les entrées deviennent obsolètes"""
+        with self._lock:
+            self.version = version
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+def cached(name: str):
+    """Met en cache une méthode du service, par (nom, arguments, version du graphe)"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            return self.cached_result(name, lambda: method(self, *args), key=args)
+        return wrapper
+    return decorator
@@ -0,0 +1,84 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle : repli sur json (même sortie, plus lent)
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """JSON compact en UTF-8, identique à la sortie de JSONResponse (orjson si installé)"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def join_array(fragments: Iterable[bytes]) -> bytes:
+    """Tableau JSON assemblé à partir d'éléments déjà encodés"""
+    return b"[" + b",".join(fragments) + b"]"
+
+
+class JSONBytesResponse(Response):
+    """Réponse JSON dont le corps est déjà encodé (aucune validation ni ré-encodage)"""
+    media_type = "application/json"
+
+
+class FragmentCache:
+    """
+    JSON pré-encodé de chaque candidat, associé à la version du candidat
+    (RDFService.candidate_version) : un fragment d'une version antérieure
+    n'est jamais resservi. LRU borné en octets.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str], versions: List[int]) -> List[Optional[bytes]]:
+        found: List[Optional[bytes]] = []
+        with self._lock:
+            for key, version in zip(keys, versions):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == version:
+                    self._entries.move_to_end(key)
+                    found.append(entry[1])
+                else:
+                    found.append(None)
+            hits = sum(1 for f in found if f is not None)
+            self.hits += hits
+            self.misses += len(found) - hits
+        return found
+
+    def put_many(self, items: Dict[str, Tuple[int, bytes]]):
+        if self.max_bytes <= 0:
+            return
+        with self._lock:
+            for key, entry in items.items():
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self.bytes -= len(old[1])
+                self._entries[key] = entry
+                self.bytes += len(entry[1])
+            while self.bytes > self.max_bytes and self._entries:
+                _key, (_version, fragment) = self._entries.popitem(last=False)
+                self.bytes -= len(fragment)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "encoder": "orjson" if orjson is not None else "json",
+            }
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rdflib.term import Node
+
+from app.services.int_store import ORDERS, IntStore, TermDictionary
+from app.services.snapshot import decode_term, encode_term, is_fresh, source_fingerprint
+
+# Fichier partagé entre workers, mappé en lecture seule (mmap) :
+#   MAGIC | longueur de l'en-tête (uint64) | en-tête JSON | padding 8 octets
+#   | sections alignées sur 8 octets (décalages relatifs dans l'en-tête) :
+#     term_offsets (int64[n+1]), term_data (termes encodés en JSON),
+#     term_table (table de hachage à adressage ouvert -> id, -1 = vide),
+#     {spo,pos,osp}_{ab,c} (permutations de l'IntStore),
+#     projection (projection compacte des candidats, JSON)
+MAGIC = b"CVSHM01\n"
+FORMAT_VERSION = 1
+
+# Termes décodés gardés en cache par worker (le reste reste dans le mmap)
+TERM_CACHE_SIZE = 100_000
+
+
+def shared_path_for(source_path: str) -> str:
+    return source_path + ".shared"
+
+
+def term_bytes(term: Node) -> bytes:
+    return json.dumps(encode_term(term), ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def term_hash(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+class MappedTermDictionary(TermDictionary):
+    """
+    Dictionnaire des termes lu directement dans le fichier mappé : les
+    termes sont décodés à la demande (cache borné) et retrouvés par la
+    table de hachage du fichier. Les termes ajoutés après le chargement
+    sont gardés en mémoire privée, avec des ids à la suite.
+    """
+
+    def __init__(self, offsets: memoryview, data: memoryview, table: memoryview):
+        super().__init__()
+        self._offsets = offsets
+        self._data = data
+        self._table = table
+        self._mask = len(table) - 1
+        self._base = len(offsets) - 1
+        self._cache: Dict[int, Node] = {}
+        self.term = self._term
+
+    def __len__(self) -> int:
+        return self._base + len(self._terms)
+
+    def _raw(self, tid: int) -> bytes:
+        return bytes(self._data[self._offsets[tid]:self._offsets[tid + 1]])
+
+    def _term(self, tid: int) -> Node:
+        if tid >= self._base:
+            return self._terms[tid - self._base]
+        node = self._cache.get(tid)
+        if node is None:
+            if len(self._cache) >= TERM_CACHE_SIZE:
+                self._cache.clear()
+            node = self._cache[tid] = decode_term(json.loads(self._raw(tid)))
+        return node
+
+    def id_of(self, term: Node) -> Optional[int]:
+        tid = self._ids.get(term)
+        if tid is not None:
+            return tid
+        raw = term_bytes(term)
+        slot = term_hash(raw) & self._mask
+        while True:
+            tid = self._table[slot]
+            if tid < 0:
+                return None
+            if self._raw(tid) == raw:
+                return tid
+            slot = (slot + 1) & self._mask
+
+    def intern(self, term: Node) -> int:
+        tid = self.id_of(term)
+        if tid is None:
+            tid = self._ids[term] = len(self)
+            self._terms.append(term)
+        return tid
+
+
+class SharedSnapshot:
+    """Fichier partagé ouvert en mmap ; les tableaux sont des vues sans copie"""
+
+    def __init__(self, mm: mmap.mmap, header: Dict, data_start: int):
+        self._mm = mm
+        self._view = memoryview(mm)
+        self.header = header
+        self._data_start = data_start
+
+    def section(self, name: str) -> memoryview:
+        offset, length = self.header["sections"][name]
+        start = self._data_start + offset
+        return self._view[start:start + length]
+
+    def ints(self, name: str) -> memoryview:
+        return self.section(name).cast('q')
+
+    def term_dictionary(self) -> MappedTermDictionary:
+        return MappedTermDictionary(self.ints("term_offsets"), self.section("term_data"), self.ints("term_table"))
+
+    def attach(self, store: IntStore):
+        """Branche l'IntStore sur les permutations mappées"""
+        index = {order: (self.ints(f"{order}_ab"), self.ints(f"{order}_c")) for order in ORDERS}
+        store.attach(self.term_dictionary(), index, self.header["triples"])
+
+    def projections(self) -> List[Dict]:
+        return json.loads(bytes(self.section("projection")))
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+def write_shared(path: str, source_path: str, store: IntStore, projections: List[Dict],
+                 namespaces: List[Tuple[str, str]]):
+    """Écrit le fichier partagé de façon atomique (fichier temporaire puis rename)"""
+    term_dict, index, count = store.export()
+    n = len(term_dict)
+
+    offsets = array('q', [0])
+    data = bytearray()
+    table_size = 1 << max(4, (2 * n).bit_length())
+    table = array('q', [-1]) * table_size
+    mask = table_size - 1
+    for tid in range(n):
+        raw = term_bytes(term_dict.term(tid))
+        data += raw
+        offsets.append(len(data))
+        slot = term_hash(raw) & mask
+        while table[slot] != -1:
+            slot = (slot + 1) & mask
+        table[slot] = tid
+
+    sections = [("term_offsets", offsets.tobytes()), ("term_data", bytes(data)), ("term_table", table.tobytes())]
+    for order in ORDERS:
+        ab, c = index[order]
+        sections.append((f"{order}_ab", array('q', ab).tobytes()))
+        sections.append((f"{order}_c", array('q', c).tobytes()))
+    sections.append(("projection", json.dumps(projections, ensure_ascii=False, separators=(',', ':')).encode()))
+
+    layout, position = {}, 0
+    for name, payload in sections:
+        layout[name] = [position, len(payload)]
+        position += len(payload) + _pad(len(payload))
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "triples": count,
+        "terms": n,
+        "namespaces": namespaces,
+        "sections": layout,
+        **source_fingerprint(source_path),
+    }).encode()
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        f.write(b'\0' * _pad(f.tell()))
+        for _name, payload in sections:
+            f.write(payload)
+            f.write(b'\0' * _pad(len(payload)))
+    os.replace(tmp_path, path)
+
+
+def open_shared(path: str, source_path: str) -> Optional[SharedSnapshot]:
+    """Mappe le fichier partagé s'il existe et correspond à la source, sinon None"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (header_len,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_len))
+            if header.get("version") != FORMAT_VERSION or header.get("byteorder") != sys.byteorder:
+                return None
+            if not is_fresh(header, source_path):
+                return None
+            data_start = f.tell() + _pad(f.tell())
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return SharedSnapshot(mm, header, data_start)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+
+@contextmanager
+def _exclusive_lock(lock_path: str):
+    """Verrou inter-processus (fcntl) ; sans fcntl, pas de verrou"""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(lock_path, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def load_or_build(source_path: str, path: str,
+                  build: Callable[[], Tuple[IntStore, List[Dict], List[Tuple[str, str]]]]) -> SharedSnapshot:
+    """
+    Ouvre le fichier partagé ; s'il manque ou est périmé, un seul worker
+    (sous verrou) le construit avec `build`, les autres attendent puis le mappent.
+    """
+    shared = open_shared(path, source_path)
+    if shared is not None:
+        return shared
+    with _exclusive_lock(path + ".lock"):
+        shared = open_shared(path, source_path)
+        if shared is None:
+            store, projections, namespaces = build()
+            write_shared(path, source_path, store, projections, namespaces)
+            shared = open_shared(path, source_path)
+    if shared is None:
+        raise RuntimeError(f"Fichier partagé illisible : {path}")
+    return shared
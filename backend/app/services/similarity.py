@@ -0,0 +1,221 @@
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.candidate_index import sort_key
+from app.services.matcher import _grown
+
+# Signatures MinHash : BANDS bandes de BAND_ROWS valeurs. Deux candidats
+# d'indice de Jaccard J partagent au moins une bande avec une probabilité
+# 1 - (1 - J^3)^32 : 0.58 pour J = 0.3, 0.88 pour J = 0.4, 0.99 pour J = 0.5
+BANDS = 32
+BAND_ROWS = 3
+NUM_HASHES = BANDS * BAND_ROWS
+
+# Voisins lus au plus par bande partagée (coût d'une recherche borné,
+# quelle que soit la taille des seaux très peuplés)
+MAX_BUCKET_SCAN = 512
+
+# En dessous de cette taille, tous les candidats sont re-classés (résultat exact)
+EXACT_SCAN_MAX = 2048
+
+# Candidats signés par lot (tableau temporaire : caractéristiques du lot x NUM_HASHES)
+SIGN_BATCH = 20_000
+
+# Ajouts gardés dans les seaux de queue (dictionnaires) avant la fusion
+# dans les tableaux triés : au moins MERGE_MIN, au plus 1/8 des slots fusionnés
+MERGE_MIN = 4096
+
+# Permutations h(x) = (a.x + b) mod p, p premier de Mersenne 2^31 - 1 :
+# a.x + b tient dans un uint64. Graine fixe : signatures reproductibles.
+_PRIME = (1 << 31) - 1
+_RNG = np.random.default_rng(20240917)
+_A = _RNG.integers(1, _PRIME, NUM_HASHES, dtype=np.uint64)
+_B = _RNG.integers(0, _PRIME, NUM_HASHES, dtype=np.uint64)
+
+# Mélange des BAND_ROWS valeurs d'une bande en une clé de seau (uint64,
+# débordement modulo 2^64 voulu ; une collision fortuite ne coûte qu'un
+# voisin de plus au re-classement exact)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+_EMPTY = frozenset()
+
+
+def features(candidate: Dict) -> List[str]:
+    """Caractéristiques comparées : compétences (:hasSkill), profil et niveau de diplôme"""
+    tokens = [f"skill:{skill['name']}" for skill in candidate['skills']]
+    if candidate.get('profile'):
+        tokens.append(f"profile:{candidate['profile']}")
+    level = (candidate.get('degree') or {}).get('level')
+    if level:
+        tokens.append(f"degree:{level}")
+    return tokens
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared) if shared else 0.0
+
+
+class SimilarityIndex:
+    """
+    Candidats similaires (indice de Jaccard des caractéristiques) par
+    MinHash et LSH :
+    - une valeur de hachage par caractéristique et par permutation
+      (table vocabulaire x NUM_HASHES), la signature d'un candidat étant
+      le minimum colonne par colonne des lignes de ses caractéristiques
+    - chaque bande de la signature donne une clé de seau : deux candidats
+      de même clé sur une bande sont voisins potentiels
+
+    Seaux d'une bande : clés triées et slots correspondants (recherche
+    dichotomique), plus une queue (clé -> slots) des ajouts récents,
+    fusionnée quand elle grossit. Une recherche lit au plus MAX_BUCKET_SCAN
+    voisins par bande, puis les re-classe par l'indice de Jaccard exact.
+    Un candidat retiré n'a plus de caractéristique (jamais retenu) et
+    disparaît des seaux à la fusion suivante.
+    """
+
+    def __init__(self, candidates: Iterable[Dict]):
+        self.ids: List[str] = []
+        self.slot_of: Dict[str, int] = {}
+        self.tokens: List[str] = []
+        self.token_rows: Dict[str, int] = {}
+        self.hashes = np.zeros((0, NUM_HASHES), dtype=np.uint32)
+        self.features: List[frozenset] = []
+        self.keys = np.zeros((0, BANDS), dtype=np.uint64)
+        # Seaux fusionnés (slots < merged) : (clés triées, slots) de forme BANDS x m
+        self.merged = 0
+        self.sorted: Tuple[np.ndarray, np.ndarray] = (
+            np.zeros((BANDS, 0), dtype=np.uint64), np.zeros((BANDS, 0), dtype=np.int64)
+        )
+        self.tail: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+        self.add_many(sorted(candidates, key=sort_key))
+
+    def __len__(self) -> int:
+        return len(self.slot_of)
+
+    def _token_row(self, token: str) -> int:
+        row = self.token_rows.get(token)
+        if row is None:
+            row = self.token_rows[token] = len(self.tokens)
+            self.tokens.append(token)
+        return row
+
+    def _grow_hashes(self):
+        """Valeurs MinHash des caractéristiques apparues depuis le dernier ajout"""
+        start = len(self.hashes)
+        if start == len(self.tokens):
+            return
+        x = np.array([
+            int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little') % _PRIME
+            for token in self.tokens[start:]
+        ], dtype=np.uint64)
+        rows = ((x[:, None] * _A + _B) % np.uint64(_PRIME)).astype(np.uint32)
+        self.hashes = np.concatenate([self.hashes, rows])
+
+    def _band_keys(self, rows: List[frozenset]) -> np.ndarray:
+        """Clés des BANDS seaux de chaque ensemble de caractéristiques (non vides)"""
+        lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+        flat = np.fromiter((t for r in rows for t in r), dtype=np.int64, count=int(lengths.sum()))
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        signatures = np.minimum.reduceat(self.hashes[flat], offsets, axis=0)
+        bands = signatures.reshape(len(rows), BANDS, BAND_ROWS).astype(np.uint64)
+        keys = np.zeros((len(rows), BANDS), dtype=np.uint64)
+        for i in range(BAND_ROWS):
+            keys = keys * _MIX + bands[:, :, i]
+        return keys
+
+    def add_many(self, candidates: Iterable[Dict]):
+        """Ajoute (ou remplace) des candidats : signatures par lots, puis seaux"""
+        candidates = list(candidates)
+        self.remove_many([c['id'] for c in candidates if c['id'] in self.slot_of])
+        start = len(self.ids)
+        rows = [frozenset(self._token_row(t) for t in features(c)) for c in candidates]
+        self._grow_hashes()
+        for c in candidates:
+            self.slot_of[c['id']] = len(self.ids)
+            self.ids.append(c['id'])
+        self.features.extend(rows)
+
+        self.keys = _grown(self.keys, len(self.ids))
+        signed = [start + i for i, r in enumerate(rows) if r]  # sans caractéristique : aucun voisin
+        for batch in range(0, len(signed), SIGN_BATCH):
+            slots = signed[batch:batch + SIGN_BATCH]
+            self.keys[slots] = self._band_keys([self.features[slot] for slot in slots])
+
+        if len(self.ids) - self.merged > max(MERGE_MIN, self.merged // 8):
+            self._merge()
+            return
+        for band, table in enumerate(self.tail):
+            for slot, key in zip(signed, self.keys[signed, band].tolist()):
+                bucket = table.get(key)
+                if bucket is None:
+                    table[key] = [slot]
+                else:
+                    bucket.append(slot)
+
+    def _merge(self):
+        """Seaux triés reconstruits sur tous les slots vivants ; queue vidée"""
+        size = len(self.ids)
+        live = np.array([slot for slot in range(size) if self.features[slot]], dtype=np.int64)
+        keys = self.keys[live].T
+        order = np.argsort(keys, axis=1, kind='stable')  # slots croissants dans chaque seau
+        self.sorted = (np.take_along_axis(keys, order, axis=1), live[order])
+        self.tail = [{} for _ in range(BANDS)]
+        self.merged = size
+
+    def remove_many(self, candidate_ids: Iterable[str]):
+        for cid in candidate_ids:
+            slot = self.slot_of.pop(cid, None)
+            if slot is not None:
+                self.features[slot] = _EMPTY
+
+    def _neighbours(self, slot: int) -> set:
+        """Slots partageant au moins une bande avec `slot` (au plus MAX_BUCKET_SCAN par bande)"""
+        if len(self.slot_of) <= EXACT_SCAN_MAX:
+            return set(self.slot_of.values())
+        keys, slots = self.sorted
+        tail = self.tail
+        neighbours = set()
+        for band, key in enumerate(self.keys[slot]):
+            lo = np.searchsorted(keys[band], key, 'left')
+            hi = min(np.searchsorted(keys[band], key, 'right'), lo + MAX_BUCKET_SCAN)
+            neighbours.update(slots[band, lo:hi].tolist())
+            neighbours.update(tail[band].get(int(key), ())[:MAX_BUCKET_SCAN])
+        return neighbours
+
+    def similar(self, candidate_id: str, k: int) -> Optional[Tuple[List[Dict], int]]:
+        """
+        Les k voisins les plus proches (id, indice de Jaccard exact,
+        compétences communes) par indice décroissant puis ordre des slots,
+        et le nombre de voisins re-classés ; None si le candidat est inconnu.
+        """
+        slot = self.slot_of.get(candidate_id)
+        if slot is None:
+            return None
+        own = self.features[slot]
+        if not own:
+            return [], 0
+
+        neighbours = self._neighbours(slot)
+        neighbours.discard(slot)
+        scored: Dict[int, float] = {}
+        for other in neighbours:
+            score = jaccard(own, self.features[other])
+            if score > 0:
+                scored[other] = score
+        ranked = sorted(scored, key=lambda other: (-scored[other], other))[:k]
+
+        results = [
+            {
+                'id': self.ids[other],
+                'similarity': round(scored[other], 4),
+                'sharedSkills': sorted(
+                    self.tokens[t][len('skill:'):] for t in own & self.features[other]
+                    if self.tokens[t].startswith('skill:')
+                ),
+            }
+            for other in ranked
+        ]
+        return results, len(scored)
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.term import Node
+
+from app.services.int_store import IntStore
+
+# Format du snapshot (tous les entiers en ordre natif, cf. "byteorder") :
+#   MAGIC | longueur de l'en-tête (uint64) | en-tête JSON
+#   | dictionnaire des termes (JSON) | padding jusqu'à 8 octets
+#   | triplets : int64 (s, p, o) triés SPO
+MAGIC = b"CVSNAP1\n"
+FORMAT_VERSION = 1
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_path_for(source_path: str) -> str:
+    """Le snapshot est écrit à côté du fichier Turtle"""
+    return source_path + ".snapshot"
+
+
+def encode_term(term: Node) -> List:
+    if isinstance(term, URIRef):
+        return ["U", str(term)]
+    if isinstance(term, BNode):
+        return ["B", str(term)]
+    if isinstance(term, Literal):
+        datatype = str(term.datatype) if term.datatype else None
+        return ["L", str(term), term.language, datatype]
+    raise ValueError(f"Terme non supporté dans un snapshot : {term!r}")
+
+
+def decode_term(entry: List) -> Node:
+    kind = entry[0]
+    if kind == "U":
+        return URIRef(entry[1])
+    if kind == "B":
+        return BNode(entry[1])
+    return Literal(entry[1], lang=entry[2], datatype=URIRef(entry[3]) if entry[3] else None)
+
+
+class Snapshot:
+    """Contenu d'un snapshot : en-tête, dictionnaire des termes et triplets encodés"""
+
+    def __init__(self, header: Dict, terms: List[List], triples: array):
+        self.header = header
+        self.terms = terms
+        self.triples = triples
+
+    def __len__(self) -> int:
+        return len(self.triples) // 3
+
+    def nodes(self) -> List[Node]:
+        return [decode_term(entry) for entry in self.terms]
+
+    def load_into(self, graph: Graph):
+        """Ajoute tous les triplets au graphe (en bloc pour un IntStore, sinon un seul addN)"""
+        nodes = self.nodes()
+        t = self.triples
+        if isinstance(graph.store, IntStore) and len(graph.store) == 0:
+            graph.store.load(nodes, t)
+        else:
+            graph.addN(
+                (nodes[t[i]], nodes[t[i + 1]], nodes[t[i + 2]], graph)
+                for i in range(0, len(t), 3)
+            )
+        for prefix, namespace in self.header.get("namespaces", []):
+            graph.bind(prefix, namespace, override=False)
+
+
+def source_fingerprint(source_path: str, with_hash: bool = True) -> Dict:
+    stat = os.stat(source_path)
+    fingerprint = {"source_mtime_ns": stat.st_mtime_ns, "source_size": stat.st_size}
+    if with_hash:
+        fingerprint["source_sha256"] = file_sha256(source_path)
+    return fingerprint
+
+
+def encode_graph(graph: Graph):
+    """Encode le graphe : dictionnaire des termes + triplets entiers triés SPO"""
+    ids: Dict[Node, int] = {}
+    terms: List[List] = []
+
+    def term_id(term: Node) -> int:
+        tid = ids.get(term)
+        if tid is None:
+            tid = ids[term] = len(terms)
+            terms.append(encode_term(term))
+        return tid
+
+    encoded = sorted((term_id(s), term_id(p), term_id(o)) for s, p, o in graph)
+    triples = array('q')
+    for spo in encoded:
+        triples.extend(spo)
+    return terms, triples
+
+
+def write_snapshot(graph: Graph, source_path: str, snapshot_path: str):
+    """Écrit le snapshot de façon atomique (fichier temporaire puis rename)"""
+    terms, triples = encode_graph(graph)
+    terms_bytes = json.dumps(terms, ensure_ascii=False, separators=(',', ':')).encode()
+
+    header = {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "triples": len(triples) // 3,
+        "terms": len(terms),
+        "terms_bytes": len(terms_bytes),
+        "namespaces": [[prefix, str(ns)] for prefix, ns in graph.namespaces()],
+        **source_fingerprint(source_path),
+    }
+    header_bytes = json.dumps(header).encode()
+
+    tmp_path = f"{snapshot_path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        f.write(terms_bytes)
+        f.write(b'\0' * (-f.tell() % 8))
+        triples.tofile(f)
+    os.replace(tmp_path, snapshot_path)
+
+
+def read_header(f) -> Optional[Dict]:
+    if f.read(len(MAGIC)) != MAGIC:
+        return None
+    (header_len,) = struct.unpack('<Q', f.read(8))
+    header = json.loads(f.read(header_len))
+    if header.get("version") != FORMAT_VERSION or header.get("byteorder") != sys.byteorder:
+        return None
+    return header
+
+
+def is_fresh(header: Dict, source_path: str) -> bool:
+    """Valide le snapshot : mtime + taille d'abord, sinon empreinte SHA-256"""
+    current = source_fingerprint(source_path, with_hash=False)
+    if current["source_size"] != header.get("source_size"):
+        return False
+    if current["source_mtime_ns"] == header.get("source_mtime_ns"):
+        return True
+    return file_sha256(source_path) == header.get("source_sha256")
+
+
+def read_snapshot(source_path: str, snapshot_path: str) -> Optional[Snapshot]:
+    """Lit le snapshot s'il existe et correspond au fichier source, sinon None"""
+    try:
+        with open(snapshot_path, 'rb') as f:
+            header = read_header(f)
+            if header is None or not is_fresh(header, source_path):
+                return None
+            terms = json.loads(f.read(header["terms_bytes"]))
+            f.read(-f.tell() % 8)
+            triples = array('q')
+            triples.fromfile(f, header["triples"] * 3)
+            return Snapshot(header, terms, triples)
+    except (OSError, ValueError, EOFError, KeyError, struct.error):
+        return None
+
+
+def snapshot_is_fresh(source_path: str, snapshot_path: str) -> bool:
+    try:
+        with open(snapshot_path, 'rb') as f:
+            header = read_header(f)
+            return header is not None and is_fresh(header, source_path)
+    except (OSError, ValueError, struct.error):
+        return False
+
+
+def build_snapshot(source_path: str, snapshot_path: str):
+    """Parse le fichier Turtle et écrit son snapshot (sans toucher au graphe servi)"""
+    graph = Graph(store=IntStore())
+    graph.parse(source_path, format='turtle')
+    write_snapshot(graph, source_path, snapshot_path)
+
+
+if __name__ == "__main__":
+    # Processus séparé du rechargement à chaud : le parsing ne prend pas le GIL du serveur
+    build_snapshot(sys.argv[1], sys.argv[2])
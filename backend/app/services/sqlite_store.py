@@ -0,0 +1,310 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rdflib import URIRef
+from rdflib.store import Store
+from rdflib.term import Node
+
+from app.services.snapshot import decode_term, encode_term
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    lang TEXT NOT NULL DEFAULT '',
+    datatype TEXT NOT NULL DEFAULT '',
+    UNIQUE (kind, value, lang, datatype)
+);
+CREATE TABLE IF NOT EXISTS triples (
+    s INTEGER NOT NULL,
+    p INTEGER NOT NULL,
+    o INTEGER NOT NULL,
+    PRIMARY KEY (s, p, o)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s);
+CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p);
+CREATE TABLE IF NOT EXISTS namespaces (
+    prefix TEXT PRIMARY KEY,
+    uri TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Taille des lots de lecture (termes manquants résolus en une requête) et d'insertion
+FETCH_BATCH = 1000
+# Nombre maximum de paramètres par requête (limite historique de SQLite)
+MAX_VARIABLES = 900
+
+TermKey = Tuple[str, str, str, str]
+
+
+def _term_key(term: Node) -> TermKey:
+    kind, value, *rest = encode_term(term)
+    lang, datatype = (rest + [None, None])[:2]
+    return kind, value, lang or '', datatype or ''
+
+
+def _key_to_term(kind: str, value: str, lang: str, datatype: str) -> Node:
+    return decode_term([kind, value, lang or None, datatype or None])
+
+
+class _LRU(OrderedDict):
+    """Cache borné des correspondances terme <-> id"""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def hit(self, key):
+        value = OrderedDict.get(self, key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class SQLiteStore(Store):
+    """
+    Store rdflib persistant sur un fichier SQLite local.
+
+    Les termes sont encodés en entiers (table `terms`) et les triplets
+    rangés dans une table WITHOUT ROWID (clé SPO) avec deux index
+    couvrants POS et OSP : chaque motif est un parcours d'index.
+
+    Ouvert en lecture majoritaire : WAL (les lecteurs ne bloquent pas),
+    cache de pages et mmap SQLite dimensionnés par la configuration,
+    une connexion par thread et un cache LRU des termes décodés.
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration: Optional[str] = None, identifier: Optional[Node] = None,
+                 cache_mb: int = 64, mmap_mb: int = 256, term_cache: int = 200_000):
+        # Store.__init__ appellerait open() avant l'initialisation des attributs
+        super().__init__()
+        self.identifier = identifier
+        self.path = configuration
+        self.cache_mb = cache_mb
+        self.mmap_mb = mmap_mb
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._ids = _LRU(term_cache)    # clé du terme -> id
+        self._terms = _LRU(term_cache)  # id -> Node
+        self._cache_lock = threading.Lock()
+        if configuration:
+            self.open(configuration, create=True)
+
+    # ----- connexion -----
+
+    def open(self, configuration: str, create: bool = False):
+        self.path = configuration
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        self._warm_page_cache()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute(f"PRAGMA cache_size=-{self.cache_mb * 1024}")
+            conn.execute(f"PRAGMA mmap_size={self.mmap_mb * 1024 * 1024}")
+            self._local.conn = conn
+        return conn
+
+    def _warm_page_cache(self):
+        """Demande au noyau de précharger le fichier (cache de pages de l'OS)"""
+        if not hasattr(os, "posix_fadvise"):
+            return
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+    def close(self, commit_pending_transaction: bool = False):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ----- dictionnaire des termes -----
+
+    def _lookup_id(self, term: Node) -> Optional[int]:
+        key = _term_key(term)
+        with self._cache_lock:
+            tid = self._ids.hit(key)
+        if tid is not None:
+            return tid
+        row = self._conn().execute(
+            "SELECT id FROM terms WHERE kind=? AND value=? AND lang=? AND datatype=?", key
+        ).fetchone()
+        if row is None:
+            return None
+        with self._cache_lock:
+            self._ids.put(key, row[0])
+        return row[0]
+
+    def _intern(self, conn: sqlite3.Connection, term: Node, batch: Dict[TermKey, int]) -> int:
+        key = _term_key(term)
+        tid = batch.get(key)
+        if tid is None:
+            tid = self._lookup_id(term)
+            if tid is None:
+                tid = conn.execute(
+                    "INSERT INTO terms (kind, value, lang, datatype) VALUES (?, ?, ?, ?)", key
+                ).lastrowid
+            batch[key] = tid
+        return tid
+
+    def _resolve(self, ids: Iterable[int]) -> Dict[int, Node]:
+        """Décode des ids en Node (cache LRU, puis une requête pour les manquants)"""
+        resolved: Dict[int, Node] = {}
+        missing: Set[int] = set()
+        with self._cache_lock:
+            for tid in ids:
+                if tid in resolved or tid in missing:
+                    continue
+                node = self._terms.hit(tid)
+                if node is None:
+                    missing.add(tid)
+                else:
+                    resolved[tid] = node
+        missing = list(missing)
+        for start in range(0, len(missing), MAX_VARIABLES):
+            chunk = missing[start:start + MAX_VARIABLES]
+            rows = self._conn().execute(
+                f"SELECT id, kind, value, lang, datatype FROM terms WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            with self._cache_lock:
+                for tid, *key in rows:
+                    node = _key_to_term(*key)
+                    self._terms.put(tid, node)
+                    resolved[tid] = node
+        return resolved
+
+    # ----- API Store -----
+
+    def add(self, triple, context, quoted: bool = False):
+        self.addN([(*triple, context)])
+
+    def addN(self, quads):
+        """Insertion en une seule transaction, par lots de FETCH_BATCH triplets"""
+        with self._write_lock:
+            conn = self._conn()
+            batch: Dict[TermKey, int] = {}
+            rows = []
+            with conn:
+                for s, p, o, _c in quads:
+                    rows.append((self._intern(conn, s, batch), self._intern(conn, p, batch),
+                                 self._intern(conn, o, batch)))
+                    if len(rows) >= FETCH_BATCH:
+                        conn.executemany("INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)", rows)
+                        rows = []
+                conn.executemany("INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)", rows)
+
+    def remove(self, triple_pattern, context=None):
+        where, params = self._where(triple_pattern)
+        if where is None:
+            return
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.execute(f"DELETE FROM triples{where}", params)
+
+    def _where(self, triple_pattern) -> Tuple[Optional[str], List[int]]:
+        """Clause WHERE d'un motif ; (None, []) si un terme lié est inconnu"""
+        clauses, params = [], []
+        for column, term in zip("spo", triple_pattern):
+            if term is None:
+                continue
+            tid = self._lookup_id(term)
+            if tid is None:
+                return None, []
+            clauses.append(f"{column} = ?")
+            params.append(tid)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def triples(self, triple_pattern, context=None):
+        where, params = self._where(triple_pattern)
+        if where is None:
+            return
+        cursor = self._conn().execute(f"SELECT s, p, o FROM triples{where}", params)
+        while True:
+            rows = cursor.fetchmany(FETCH_BATCH)
+            if not rows:
+                break
+            nodes = self._resolve(tid for row in rows for tid in row)
+            for s, p, o in rows:
+                yield (nodes[s], nodes[p], nodes[o]), iter(())
+
+    def __len__(self, context=None) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix: str, namespace: Node, override: bool = True):
+        conn = self._conn()
+        with self._write_lock, conn:
+            if not override:
+                bound = conn.execute(
+                    "SELECT 1 FROM namespaces WHERE prefix = ? OR uri = ?", (prefix, str(namespace))
+                ).fetchone()
+                if bound:
+                    return
+            conn.execute("DELETE FROM namespaces WHERE uri = ?", (str(namespace),))
+            conn.execute("INSERT OR REPLACE INTO namespaces (prefix, uri) VALUES (?, ?)", (prefix, str(namespace)))
+
+    def namespace(self, prefix: str):
+        row = self._conn().execute("SELECT uri FROM namespaces WHERE prefix = ?", (prefix,)).fetchone()
+        return URIRef(row[0]) if row else None
+
+    def prefix(self, namespace: Node) -> Optional[str]:
+        row = self._conn().execute("SELECT prefix FROM namespaces WHERE uri = ?", (str(namespace),)).fetchone()
+        return row[0] if row else None
+
+    def namespaces(self):
+        for prefix, uri in self._conn().execute("SELECT prefix, uri FROM namespaces").fetchall():
+            yield prefix, URIRef(uri)
+
+    def clear(self):
+        """Vide la base (triplets, termes, préfixes) ; les métadonnées sont conservées"""
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.execute("DELETE FROM triples")
+                conn.execute("DELETE FROM terms")
+                conn.execute("DELETE FROM namespaces")
+            with self._cache_lock:
+                self._ids.clear()
+                self._terms.clear()
+
+    # ----- métadonnées -----
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        conn = self._conn()
+        with self._write_lock, conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
@@ -0,0 +1,125 @@
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Nombre de compétences retournées dans "most_common_skills"
+TOP_SKILLS = 10
+
+
+class StatisticsAggregator:
+    """
+    Statistiques des candidats maintenues par deltas (`/api/stats` en O(1)).
+
+    Construit une fois au chargement à partir des projections du
+    CandidateIndex, puis mis à jour à chaque import :
+    - nombre de candidats par profil
+    - nombre de candidats par compétence, avec le classement des
+      compétences (liste triée par (-nombre, nom), ajustée à chaque delta)
+    - somme et nombre des années d'expérience
+    - nombre de profils distincts (les profils des candidats) ; le nombre
+      de compétences déclarées dans le graphe, qui ne dépend pas que des
+      candidats, est fixé au chargement puis ajusté par le service RDF
+
+    Chaque candidat garde sa contribution, retirée avant d'appliquer la
+    nouvelle quand il est remplacé. Un verrou interne rend `summary`
+    cohérent pendant un import.
+    """
+
+    def __init__(self, candidates: Iterable[Dict]):
+        self.contributions: Dict[str, Tuple[Optional[str], float, Tuple[str, ...]]] = {}
+        self.profile_counts: Dict[Optional[str], int] = {}
+        self.skill_counts: Dict[str, int] = {}
+        self.ranking: List[Tuple[int, str]] = []
+        self.experience_sum = 0
+        self.total_skills = 0
+        self._lock = threading.Lock()
+        self.add_many(candidates)
+
+    def __len__(self) -> int:
+        return len(self.contributions)
+
+    def add_many(self, candidates: Iterable[Dict]):
+        """Ajoute (ou remplace) des candidats"""
+        contributions = [
+            (
+                candidate['id'],
+                (
+                    candidate.get('profile'),
+                    candidate['yearsOfExperience'],
+                    tuple(dict.fromkeys(skill['name'] for skill in candidate['skills'])),
+                ),
+            )
+            for candidate in candidates
+        ]
+        with self._lock:
+            for candidate_id, contribution in contributions:
+                self._remove(candidate_id)
+                self.contributions[candidate_id] = contribution
+                self._apply(contribution, 1)
+
+    def remove_many(self, candidate_ids: Iterable[str]):
+        with self._lock:
+            for candidate_id in candidate_ids:
+                self._remove(candidate_id)
+
+    def set_skill_vocabulary(self, total_skills: int):
+        """Nombre de compétences déclarées dans le graphe (recompté)"""
+        with self._lock:
+            self.total_skills = total_skills
+
+    def add_skill_vocabulary(self, delta: int):
+        """Compétences déclarées ou retirées par une écriture"""
+        with self._lock:
+            self.total_skills += delta
+
+    def _remove(self, candidate_id: str):
+        contribution = self.contributions.pop(candidate_id, None)
+        if contribution is not None:
+            self._apply(contribution, -1)
+
+    def _apply(self, contribution: Tuple, delta: int):
+        profile, years, skills = contribution
+        self.experience_sum += delta * years
+        count = self.profile_counts.get(profile, 0) + delta
+        if count:
+            self.profile_counts[profile] = count
+        else:
+            del self.profile_counts[profile]
+        for name in skills:
+            self._count_skill(name, delta)
+
+    def _count_skill(self, name: str, delta: int):
+        """Met à jour le nombre d'une compétence et sa place dans le classement"""
+        old = self.skill_counts.get(name, 0)
+        new = old + delta
+        if old:
+            del self.ranking[bisect_left(self.ranking, (-old, name))]
+        if new:
+            self.skill_counts[name] = new
+            insort(self.ranking, (-new, name))
+        else:
+            del self.skill_counts[name]
+
+    def frequencies(self) -> Tuple[Dict[str, int], Dict[Optional[str], int]]:
+        """Nombre de candidats par compétence et par profil (copies)"""
+        with self._lock:
+            return dict(self.skill_counts), dict(self.profile_counts)
+
+    def summary(self) -> Dict:
+        """Statistiques au format de `/api/stats`"""
+        with self._lock:
+            return self._summary()
+
+    def _summary(self) -> Dict:
+        total = len(self.contributions)
+        return {
+            "total_candidates": total,
+            "total_skills": self.total_skills,
+            "total_profiles": sum(1 for profile in self.profile_counts if profile is not None),
+            "average_experience": round(self.experience_sum / total, 1) if total > 0 else 0,
+            "profile_distribution": dict(self.profile_counts),
+            "most_common_skills": [
+                {"skill": name, "count": -count}
+                for count, name in self.ranking[:TOP_SKILLS]
+            ]
+        }
@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+from app.services.name_search import normalize_name
+
+# Nombre maximal de suggestions par requête (taille des listes par préfixe)
+MAX_SUGGESTIONS = 50
+
+# Préfixes indexés jusqu'à cette longueur ; au-delà, filtrage de la liste
+# (complète) du préfixe le plus long
+MAX_PREFIX = 24
+
+
+def search_keys(labels: Iterable[str]) -> Set[str]:
+    """Clés de recherche : chaque libellé normalisé et ses fins à partir de chaque mot"""
+    keys = set()
+    for label in labels:
+        words = normalize_name(label).split()
+        keys.update(' '.join(words[i:]) for i in range(len(words)))
+    return keys
+
+
+class PrefixIndex:
+    """
+    Autocomplétion : préfixe normalisé (accents et casse ignorés) -> ids
+    des entrées, déjà classées par fréquence décroissante puis par nom et
+    tronquées à MAX_SUGGESTIONS. Une suggestion est une lecture de
+    dictionnaire ; l'index est reconstruit quand les fréquences changent.
+
+    Une entrée correspond si un de ses libellés, ou un de ses mots,
+    commence par la recherche ("learn" -> "Machine Learning").
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Dict, Iterable[str]]]):
+        """`entries` : (suggestion renvoyée, avec "name" et "count" ; libellés recherchables)"""
+        ranked = sorted(entries, key=lambda e: (-e[0]['count'], e[0]['name']))
+        self.entries: List[Dict] = [suggestion for suggestion, _labels in ranked]
+        self.keys: List[Set[str]] = []
+        # Entrées parcourues dans l'ordre du classement : chaque liste reste triée
+        self.table: Dict[str, List[int]] = {}
+        for i, (suggestion, labels) in enumerate(ranked):
+            keys = search_keys([suggestion['name'], *labels])
+            self.keys.append(keys)
+            for key in keys:
+                for n in range(min(len(key), MAX_PREFIX) + 1):
+                    prefix = key[:n]
+                    ids = self.table.get(prefix)
+                    if ids is None:
+                        self.table[prefix] = [i]
+                    elif ids[-1] != i and (len(ids) < MAX_SUGGESTIONS or n == MAX_PREFIX):
+                        # Listes complètes au préfixe le plus long (filtrées pour les recherches plus longues)
+                        ids.append(i)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def suggest(self, query: str, k: int = 10) -> List[Dict]:
+        prefix = normalize_name(query)
+        if len(prefix) <= MAX_PREFIX:
+            ids = self.table.get(prefix, ())[:k]
+        else:
+            ids = [
+                i for i in self.table.get(prefix[:MAX_PREFIX], ())
+                if any(key.startswith(prefix) for key in self.keys[i])
+            ][:k]
+        return [self.entries[i] for i in ids]
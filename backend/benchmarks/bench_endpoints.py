@@ -0,0 +1,247 @@
+"""
+Benchmark des routes de l'API sur des ontologies synthétiques.
+
+Pour chaque taille, un sous-processus (RSS propre) charge l'application
+sur l'ontologie générée (benchmarks.generate_ontology), puis appelle en
+process (TestClient) chaque route de routes/candidates.py et chaque
+requête de /api/sparql/examples. Rapporte par scénario les latences p50
+et p99 et le débit (appels séquentiels), et pour le processus le temps
+de démarrage et le pic de RSS.
+
+Les résultats sont enregistrés en JSON (benchmarks/results/) ; avec
+--baseline, chaque scénario est comparé à un fichier de référence et les
+régressions au-delà de --tolerance sont signalées.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_endpoints [tailles...] [--iterations N]
+        [--baseline fichier.json] [--tolerance 1.25] [--output fichier.json]
+
+    tailles : 1k, 10k, 100k, 1M ou un nombre de candidats (défaut : 1k 10k)
+
+Les variables d'environnement de app.config (GRAPH_STORE, RESULT_CACHE_MB,
+SNAPSHOT_ENABLED...) s'appliquent au processus mesuré.
+"""
+import argparse
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.generate_ontology import default_output, generate, parse_size
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# Durée maximale consacrée à un scénario (s), en plus du nombre d'itérations
+SCENARIO_BUDGET = 5.0
+
+
+def peak_rss_mb() -> float:
+    """Pic de RSS du processus (Linux : ru_maxrss en Ko), en Mo"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Percentile par rang le plus proche sur des valeurs triées"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def scenarios(client) -> List[Dict]:
+    """Un scénario par route (et variante utile) puis par exemple SPARQL"""
+    first = client.get("/api/candidates", params={"limit": 1}).json()
+    candidate_id = first[0]["id"] if first else "Candidate1"
+    search = {"skills": ["Python"], "minExperience": 3, "minDegreeLevel": "Bac+3"}
+    offer = {
+        "requiredSkills": [{"name": "Python", "weight": 2}, {"name": "SQL"}],
+        "optionalSkills": [{"name": "Docker"}, {"name": "Communication"}],
+        "targetExperience": 5,
+        "minDegreeLevel": "Bac+3",
+        "topK": 20,
+    }
+    bulk_line = json.dumps({
+        "id": "BenchCandidate", "name": "Bench Candidate", "email": "bench@email.com",
+        "yearsOfExperience": 4, "skills": [{"name": "Python", "type": "technical"}],
+        "experiences": [], "profile": "Data Scientist",
+    })
+
+    items = [
+        ("GET /api/candidates", "GET", "/api/candidates", {}),
+        ("GET /api/candidates?limit=50", "GET", "/api/candidates", {"params": {"limit": 50}}),
+        ("GET /api/candidates ndjson", "GET", "/api/candidates", {"params": {"format": "ndjson"}}),
+        ("POST /api/candidates/search", "POST", "/api/candidates/search", {"json": search}),
+        ("POST /api/candidates/search?limit=50", "POST", "/api/candidates/search",
+         {"json": search, "params": {"limit": 50}}),
+        ("POST /api/candidates/search?facets=true", "POST", "/api/candidates/search",
+         {"json": search, "params": {"facets": "true", "limit": 50}}),
+        ("POST /api/candidates/search searchTerm", "POST", "/api/candidates/search",
+         {"json": {"searchTerm": "martin"}, "params": {"limit": 50}}),
+        ("GET /api/candidates/{id}", "GET", f"/api/candidates/{candidate_id}", {}),
+        ("GET /api/candidates/{id}/similar", "GET", f"/api/candidates/{candidate_id}/similar", {"params": {"k": 10}}),
+        ("POST /api/match", "POST", "/api/match", {"json": offer}),
+        ("GET /api/skills", "GET", "/api/skills", {}),
+        ("GET /api/profiles", "GET", "/api/profiles", {}),
+        ("GET /api/skills/suggest", "GET", "/api/skills/suggest", {"params": {"q": "py"}}),
+        ("GET /api/profiles/suggest", "GET", "/api/profiles/suggest", {"params": {"q": "dev"}}),
+        ("GET /api/stats", "GET", "/api/stats", {}),
+        ("GET /api/cache/stats", "GET", "/api/cache/stats", {}),
+        ("GET /api/sparql/examples", "GET", "/api/sparql/examples", {}),
+    ]
+    for example in client.get("/api/sparql/examples").json()["examples"]:
+        items.append((f"SPARQL {example['name']}", "POST", "/api/sparql/execute",
+                      {"json": {"query": example["query"]}}))
+    # Écriture en dernier : invalide les caches des scénarios précédents
+    items.append(("POST /api/candidates/bulk", "POST", "/api/candidates/bulk",
+                  {"content": bulk_line, "headers": {"Content-Type": "application/x-ndjson"}}))
+    return [{"name": n, "method": m, "path": p, "kwargs": k} for n, m, p, k in items]
+
+
+def run_scenario(client, scenario: Dict, iterations: int) -> Dict:
+    method, path, kwargs = scenario["method"], scenario["path"], scenario["kwargs"]
+    # Premier appel à part : coût à froid (cache des résultats vide)
+    started = time.perf_counter()
+    response = client.request(method, path, **kwargs)
+    cold = time.perf_counter() - started
+
+    latencies = []
+    deadline = time.perf_counter() + SCENARIO_BUDGET
+    for _ in range(iterations):
+        started = time.perf_counter()
+        client.request(method, path, **kwargs)
+        latencies.append(time.perf_counter() - started)
+        if time.perf_counter() > deadline:
+            break
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "status": response.status_code,
+        "bytes": len(response.content),
+        "cold_ms": round(cold * 1000, 3),
+        "calls": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "throughput_rps": round(len(latencies) / total, 1) if total else 0.0,
+    }
+
+
+def child(ontology: str, iterations: int, output: str):
+    """Mesures dans le processus courant (ONTOLOGY_FILE déjà positionné)"""
+    from fastapi.testclient import TestClient
+
+    started = time.perf_counter()
+    from app.main import app
+    from app.services.rdf_service import rdf_service
+    startup = time.perf_counter() - started
+    startup_rss = peak_rss_mb()
+
+    client = TestClient(app)
+    results = {}
+    for scenario in scenarios(client):
+        results[scenario["name"]] = run_scenario(client, scenario, iterations)
+
+    with open(output, 'w') as f:
+        json.dump({
+            "ontology": os.path.basename(ontology),
+            "triples": len(rdf_service.graph),
+            "candidates": len(rdf_service.index),
+            "startup_s": round(startup, 3),
+            "startup_peak_rss_mb": round(startup_rss, 1),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "scenarios": results,
+        }, f)
+
+
+def measure(size: str, iterations: int) -> Dict:
+    ontology = os.path.abspath(default_output(size))
+    if not os.path.exists(ontology):
+        print(f"⏳ Génération de {ontology}...")
+        generate(parse_size(size), ontology)
+
+    env = dict(os.environ)
+    env["ONTOLOGY_FILE"] = ontology
+    # Le journal des modifications rendrait l'écriture du scénario "bulk" persistante
+    env.setdefault("CHANGELOG_ENABLED", "false")
+    env.setdefault("SLOW_QUERY_LOG", os.devnull)
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        output = tmp.name
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_endpoints", "--child", ontology, str(iterations), output],
+            check=True, env=env, stdout=subprocess.DEVNULL,
+        )
+        with open(output) as f:
+            result = json.load(f)
+    finally:
+        os.remove(output)
+    result["size"] = size
+    result["python"] = sys.version.split()[0]
+    result["date"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return result
+
+
+def report(result: Dict, baseline: Dict = None, tolerance: float = 1.25) -> int:
+    """Affiche un résultat (et sa comparaison à la référence) ; retourne le nombre de régressions"""
+    print(f"\n📊 {result['size']} : {result['candidates']} candidats, {result['triples']} triplets, "
+          f"démarrage {result['startup_s']:.2f}s, pic RSS {result['peak_rss_mb']:.0f} Mo")
+    base_scenarios = (baseline or {}).get("scenarios", {})
+    regressions = 0
+    print(f"  {'scénario':<44} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9}  {'à froid':>9}")
+    for name, s in result["scenarios"].items():
+        line = f"  {name[:44]:<44} {s['p50_ms']:9.2f} {s['p99_ms']:9.2f} {s['throughput_rps']:9.1f}  {s['cold_ms']:9.2f}"
+        base = base_scenarios.get(name)
+        if base and base["p50_ms"] > 0:
+            ratio = s["p50_ms"] / base["p50_ms"]
+            line += f"  x{ratio:.2f}"
+            if ratio > tolerance:
+                line += " ⚠️ régression"
+                regressions += 1
+        if s["status"] >= 400:
+            line += f"  (HTTP {s['status']})"
+        print(line)
+    if baseline:
+        ratio = result["startup_s"] / baseline["startup_s"] if baseline.get("startup_s") else 0
+        print(f"  démarrage x{ratio:.2f}, pic RSS {result['peak_rss_mb'] - baseline['peak_rss_mb']:+.0f} Mo")
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_endpoints")
+    parser.add_argument("sizes", nargs="*", default=["1k", "10k"])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--baseline", help="fichier JSON de référence (résultats d'un run précédent)")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="ratio p50 au-delà duquel signaler")
+    parser.add_argument("--output", help="fichier JSON des résultats (défaut : benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = 0
+    for size in args.sizes:
+        results[size] = measure(size, args.iterations)
+        regressions += report(results[size], baseline.get(size), args.tolerance)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"endpoints_{'_'.join(args.sizes)}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Résultats : {output}")
+    if regressions:
+        print(f"⚠️ {regressions} scénario(s) plus lent(s) que la référence (x{args.tolerance})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,96 @@
+"""
+Benchmark : store rdflib par défaut (Memory) vs IntStore.
+
+Chaque store est mesuré dans un sous-processus séparé (RSS propre) sur
+un graphe synthétique de candidats.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_int_store [nombre_de_candidats]
+"""
+import json
+import random
+import subprocess
+import sys
+import time
+
+from rdflib import Graph, Literal, Namespace, RDF
+
+CV = Namespace("http://www.semanticweb.org/ontologies/cv#")
+
+
+def rss_mb() -> float:
+    """RSS courant du processus (Linux), en Mo"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def synthetic_triples(candidates: int, seed: int = 42):
+    rng = random.Random(seed)
+    skills = [CV[f"Skill{i}"] for i in range(500)]
+    for i, skill in enumerate(skills):
+        yield skill, RDF.type, CV.TechnicalSkill
+        yield skill, CV.skillName, Literal(f"Skill {i}")
+    for i in range(candidates):
+        person = CV[f"Candidate{i}"]
+        yield person, RDF.type, CV.Person
+        yield person, CV.name, Literal(f"Candidat {i}")
+        yield person, CV.email, Literal(f"candidat{i}@email.com")
+        yield person, CV.yearsOfExperience, Literal(rng.randint(0, 20))
+        for skill in rng.sample(skills, 8):
+            yield person, CV.hasSkill, skill
+        exp = CV[f"Exp{i}"]
+        yield person, CV.hasExperience, exp
+        yield exp, CV.jobTitle, Literal("Développeur")
+        yield exp, CV.duration, Literal(rng.randint(6, 60))
+
+
+def measure(store: str, candidates: int) -> dict:
+    from app.services.int_store import IntStore
+
+    baseline = rss_mb()
+    graph = Graph(store=IntStore()) if store == "intstore" else Graph()
+    start = time.perf_counter()
+    graph.addN((s, p, o, graph) for s, p, o in synthetic_triples(candidates))
+    if store == "intstore":
+        graph.store.merge()
+    load = time.perf_counter() - start
+
+    patterns = {
+        "(?s :hasSkill ?o)": (None, CV.hasSkill, None),
+        "(?s :hasSkill :Skill3)": (None, CV.hasSkill, CV.Skill3),
+        "(:Candidate7 ?p ?o)": (CV.Candidate7, None, None),
+        "(?s ?p :Skill3)": (None, None, CV.Skill3),
+    }
+    scans = {}
+    for label, pattern in patterns.items():
+        start = time.perf_counter()
+        rows = sum(1 for _ in graph.triples(pattern))
+        scans[label] = {"ms": (time.perf_counter() - start) * 1000, "rows": rows}
+
+    return {"store": store, "triples": len(graph), "load_s": load,
+            "rss_mb": rss_mb() - baseline, "scans": scans}
+
+
+def main(candidates: int = 20000):
+    results = []
+    for store in ("memory", "intstore"):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_int_store", "--child", store, str(candidates)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    for r in results:
+        print(f"{r['store']:<9} {r['triples']} triplets  chargement {r['load_s']:.2f}s  RSS +{r['rss_mb']:.0f} Mo")
+        for label, scan in r["scans"].items():
+            print(f"    {label:<26} {scan['ms']:9.2f} ms  ({scan['rows']} lignes)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        print(json.dumps(measure(sys.argv[2], int(sys.argv[3]))))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
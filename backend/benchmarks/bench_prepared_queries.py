@@ -0,0 +1,70 @@
+"""
+Micro-benchmark : requête SPARQL construite par f-string (re-parsée à
+chaque appel) vs requête préparée une fois avec initBindings.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_prepared_queries [iterations]
+"""
+import sys
+import time
+
+from rdflib import Namespace
+from rdflib.plugins.sparql import prepareQuery
+
+from app.config import settings
+from app.services.rdf_service import rdf_service
+
+# Forme de l'ancienne requête par candidat (_get_skills)
+PERSON_SKILLS = """
+    SELECT ?skillName ?type
+    WHERE {
+        ?person :hasSkill ?skill .
+        ?skill :skillName ?skillName ;
+               a ?type .
+        FILTER(?type = :TechnicalSkill || ?type = :SoftSkill)
+    }
+"""
+
+
+def fstring_query(person_uri: str) -> str:
+    return f"""
+    PREFIX : <{settings.CV_NAMESPACE}>
+
+    SELECT ?skillName ?type
+    WHERE {{
+        <{person_uri}> :hasSkill ?skill .
+        ?skill :skillName ?skillName ;
+               a ?type .
+        FILTER(?type = :TechnicalSkill || ?type = :SoftSkill)
+    }}
+    """
+
+
+def timed(label: str, fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call = (time.perf_counter() - start) / iterations * 1e6
+    print(f"  {label:<28} {per_call:10.1f} µs/appel")
+    return per_call
+
+
+def main(iterations: int = 500):
+    graph = rdf_service.graph
+    cv_ns = Namespace(settings.CV_NAMESPACE)
+    person = cv_ns.Candidate1
+    prepared = prepareQuery(PERSON_SKILLS, initNs={"": cv_ns})
+
+    print(f"Compétences d'un candidat ({iterations} appels)")
+    before = timed("f-string", lambda: list(graph.query(fstring_query(str(person)))), iterations)
+    after = timed("préparée + initBindings",
+                  lambda: list(graph.query(prepared, initBindings={"person": person})), iterations)
+    print(f"  gain : {before - after:.1f} µs/appel (x{before / after:.1f})")
+
+    for name in rdf_service.queries:
+        print(f"Registre : {name} ({iterations} appels)")
+        timed("préparée", lambda: list(rdf_service.query(name)), iterations)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
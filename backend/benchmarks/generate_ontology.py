@@ -0,0 +1,199 @@
+"""
+Générateur d'ontologie synthétique : le schéma, les profils, compétences
+et diplômes de cv_ontology.ttl, suivis de N candidats générés (:Person,
+:Degree, :Experience, :hasProfile), écrits directement en Turtle (sans
+passer par un graphe rdflib, pour tenir jusqu'au million de candidats).
+
+La popularité des compétences suit une loi de Zipf : la compétence de
+rang r est tirée avec un poids 1 / r^s (les compétences de l'ontologie
+d'origine en tête, complétées par des compétences générées).
+
+Usage (depuis backend/) :
+    python -m benchmarks.generate_ontology <taille> [sortie.ttl] [graine]
+
+    taille : nombre de candidats, ou 1k / 10k / 100k / 1M
+    sortie : par défaut benchmarks/data/cv_<taille>.ttl
+"""
+import itertools
+import os
+import random
+import sys
+import time
+
+SOURCE = os.path.join(os.path.dirname(__file__), '..', 'cv_ontology.ttl')
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+# Fin du schéma et des individus partagés dans cv_ontology.ttl
+CANDIDATES_BANNER = "#    Instances - Candidats"
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+# Taille du vocabulaire de compétences et exposant de la loi de Zipf
+SKILL_VOCABULARY = 500
+ZIPF_EXPONENT = 1.1
+SOFT_SKILL_SHARE = 0.2
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Chloé", "David", "Emma", "François", "Gabriel", "Hélène", "Inès", "Jules",
+    "Karim", "Léa", "Mehdi", "Nora", "Océane", "Paul", "Quentin", "Rania", "Sofia", "Thomas",
+    "Ugo", "Valérie", "William", "Yasmine", "Zoé", "Amine", "Camille", "Lucas", "Manon", "Youssef",
+]
+LAST_NAMES = [
+    "Dupont", "Martin", "Bernard", "Petit", "Durand", "Leroy", "Moreau", "Simon", "Laurent", "Lefèvre",
+    "Michel", "Garcia", "Bertrand", "Roux", "Vincent", "Fournier", "Morel", "Girard", "Benali", "Mercier",
+]
+COMPANIES = ["TechCorp", "DataSoft", "WebAgency", "CloudNine", "FinTrust", "MediLab", "RetailPlus", "GovTech"]
+JOB_TITLES = ["Développeur", "Data Scientist", "Ingénieur DevOps", "Analyste", "Chef de Projet",
+              "Ingénieur Data", "Architecte Cloud", "Testeur QA"]
+DEGREES = [("Licence Informatique", "Bac+3"), ("Master Informatique", "Bac+5"), ("DUT Informatique", "Bac+2"),
+           ("Master Data Science", "Bac+5"), ("Diplôme d'Ingénieur", "Bac+5"), ("Doctorat Informatique", "Doctorat")]
+DEGREE_WEIGHTS = [25, 35, 15, 10, 12, 3]
+
+
+def parse_size(text: str) -> int:
+    return SIZES.get(text) or int(text)
+
+
+def _literal(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def schema_and_vocabulary():
+    """
+    Texte Turtle du schéma (jusqu'aux candidats exclus), compétences
+    existantes (URI locale, type) et profils existants (URI locale)
+    """
+    from rdflib import Graph, Namespace, RDF
+
+    with open(SOURCE, encoding='utf-8') as f:
+        text = f.read()
+    header = text[:text.index(CANDIDATES_BANNER)].rsplit('\n', 2)[0] + '\n'
+
+    cv = Namespace("http://www.semanticweb.org/ontologies/cv#")
+    graph = Graph().parse(data=header, format='turtle')
+    skills = []
+    for skill_class, skill_type in ((cv.TechnicalSkill, "technical"), (cv.SoftSkill, "soft")):
+        skills += sorted((str(s).split('#')[-1], skill_type) for s in graph.subjects(RDF.type, skill_class))
+    profiles = sorted(str(p).split('#')[-1] for p in graph.subjects(RDF.type, cv.Profile))
+    return header, skills, profiles
+
+
+def zipf_weights(n: int, exponent: float = ZIPF_EXPONENT):
+    """Poids cumulés de Zipf pour les rangs 1..n (pour random.choices)"""
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, n + 1)))
+
+
+def generate(candidates: int, output: str, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    header, skills, profiles = schema_and_vocabulary()
+
+    # Vocabulaire : compétences d'origine (rangs les plus populaires, dans
+    # un ordre tiré au hasard) puis compétences générées
+    rng.shuffle(skills)
+    generated_skills = []
+    for n in range(len(skills) + 1, SKILL_VOCABULARY + 1):
+        skill_type = "soft" if rng.random() < SOFT_SKILL_SHARE else "technical"
+        generated_skills.append((f"GenSkill{n}", skill_type))
+    skills += generated_skills
+    skill_weights = zipf_weights(len(skills))
+    skill_uris = [f":{local}" for local, _ in skills]
+    profile_weights = zipf_weights(len(profiles), 0.8)
+
+    started = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(header)
+        f.write("\n#################################################################\n"
+                "#    Instances - Compétences générées\n"
+                "#################################################################\n\n")
+        for local, skill_type in generated_skills:
+            skill_class = "TechnicalSkill" if skill_type == "technical" else "SoftSkill"
+            f.write(f":{local} rdf:type :{skill_class} ;\n    :skillName {_literal(f'Skill {local[8:]}')} .\n\n")
+
+        f.write("#################################################################\n"
+                f"#    Instances - Candidats générés ({candidates})\n"
+                "#################################################################\n\n")
+        for i in range(1, candidates + 1):
+            f.write(_candidate(rng, i, skill_uris, skill_weights, profiles, profile_weights))
+
+    return {
+        "candidates": candidates,
+        "skills": len(skills),
+        "profiles": len(profiles),
+        "bytes": os.path.getsize(output),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def _candidate(rng: random.Random, i: int, skill_uris, skill_weights, profiles, profile_weights) -> str:
+    cid = f"Candidate{i}"
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    years = min(int(rng.expovariate(1 / 6)), 35)
+
+    # Compétences tirées selon Zipf (3 à 15 tirages, doublons retirés)
+    wanted = rng.randint(3, 15)
+    chosen = list(dict.fromkeys(rng.choices(skill_uris, cum_weights=skill_weights, k=wanted)))
+    profile = rng.choices(profiles, cum_weights=profile_weights)[0]
+
+    lines = [
+        f":{cid} rdf:type :Person ;",
+        f"    :name {_literal(f'{first} {last}')} ;",
+        f"    :email {_literal(f'{first.lower()}.{last.lower()}{i}@email.com')} ;",
+        f"    :yearsOfExperience {years} ;",
+        f"    :hasSkill {' , '.join(chosen)} ;",
+        f"    :hasProfile :{profile}",
+    ]
+    nodes = []
+
+    if rng.random() < 0.9:
+        degree_name, level = rng.choices(DEGREES, weights=DEGREE_WEIGHTS)[0]
+        lines[-1] += " ;"
+        lines.append(f"    :hasDegree :{cid}_Degree")
+        nodes.append(
+            f":{cid}_Degree rdf:type :Degree ;\n"
+            f"    :degreeName {_literal(degree_name)} ;\n"
+            f"    :degreeLevel {_literal(level)} ;\n"
+            f"    :yearObtained {2024 - years - rng.randint(0, 3)} .\n"
+        )
+
+    end_year = 2024
+    experiences = []
+    for n in range(1, min(rng.randint(0, 3), years) + 1):
+        duration = rng.randint(6, 60)
+        start_year = end_year - max(duration // 12, 1)
+        experiences.append(f":{cid}_Exp{n}")
+        nodes.append(
+            f":{cid}_Exp{n} rdf:type :Experience ;\n"
+            f"    :jobTitle {_literal(rng.choice(JOB_TITLES))} ;\n"
+            f"    :company {_literal(rng.choice(COMPANIES))} ;\n"
+            f"    :duration {duration} ;\n"
+            f"    :startYear {start_year} ;\n"
+            f"    :endYear {end_year} .\n"
+        )
+        end_year = start_year
+    if experiences:
+        lines[-1] += " ;"
+        lines.append(f"    :hasExperience {' , '.join(experiences)}")
+
+    lines[-1] += " ."
+    return "\n".join(lines) + "\n\n" + "".join(node + "\n" for node in nodes)
+
+
+def default_output(size: str) -> str:
+    return os.path.join(DATA_DIR, f"cv_{size}.ttl")
+
+
+def main(argv):
+    if not argv:
+        print(__doc__)
+        return
+    size = argv[0]
+    output = argv[1] if len(argv) > 1 else default_output(size)
+    seed = int(argv[2]) if len(argv) > 2 else 42
+    stats = generate(parse_size(size), output, seed)
+    print(f"✅ {output} : {stats['candidates']} candidats, {stats['skills']} compétences, "
+          f"{stats['bytes'] / 1e6:.1f} Mo en {stats['seconds']}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])